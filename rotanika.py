@@ -1,14 +1,81 @@
-import time
+import os
 
+from typing import Callable, Optional
+
+import httpx
+from google.genai import errors
+from pydantic import ValidationError
+
+from candidates import CandidateRanker
 from console import Console
-from utils import get_version
+from game import Game, RunOutput
+from governor import Governor, Priority, is_quota_error
+from model_client import ModelClient, TurnCancelled, TurnDeadlineExceeded
+from model_router import ModelRouter, ModelTier
+from progress import StreamProgress
+from session_trace import SessionRecorder
+from strings import GameStrings
+from utils import get_cache_dir, get_data_path, get_version
+from vector_index import GenAIEmbedder, Shortlister
 
 console = Console()
 console.top_border_text = f"Rotanika v{get_version()}"
+if os.environ.get('ROTANIKA_TRACE'):
+    # Record the session for replaying later with `poe replay`
+    SessionRecorder(console, os.environ['ROTANIKA_TRACE']).start()
+
+# Show how each turn is streaming, and any quota pauses, on the status line
+progress = StreamProgress(console.status_add, console.status_remove)
+Governor().on_pause = progress.quota_paused
+client = ModelClient(observer=progress)
+router = ModelRouter()
+
+# Late in the game, rank the characters closest to the answers so far, to tell when a guess is likely.
+# The index is loaded on the first ranking, in the background, and kept in the user's cache directory, so
+# its descriptions are only ever embedded once. If it cannot be built, the game is simply played unranked.
+cache_dir = get_cache_dir()
+shortlist = Shortlister.from_corpus(
+    get_data_path('characters.jsonl'),
+    GenAIEmbedder(priority=Priority.SPECULATIVE),
+    index_path=os.path.join(cache_dir, 'characters'),
+    cache_path=os.path.join(cache_dir, 'embeddings'),
+)
+# Ranking runs alongside host turns, so it has its own client to keep it off the turn's status indicators
+ranker = CandidateRanker(ModelClient(), router.model(ModelTier.FAST), Priority.SPECULATIVE)
+game = Game(client, router=router, ranker=ranker, shortlist=shortlist)
+
+def play_turn(turn: Callable[[Callable[[str], None]], RunOutput]) -> Optional[RunOutput]:
+    """
+    Runs a host turn, showing the reply content as it streams in.
+
+    Args:
+        turn (Callable[[Callable[[str], None]], RunOutput]): Runs the turn, given the content callback.
+    Returns:
+        Optional[RunOutput]: The host's reply, or None if the turn was cancelled or timed out.
+    """
+    console.load_start()
+    try:
+        output = turn(console.append)
+    except TurnCancelled:
+        console.write(GameStrings.TURN_CANCELLED_MESSAGE, overwrite=True)
+        output = None
+    except TurnDeadlineExceeded:
+        console.write(GameStrings.TURN_TIMEOUT_MESSAGE, overwrite=True)
+        output = None
+    except (ValidationError, errors.APIError, httpx.TransportError) as e:
+        # A malformed reply, a network problem, or running out of quota even after the governor's retries.
+        # The game only keeps turns that succeeded, so the player can simply answer again.
+        message = GameStrings.TURN_QUOTA_MESSAGE if is_quota_error(e) else GameStrings.TURN_FAILED_MESSAGE
+        console.write(message, overwrite=True)
+        output = None
+    finally:
+        # Nothing is in flight between turns, so leave the status row empty while the player types
+        console.status_clear()
+    console.write_empty()
+    return output
 
-console.load_start("Loading")
+play_turn(lambda on_content: game.start(on_content=on_content))
 while True:
-    time.sleep(5)
-    console.write("Loading complete!")
-    console.input("Press Enter to continue...")
-    break
+    user_input = console.input()
+    console.write_empty()
+    play_turn(lambda on_content: game.respond(user_input, on_content=on_content))
@@ -6,7 +6,7 @@ a = Analysis(
     ['rotanika.py'],
     pathex=['src'],
     binaries=[],
-    datas=[('pyproject.toml', '.')],
+    datas=[('pyproject.toml', '.'), ('data/characters.jsonl', 'data')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
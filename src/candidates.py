@@ -0,0 +1,140 @@
+import json
+
+from enum import Enum
+from typing import List, Optional, Sequence, Type
+
+from google.genai import types
+
+from governor import Priority
+from model_client import DEFAULT_MODEL, ModelClient, ModelRequest
+from strings import GamePrompts
+
+def candidate_enum(candidates: Sequence[str]) -> Type[Enum]:
+    """
+    Builds an Enum of the given candidates, for use as a constrained response schema.
+
+    Args:
+        candidates (Sequence[str]): The candidate names. Duplicates are dropped.
+    Returns:
+        Type[Enum]: An Enum whose values are the candidate names.
+    """
+    unique = list(dict.fromkeys(candidates))
+    return Enum('Candidate', {f'CANDIDATE_{i}': name for i, name in enumerate(unique)})
+
+def _score_value(value: object) -> float:
+    """
+    Converts a score from a ranking response to the range 0 to 1. Anything that is not a number, like a
+    null the model returned for a candidate it could not judge, scores 0.
+
+    Args:
+        value (object): The score from the response, from 0 to 100.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0.0
+    return min(max(float(value), 0), 100) / 100
+
+class CandidateRanking:
+    """
+    Scores for a shortlist of candidates, from 0 to 1.
+    """
+    def __init__(self, scores: dict[str, float], token_count: int = 0):
+        self.scores = scores
+        self.token_count = token_count
+
+    @property
+    def ranked(self) -> List[str]:
+        """The candidates from most to least likely."""
+        return sorted(self.scores, key=lambda name: self.scores[name], reverse=True)
+
+    @property
+    def best(self) -> Optional[str]:
+        """The most likely candidate, or None if there are no candidates."""
+        return self.ranked[0] if self.scores else None
+
+    @property
+    def confidence(self) -> float:
+        """
+        How sure the ranking is of its best candidate: the best score times its share of the total score, or 0
+        if every score is 0. A clear leader with a low score, or a high score shared with close rivals, both
+        give a low confidence.
+        """
+        total = sum(self.scores.values())
+        if total <= 0:
+            return 0.0
+        top = max(self.scores.values())
+        return top * top / total
+
+class CandidateRanker:
+    """
+    Chooses between a shortlist of characters with a single short, schema constrained model call, instead of
+    several turns of free-form reasoning. The conversation so far is sent as context, and the response can only
+    be one of the candidates, or one score per candidate.
+    """
+    def __init__(self, client: ModelClient, model: str = DEFAULT_MODEL, priority: Priority = Priority.INTERACTIVE):
+        """
+        Args:
+            client (ModelClient): The client used for ranking calls.
+            model (str): The model to rank with. Defaults to DEFAULT_MODEL.
+            priority (Priority): Priority of ranking calls. Defaults to interactive.
+        """
+        self.client = client
+        self.model = model
+        self.priority = priority
+
+    def _request(self, contents: List[dict], prompt: str, config: types.GenerateContentConfig) -> ModelRequest:
+        """
+        Builds a ranking request that continues the conversation with the given prompt.
+
+        Args:
+            contents (List[dict]): The conversation so far.
+            prompt (str): The ranking instruction.
+            config (types.GenerateContentConfig): The constrained response config.
+        """
+        turn = {'role': 'user', 'parts': [{'text': f"{GamePrompts.SYSTEM_PREFIX} {prompt}"}]}
+        return ModelRequest(contents + [turn], model=self.model, config=config, priority=self.priority)
+
+    def choose(self, contents: List[dict], candidates: Sequence[str]) -> str:
+        """
+        Asks which candidate is most likely. The response is constrained to the candidate names.
+
+        Args:
+            contents (List[dict]): The conversation so far, e.g. `Game.contents`.
+            candidates (Sequence[str]): The shortlist.
+        Returns:
+            str: The chosen candidate.
+        Raises:
+            ValueError: If the response is not one of the candidates.
+        """
+        config = types.GenerateContentConfig(response_mime_type='text/x.enum', response_schema=candidate_enum(candidates))
+        prompt = GamePrompts.CHOOSE_CANDIDATE.format(candidates=', '.join(candidates))
+        choice = self.client.generate(self._request(contents, prompt, config)).text.strip()
+        if choice not in candidates:
+            raise ValueError(f"Model chose a character that is not a candidate: {choice}")
+        return choice
+
+    def score(self, contents: List[dict], candidates: Sequence[str]) -> CandidateRanking:
+        """
+        Asks how likely each candidate is, all in one response.
+
+        Args:
+            contents (List[dict]): The conversation so far, e.g. `Game.contents`.
+            candidates (Sequence[str]): The shortlist.
+        Returns:
+            CandidateRanking: The scores. Candidates the model left out, or gave no number for, score 0.
+        Raises:
+            ValueError: If the response is not a JSON object.
+        """
+        unique = list(dict.fromkeys(candidates))
+        schema = {
+            'type': 'object',
+            'properties': {name: {'type': 'integer', 'minimum': 0, 'maximum': 100} for name in unique},
+            'required': unique,
+        }
+        config = types.GenerateContentConfig(response_mime_type='application/json', response_json_schema=schema)
+        prompt = GamePrompts.SCORE_CANDIDATES.format(candidates=', '.join(unique))
+        result = self.client.generate(self._request(contents, prompt, config))
+        response = json.loads(result.text)
+        if not isinstance(response, dict):
+            raise ValueError(f"Model gave scores that are not an object: {result.text}")
+        scores = {name: _score_value(response.get(name)) for name in unique}
+        return CandidateRanking(scores, result.token_count)
@@ -1,22 +1,41 @@
 import os
+import sys
 import time
+import atexit
 import unicodedata
 import threading
 
-from typing import List, Optional
+from typing import Callable, Optional, TextIO, Union
 
-from console_styles import Colors
+from console_styles import Colors, Controls, minimize_styles, move_cursor
+from history import ConsoleEntry, HistoryStore
+from line_editor import Keys, LineEditor
+from line_index import LineIndex
+from progress import ProgressIndicator, StatusLine
 from strings import GameStrings
-from utils import wrap_line
+from styled_text import StyledText
 
-class ConsoleEntry:
+class FrameTemplates:
     """
-    Represents a console entry.
+    Rows of the frame that only depend on the layout, rendered once and reused by every frame until the
+    width, border, header or dinkus settings change.
     """
-    def __init__(self, text: str, is_input: bool = False, is_dinkus: bool = False):
-        self.text = text
-        self.is_input = is_input
-        self.is_dinkus = is_dinkus
+    __slots__ = ('key', 'top', 'empty', 'dinkus', 'bottom')
+
+    def __init__(self, key: tuple, top: list[str], empty: str, dinkus: str, bottom: str):
+        """
+        Args:
+            key (tuple): The settings the rows were rendered with.
+            top (list[str]): The top border, header and empty row below them.
+            empty (str): An empty bordered row.
+            dinkus (str): A dinkus row.
+            bottom (str): The bottom border.
+        """
+        self.key = key
+        self.top = top
+        self.empty = empty
+        self.dinkus = dinkus
+        self.bottom = bottom
 
 class Console:
     """
@@ -27,8 +46,26 @@ class Console:
     # Singleton instance
     _instance = None
 
-    # List to store history of console interactions
-    _history: List['ConsoleEntry'] = []
+    # History of console interactions, created with the instance
+    _history: HistoryStore
+
+    _line_index: LineIndex
+    """Wrapped row counts of the history entries held in memory, for scrolling."""
+
+    _scroll_offset: int = 0
+    """Rows the view is scrolled up from the latest output. 0 follows the latest output."""
+
+    _scroll_total: int = 0
+    """Total history rows when the view was last rendered, to keep a scrolled view still as output arrives."""
+
+    _view_top_index: int = 0
+    """Absolute index of the history entry at the top of the last rendered view."""
+
+    _view_rows: int = 0
+    """Number of history rows that fit in the last rendered view."""
+
+    _templates: Optional[FrameTemplates] = None
+    """Layout rows of the last rendered frame."""
 
     # Loading state
     _is_loading: bool = False
@@ -43,6 +80,33 @@ class Console:
     _loading_history_index: int = -1
     """Index of the loading message in history."""
 
+    _alternate_screen_active: bool = False
+    """Whether the terminal is currently showing the alternate screen buffer."""
+
+    _original_excepthook = None
+    """The exception hook to restore once the alternate screen is left."""
+
+    _render_lock = threading.RLock()
+    """Lock held while writing to the terminal, so frames and the input row never interleave."""
+
+    _line_editor: Optional[LineEditor] = None
+    """Line editor that owns the input row while input is being read."""
+
+    _status_line: Optional[StatusLine] = None
+    """Live progress indicators shown on the row above the bottom border."""
+
+    _status_row: int = 0
+    """Screen row (1-based) of the status line in the last rendered frame, or 0 if nothing was rendered."""
+
+    _last_frame: str = ''
+    """The last rendered frame, without any cursor or screen controls."""
+
+    _append_rendered_at: float = 0.0
+    """When `append` last rendered."""
+
+    _append_timer: Optional[threading.Timer] = None
+    """Pending render of text appended since `append` last rendered."""
+
     #* Property Attributes *#
     border_char: str = '#'
     """Border character."""
@@ -68,6 +132,42 @@ class Console:
     input_color = Colors.GREEN
     """Input text color."""
 
+    status_color = Colors.YELLOW
+    """Status line text color."""
+
+    alternate_screen: bool = False
+    """Render into the alternate screen buffer, painting each frame in place instead of clearing the screen."""
+
+    synchronized_output: bool = True
+    """
+    Wrap alternate screen frames in synchronized update markers so they are displayed atomically. Terminals
+    without support for synchronized updates ignore the markers.
+    """
+
+    append_interval: float = 0.05
+    """
+    Shortest time in seconds between renders while text is being appended, so fast streams do not repaint the
+    whole screen for every chunk. Text appended in between is shown by a render at the end of the interval.
+    """
+
+    history_capacity: int = 1000
+    """Number of history entries kept in memory. Older entries are spilled to disk. Set before first use."""
+
+    history_spill_path: Optional[str] = None
+    """File older history entries are spilled to. Defaults to an anonymous temporary file. Set before first use."""
+
+    headless: bool = False
+    """
+    Never touch the real terminal. The size comes from `width` and `height`, the screen is never cleared and
+    no exit hooks are installed, so frames can be rendered to `output` for tests and benchmarks.
+    """
+
+    output: Optional[TextIO] = None
+    """Stream frames are written to. Defaults to standard output."""
+
+    input_source: Optional[Callable[[str], str]] = None
+    """Reads a line of input given the prompt, instead of the terminal. Defaults to the terminal."""
+
     # --- Dimension Override ---
     width = 0
     """Override for console width."""
@@ -82,6 +182,8 @@ class Console:
         """
         if cls._instance is None:
             cls._instance = super(Console, cls).__new__(cls)
+            cls._instance._history = HistoryStore(cls.history_capacity, cls.history_spill_path)
+            cls._instance._line_index = LineIndex(cls.history_capacity)
         return cls._instance
 
     # --------- Utility Methods ---------
@@ -89,11 +191,59 @@ class Console:
         """
         Clears the console screen using the appropriate system command.
         """
+        if self.headless:
+            return
         if os.name == 'nt':
             os.system('cls')
         else:
             os.system('clear')
 
+    def _output(self) -> TextIO:
+        """
+        Returns the stream frames are written to.
+        """
+        return self.output if self.output is not None else sys.stdout
+
+    def _enter_alternate_screen(self) -> None:
+        """
+        Switches the terminal to the alternate screen buffer, and makes sure it is switched back however
+        the program ends.
+        """
+        if self._alternate_screen_active:
+            return
+
+        self._alternate_screen_active = True
+        self._output().write(Controls.ALT_SCREEN_ENTER)
+        self._output().flush()
+        if self.headless:
+            return
+
+        # Uncaught exceptions (including KeyboardInterrupt) should be printed on the main screen, where
+        # they will still be visible after the program ends
+        original_excepthook = sys.excepthook
+        def excepthook(*args):
+            self._leave_alternate_screen()
+            original_excepthook(*args)
+        self._original_excepthook = original_excepthook
+        sys.excepthook = excepthook
+        atexit.register(self._leave_alternate_screen)
+
+    def _leave_alternate_screen(self) -> None:
+        """
+        Restores the main screen buffer and the cursor. Safe to call when the alternate screen is not active.
+        """
+        if not self._alternate_screen_active:
+            return
+
+        self._alternate_screen_active = False
+        self._output().write(Controls.CURSOR_SHOW + Colors.RESET + Controls.ALT_SCREEN_EXIT)
+        self._output().flush()
+
+        if self._original_excepthook is not None:
+            sys.excepthook = self._original_excepthook
+            self._original_excepthook = None
+        atexit.unregister(self._leave_alternate_screen)
+
     def _get_console_size(self) -> tuple[int, int]:
         """
         Returns the (width, height) of the console window. Returns a (0, 0) tuple if not
@@ -102,6 +252,8 @@ class Console:
         Returns:
             tuple: (width, height) of the console window.
         """
+        if self.headless:
+            return (self.width, self.height)
         try:
             size = os.get_terminal_size()
             return (size.columns, size.lines)
@@ -109,12 +261,24 @@ class Console:
             # Fallback if not attached to a terminal
             return (self.width, self.height)
 
+    def _generate_bordered_row(self, content: StyledText) -> str:
+        """
+        Generate a single row with a border character on either side of the content.
+
+        Args:
+            content (StyledText): The content between the borders, already padded to width.
+        Returns:
+            str: The rendered row, including the trailing newline.
+        """
+        border = (self.border_color, self.border_char)
+        return StyledText(border, *content.spans, border).render() + '\n'
+
     def _generate_dinkus(self) -> str:
         """
         Generate a dinkus line.
         """
         width, _ = self._get_console_size()
-        dinkus_line = self.dinkus_color + (self.dinkus_char * width) + Colors.RESET
+        dinkus_line = StyledText((self.dinkus_color, self.dinkus_char * width)).render()
         return dinkus_line
 
     def _generate_empty_line(self) -> str:
@@ -122,25 +286,164 @@ class Console:
         Generate an empty line with borders.
         """
         width, _ = self._get_console_size()
-        empty_line = f"{self.border_color}{self.border_char}{Colors.RESET}{' ' * (width - 2)}{self.border_color}{self.border_char}{Colors.RESET}\n"
-        return empty_line
+        return self._generate_bordered_row(StyledText(' ' * (width - 2)))
 
-    def _generate_line(self, text: str, color: str = "") -> str:
+    def _generate_status_line(self, text: Optional[str] = None) -> str:
         """
-        Generate a line with borders.
+        Generate the bordered status row, showing any live progress indicators.
 
         Args:
-            text (str): The text to include in the line.
-        Returns:
-            str: The formatted line with borders.
+            text (Optional[str]): The status text. Defaults to the current text of the status line.
         """
         width, _ = self._get_console_size()
-        padding_space = 4 # Reserve space for borders and padding
+        if text is None:
+            text = self._status_line.text if self._status_line else ''
+        status = StyledText((self.status_color, text)).truncate(width - 4).pad(width - 4)
+        return self._generate_bordered_row(' ' + status + ' ')
 
-        target_line_width = width - padding_space
-        lines = self._wrap_line(text)
-        wrapped_lines = [self._pad_text(line, target_line_width) for line in lines]
-        return ''.join(f"{self.border_color}{self.border_char}{Colors.RESET} {color}{line}{Colors.RESET} {self.border_color}{self.border_char}{Colors.RESET}\n" for line in wrapped_lines)
+    def _generate_entry_rows(self, index: int, width: int) -> list[str]:
+        """
+        Generate the rows of a history entry, and record how many there are in the line index. Wrapping is
+        cached on the entry, so unchanged entries are not wrapped again on every frame.
+
+        Args:
+            index (int): Absolute index of the history entry. Must be held in memory.
+            width (int): The console width.
+        Returns:
+            list[str]: The formatted rows, each including its trailing newline.
+        """
+        entry = self._history[index]
+        if entry.is_dinkus:
+            rows = [self._get_templates(width).dinkus]
+        else:
+            target_line_width = width - 4 # Reserve space for borders and padding
+            prefix, color = (self.input_prefix, self.input_color) if entry.is_input else ('', '')
+            lines = entry.wrap(target_line_width, prefix, color)
+            rows = [self._generate_bordered_row(' ' + self._pad_text(line, target_line_width) + ' ') for line in lines]
+        self._line_index.set(index, len(rows))
+        return rows
+
+    def _get_templates(self, width: int) -> FrameTemplates:
+        """
+        Returns the layout rows for the given width, rendering them again only if a setting they depend
+        on has changed since the last frame.
+
+        Args:
+            width (int): The console width.
+        """
+        key = (width, self.border_char, self.border_color, self.top_border_text, self.dinkus_char, self.dinkus_color)
+        if self._templates is not None and self._templates.key == key:
+            return self._templates
+
+        border_line = StyledText((self.border_color, self.border_char * width)).render() + '\n'
+        empty_line = self._generate_empty_line()
+        top = [border_line]
+        if self.top_border_text:
+            header = StyledText.coerce(self.top_border_text)
+            left_padding = max(0, width - 2 - header.width) // 2 # Account for border characters
+            centered_text = (' ' * left_padding + header).pad(width - 2)
+            top.append(self._generate_bordered_row(centered_text))
+            top.append(border_line)
+
+        # Add an empty line after the top border
+        top.append(empty_line)
+
+        self._templates = FrameTemplates(key, top, empty_line, self._generate_dinkus() + '\n', border_line)
+        return self._templates
+
+    def _sync_line_index(self, width: int) -> None:
+        """
+        Adds any history entries written since the last render to the line index. Entries that were
+        already spilled to disk are indexed as empty, since they can no longer be scrolled to.
+
+        Args:
+            width (int): The console width.
+        """
+        index = self._line_index
+        while index.count < len(self._history):
+            index.append(0)
+            if index.count > self._history.start:
+                self._generate_entry_rows(index.count - 1, width)
+
+    def _generate_history_rows(self, width: int, view_rows: int) -> list[str]:
+        """
+        Generate the history rows that fit in the view at the current scroll position. Only the entries that
+        are shown are wrapped, so the cost does not grow with the length of the history.
+
+        Args:
+            width (int): The console width.
+            view_rows (int): How many rows fit in the view.
+        Returns:
+            list[str]: The rows, oldest first.
+        """
+        index = self._line_index
+        self._sync_line_index(width)
+
+        if self._scroll_offset > 0:
+            # Keep a scrolled view still while new output arrives below it
+            self._scroll_offset += index.total - self._scroll_total
+            self._scroll_offset = min(max(self._scroll_offset, 0), max(index.total - view_rows, 0))
+        self._scroll_total = index.total
+
+        if self._scroll_offset == 0:
+            # Follow the latest output, walking back from the newest entry and measuring exactly as we go
+            chunks = [] # type: list[list[str]]
+            row_count = 0
+            entry_index = len(self._history)
+            while entry_index > self._history.start and row_count < view_rows:
+                entry_index -= 1
+                chunks.append(self._generate_entry_rows(entry_index, width))
+                row_count += len(chunks[-1])
+            self._view_top_index = entry_index
+            rows = [row for chunk in reversed(chunks) for row in chunk]
+            return rows[-view_rows:] if view_rows else []
+
+        # Scrolled back, so look up the entry on the top row and only measure what is shown
+        entry_index, skip = index.find(max(index.total - self._scroll_offset - view_rows, 0))
+        self._view_top_index = entry_index
+        rows = [] # type: list[str]
+        while entry_index < len(self._history) and len(rows) < skip + view_rows:
+            rows.extend(self._generate_entry_rows(entry_index, width))
+            entry_index += 1
+        self._scroll_total = index.total
+        return rows[skip:skip + view_rows]
+
+    def _question_indexes(self) -> list[int]:
+        """
+        Returns the absolute indexes of the host messages the player has replied to, oldest first, taking
+        the last non-empty entry before each input. Only entries held in memory are considered.
+        """
+        indexes = [] # type: list[int]
+        last_message = -1
+        for index, entry in enumerate(self._history, start=self._history.start):
+            if entry.is_input:
+                if last_message >= 0:
+                    indexes.append(last_message)
+                last_message = -1
+            elif not entry.is_dinkus and entry.text.strip():
+                last_message = index
+        return indexes
+
+    def _handle_key(self, key: str) -> bool:
+        """
+        Handles keys the line editor does not use itself.
+
+        Args:
+            key (str): The key sequence.
+        Returns:
+            bool: Whether the key was handled.
+        """
+        if key == Keys.PAGE_UP:
+            self.scroll_page(1)
+        elif key == Keys.PAGE_DOWN:
+            self.scroll_page(-1)
+        elif key in Keys.PREV_QUESTION:
+            self.scroll_to_question(-1)
+        elif key in Keys.NEXT_QUESTION:
+            self.scroll_to_question(1)
+        else:
+            return False
+        return True
 
     def _get_display_width(self, text: str) -> int:
         """
@@ -174,93 +477,130 @@ class Console:
             max_dots = self._get_console_size()[0] - self._get_display_width(message) - 4  # Reserve space for borders and padding
             dot_count += 1
             # Update the loading message with dots
-            if 0 <= self._loading_history_index < len(self._history):
+            if self._history.start <= self._loading_history_index < len(self._history):
                 animated_message = message + '.' * (dot_count % (max_dots + 1))  # Cycle through 0 to max_dots dots
                 self._history[self._loading_history_index].text = animated_message
                 self._render()
 
-    def _pad_text(self, text: str, target_width: int) -> str:
+    def _render_appended(self) -> None:
+        """
+        Renders text appended since `append` last rendered.
+        """
+        self._append_timer = None
+        self._append_rendered_at = time.monotonic()
+        self._render()
+
+    def _read_line(self, prefix: str) -> str:
+        """
+        Reads a line of input from the input source, or the terminal.
+
+        Args:
+            prefix (str): The input prompt.
+        Returns:
+            str: The line, without the newline.
+        Raises:
+            KeyboardInterrupt: If input was interrupted.
+        """
+        if self.input_source is not None:
+            return self.input_source(prefix)
+        if LineEditor.is_supported():
+            # Edit the line in place so that background renders never wipe what has been typed
+            if self._line_editor is None:
+                self._line_editor = LineEditor(self._render_lock, lambda: self._get_console_size()[0], self._handle_key)
+            past_inputs = [entry.text for entry in self._history if entry.is_input]
+            return self._line_editor.read_line(prefix, past_inputs)
+        return input(prefix)
+
+    def _pad_text(self, text: StyledText, target_width: int) -> StyledText:
         """
         Pad text to target display width, accounting for emoji display width.
 
         Args:
-            text (str): The text to pad.
+            text (StyledText): The text to pad.
             target_width (int): The target display width.
         Returns:
-            str: The padded text.
+            StyledText: The padded text.
         """
-        current_width = self._get_display_width(text)
-        padding_needed = target_width - current_width
-        return text + ' ' * max(0, padding_needed)
+        return text.pad(target_width)
 
     def _render(self):
         """
         Renders the line history to the console, leaving some space at the bottom for input
         """
-        # Do this by clearing the console and then building all the lines together into a single string,
-        # one line at a time, then printing that string to the console.
-
-        # Start by building the string. We need the console size
-        width, height = self._get_console_size()
-        output_lines = [] # type: list[str]
-
-        # Start building the string with the top border
-        border_line = self.border_color + self.border_char * width + Colors.RESET + '\n'
-        if self.top_border_text:
-            output_lines.append(border_line)
-
-            centered_text = self.top_border_text.center(width - 2) # Account for border characters
-            output_lines.append(f"{self.border_color}{self.border_char}{Colors.RESET}{centered_text}{self.border_color}{self.border_char}{Colors.RESET}\n")
-
-            output_lines.append(border_line)
-        else:
-            output_lines.append(border_line)
-
-        # Add an empty line after the top border
-        output_lines.append(self._generate_empty_line())
-        header_lines_num = len(output_lines)
-
-        # Now add each line from history
-        for entry in self._history:
-            if entry.is_dinkus:
-                output_lines.append(f"{self._generate_dinkus()}\n")
+        # Building the frame updates the line index, wrap caches and scroll position, and renders come from
+        # the main thread, the loading animation, key presses and the append timer, so the whole render holds
+        # the lock, not just the write
+        with self._render_lock:
+            # Do this by clearing the console and then building all the lines together into a single string,
+            # one line at a time, then printing that string to the console.
+
+            # Start by building the string. We need the console size
+            width, height = self._get_console_size()
+            output_lines = [] # type: list[str]
+
+            # Start with the top border, header and empty row, which are only rendered again when the layout changes
+            templates = self._get_templates(width)
+            output_lines.extend(templates.top)
+            header_lines_num = len(output_lines)
+
+            # Now add as much history as fits, leaving space for the status line, bottom border and input row.
+            # Without a known height everything in memory is shown.
+            view_rows = max(height - 4 - header_lines_num, 1) if height > 0 else sys.maxsize
+            self._view_rows = view_rows
+            output_lines.extend(self._generate_history_rows(width, view_rows))
+
+            # If there were not enough lines to fill the console, add empty lines above the generated lines,
+            # so that the latest input always appears at the bottom of the console, even if there is not
+            # enough history to fill the console.
+            padding = height - 4 - len(output_lines) # Reserve space for bottom border + padding and input lines
+            output_lines[header_lines_num:header_lines_num] = [templates.empty] * max(padding, 0)
+
+            # Add the status line before the bottom border. It is empty unless progress indicators are active.
+            output_lines.append(self._generate_status_line())
+
+            # Add the bottom border
+            output_lines.append(templates.bottom)
+
+            # Redundant style changes are stripped first, since most rows repeat the same border colors
+            frame = minimize_styles(''.join(output_lines))
+
+            # The status row sits just above the bottom border. If the frame is too tall for the screen it
+            # scrolls, leaving the bottom border on the second to last row above the input row.
+            frame_rows = frame.count('\n')
+            self._status_row = frame_rows - 1 if frame_rows + 2 <= height else height - 3
+            self._last_frame = frame
+
+            if not self.alternate_screen:
+                # Clear the console and print the output!
+                self._clear()
+                print(frame, file=self._output())
             else:
-                line = entry.text
-                color = ""
-                if entry.is_input:
-                    color = self.input_color
-                    line = f"{self.input_prefix}{line}"
-
-                output_lines.append(self._generate_line(line, color=color))
-
-        # If there were not enough lines to fill the console, add empty lines above the generated lines,
-        # so that the latest input always appears at the bottom of the console, even if there is not
-        # enough history to fill the console.
-        while len(output_lines) < height - 4: # Reserve space for bottom border + padding and input lines
-            output_lines.insert(header_lines_num, self._generate_empty_line())
-
-        # Add an empty line before the bottom border
-        output_lines.append(self._generate_empty_line())
+                # Paint over the previous frame in place with the cursor hidden, then erase anything left
+                # below it in case the terminal shrank. A single write keeps the frame in one piece.
+                self._enter_alternate_screen()
+                painted = f"{Controls.CURSOR_HIDE}{Controls.CURSOR_HOME}{frame}\n{Controls.ERASE_BELOW}{Controls.CURSOR_SHOW}"
+                if self.synchronized_output:
+                    painted = f"{Controls.SYNC_START}{painted}{Controls.SYNC_END}"
+                self._output().write(painted)
+                self._output().flush()
 
-        # Add the bottom border
-        output_lines.append(f"{self.border_color}{self.border_char * width}{Colors.RESET}\n")
+            # Repainting wipes the input row, so put back whatever is being typed
+            if self._line_editor is not None and self._line_editor.active:
+                self._line_editor.redraw()
 
-        # Clear the console and print the output!
-        self._clear()
-        print(''.join(output_lines))
-
-    def _wrap_line(self, text: str) -> list[str]:
+    def _render_status(self, text: str) -> None:
         """
-        Wraps a line of text to fit within the console width.
+        Redraws only the status row in place, leaving the rest of the frame and the cursor untouched.
 
         Args:
-            text (str): The text to wrap.
-        Returns:
-            list[str]: A list of wrapped lines.
+            text (str): The new status text.
         """
-        width, _ = self._get_console_size()
-        target_line_width = width - 4 # Reserve space for borders and padding
-        return wrap_line(text, target_line_width)
+        with self._render_lock:
+            if self._status_row <= 0:
+                return
+            row = minimize_styles(self._generate_status_line(text).rstrip("\n"))
+            self._output().write(f"{Controls.CURSOR_SAVE}{move_cursor(self._status_row)}{row}{Controls.CURSOR_RESTORE}")
+            self._output().flush()
 
     # --------- Public Methods ---------
     def load_start(self, message: str = GameStrings.LOADING_MESSAGE, interval: float = 1) -> None:
@@ -310,7 +650,7 @@ class Console:
             self._loading_thread.join(timeout=1.0)
 
         # Replace the loading message with a blank line
-        if 0 <= self._loading_history_index < len(self._history):
+        if self._history.start <= self._loading_history_index < len(self._history):
             self._history[self._loading_history_index] = ConsoleEntry(text='', is_input=False)
 
         # Clean up
@@ -329,13 +669,53 @@ class Console:
             delay_secs (float): The delay, in seconds, before exiting. Defaults to 1.5.
             message (str): Optional custom exit message. Defaults to GameStrings.EXIT_MESSAGE.
         """
+        # A pending render of appended text must not paint over the main screen once it is restored
+        if self._append_timer is not None:
+            self._append_timer.cancel()
+            self._append_timer = None
+
         self.write_empty()
         self.write(message)
         self._render()
 
-        time.sleep(delay_secs)
+        if not self.headless:
+            time.sleep(delay_secs)
+
+        # Leaving the alternate screen discards it, so repeat the message on the main screen
+        if self._alternate_screen_active:
+            self._leave_alternate_screen()
+            print(message, file=self._output())
         exit(code)
 
+    def append(self, text: Union[str, StyledText]) -> None:
+        """
+        Appends text to the latest console entry and renders, at most once every `append_interval` seconds,
+        for text that arrives a piece at a time. Starts a new entry if the latest one is an input.
+        Automatically ends any active loading animation, whose line is then reused.
+
+        Args:
+            text (str | StyledText): The text to append.
+        """
+        # End loading animation if active
+        if self._is_loading:
+            self.load_end()
+
+        if self._history and not self._history[-1].is_input and not self._history[-1].is_dinkus:
+            entry = self._history[-1]
+            entry.styled = entry.styled + StyledText.coerce(text)
+        else:
+            self._history.append(ConsoleEntry(text=text, is_input=False))
+
+        # Render at most once per interval, leaving anything appended in between to a render at its end
+        wait = self._append_rendered_at + self.append_interval - time.monotonic()
+        if wait <= 0:
+            self._append_rendered_at = time.monotonic()
+            self._render()
+        elif self._append_timer is None:
+            self._append_timer = threading.Timer(wait, self._render_appended)
+            self._append_timer.daemon = True
+            self._append_timer.start()
+
     def input(self, prompt: Optional[str] = None) -> str:
         """
         Prompts the user for input and records it in history. Will render the console before prompting.
@@ -353,7 +733,7 @@ class Console:
         self._render()
 
         try:
-            user_input = input(prompt if prompt is not None else self.input_prefix)
+            user_input = self._read_line(prompt if prompt is not None else self.input_prefix)
         except KeyboardInterrupt:
             # Handle Ctrl+C gracefully
             self.exit(message=GameStrings.EXIT_IMMEDIATE_MESSAGE, delay_secs=0)
@@ -364,9 +744,94 @@ class Console:
             # Handle explicit exit command
             self.exit()
 
+        # Answering brings the view back to the latest output
+        self._scroll_offset = 0
         self._history.append(ConsoleEntry(text=user_input, is_input=True))
         return user_input
 
+    def scroll_page(self, pages: int) -> None:
+        """
+        Scrolls the history view by whole pages and renders. One row of the previous page stays in view.
+
+        Args:
+            pages (int): Pages to scroll. Positive values scroll back to older output.
+        """
+        page = max(self._view_rows - 1, 1)
+        self._scroll_offset = max(self._scroll_offset + pages * page, 0)
+        self._render()
+
+    def scroll_to_entry(self, index: int) -> None:
+        """
+        Scrolls the history view so that the given entry is at the top, as far as the history allows, and renders.
+
+        Args:
+            index (int): Absolute index of the history entry.
+        """
+        width, _ = self._get_console_size()
+        self._sync_line_index(width)
+        rows_from_entry = self._line_index.total - self._line_index.rows_before(index)
+        self._scroll_offset = max(rows_from_entry - self._view_rows, 0)
+        self._scroll_total = self._line_index.total
+        self._render()
+
+    def scroll_to_question(self, direction: int) -> None:
+        """
+        Jumps the history view to the previous or next message the player replied to, and renders.
+        Jumping past the last one returns to the latest output.
+
+        Args:
+            direction (int): -1 for the previous message, 1 for the next one.
+        """
+        indexes = self._question_indexes()
+        if direction < 0:
+            earlier = [index for index in indexes if index < self._view_top_index]
+            if earlier:
+                self.scroll_to_entry(earlier[-1])
+        else:
+            later = [index for index in indexes if index > self._view_top_index]
+            if later:
+                self.scroll_to_entry(later[0])
+            else:
+                self.scroll_to_bottom()
+
+    def scroll_to_bottom(self) -> None:
+        """
+        Returns the history view to the latest output, and renders.
+        """
+        self._scroll_offset = 0
+        self._render()
+
+    def status_add(self, indicator: ProgressIndicator) -> ProgressIndicator:
+        """
+        Adds a live progress indicator to the status line. Indicators update in place at their own rate
+        without repainting the rest of the console.
+
+        Args:
+            indicator (ProgressIndicator): The indicator to show.
+        Returns:
+            ProgressIndicator: The same indicator, for convenience.
+        """
+        if self._status_line is None:
+            self._status_line = StatusLine(self._render_status)
+        return self._status_line.add(indicator)
+
+    def status_remove(self, indicator: ProgressIndicator) -> None:
+        """
+        Removes a progress indicator from the status line.
+
+        Args:
+            indicator (ProgressIndicator): The indicator to remove.
+        """
+        if self._status_line is not None:
+            self._status_line.remove(indicator)
+
+    def status_clear(self) -> None:
+        """
+        Removes every progress indicator from the status line.
+        """
+        if self._status_line is not None:
+            self._status_line.clear()
+
     def write_empty(self) -> None:
         """
         Writes an empty line to the console history.
@@ -378,13 +843,14 @@ class Console:
 
         self._history.append(ConsoleEntry(text='', is_input=False))
 
-    def write(self, text: str, overwrite: bool = False) -> None:
+    def write(self, text: Union[str, StyledText], overwrite: bool = False) -> None:
         """
         Writes text to the console history. Does NOT render to the console. Can optionally overwrite the
         latest console entry. Automatically ends any active loading animation.
 
         Args:
-            text (str): The text to write.
+            text (str | StyledText): The text to write. Inline escapes in plain strings are parsed into
+                styled spans.
             overwrite (bool): Whether to overwrite the last entry in history. Defaults to False.
         """
         # End loading animation if active
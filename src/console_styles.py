@@ -1,5 +1,10 @@
+import re
+
 from enum import Enum
 
+ANSI_ESCAPE_PATTERN = re.compile(r'\033\[[0-9;]*m')
+"""Compiled pattern matching a single ANSI SGR escape sequence."""
+
 # All the raw number codes
 class Codes:
     RESET = '0'
@@ -68,6 +73,19 @@ def style(*codes: str) -> str:
     # It's just a standardized magic string
     return f'\033[{";".join(codes)}m'
 
+def move_cursor(row: int, column: int = 1) -> str:
+    """
+    Constructs the control sequence that moves the cursor to an absolute screen position.
+
+    Args:
+        row (int): The 1-based row.
+        column (int): The 1-based column. Defaults to 1.
+
+    Returns:
+        str: The control sequence string.
+    """
+    return f'\033[{row};{column}H'
+
 def remove_styles(text: str) -> str:
     """
     Removes all ANSI styles from the given text
@@ -77,9 +95,140 @@ def remove_styles(text: str) -> str:
     Returns:
         str: The text without ANSI styles.
     """
-    import re
-    ansi_escape = re.compile(r'\033\[[0-9;]*m')
-    return ansi_escape.sub('', text)
+    # Most text never contains an escape at all, so skip the regex entirely in that case
+    if '\033' not in text:
+        return text
+    return ANSI_ESCAPE_PATTERN.sub('', text)
+
+# Which state slot each "set" code writes to, and which slots each "reset" code clears
+_SET_SLOTS = {
+    Codes.BOLD: 'bold', Codes.DIM: 'dim', Codes.ITALIC: 'italic', Codes.UNDERLINE: 'underline',
+    Codes.BLINK: 'blink', Codes.REVERSE: 'reverse', Codes.HIDDEN: 'hidden', Codes.STRIKETHROUGH: 'strikethrough',
+}
+_RESET_SLOTS = {
+    Codes.RESET_BOLD: ('bold', 'dim'), Codes.RESET_ITALIC: ('italic',), Codes.RESET_UNDERLINE: ('underline',),
+    Codes.RESET_BLINK: ('blink',), Codes.RESET_REVERSE: ('reverse',), Codes.RESET_HIDDEN: ('hidden',),
+    Codes.RESET_STRIKETHROUGH: ('strikethrough',), Codes.COLOR_DEFAULT: ('fg',), Codes.BG_COLOR_DEFAULT: ('bg',),
+}
+_UNSET_CODES = {
+    'bold': Codes.RESET_BOLD, 'dim': Codes.RESET_DIM, 'italic': Codes.RESET_ITALIC, 'underline': Codes.RESET_UNDERLINE,
+    'blink': Codes.RESET_BLINK, 'reverse': Codes.RESET_REVERSE, 'hidden': Codes.RESET_HIDDEN,
+    'strikethrough': Codes.RESET_STRIKETHROUGH, 'fg': Codes.COLOR_DEFAULT, 'bg': Codes.BG_COLOR_DEFAULT,
+}
+
+# Slots that change how a blank cell looks. Whitespace only needs these to be correct before it is written.
+_BLANK_VISIBLE_SLOTS = ('bg', 'reverse', 'underline', 'strikethrough')
+
+def _apply_codes(state: dict[str, str], params: str) -> None:
+    """
+    Applies the parameters of a single SGR escape to a graphic state, in place.
+
+    Args:
+        state (dict[str, str]): The graphic state, mapping slot names to the code that set them.
+        params (str): The raw parameters of the escape, e.g. '1;34'.
+    """
+    codes = params.split(';') if params else [Codes.RESET]
+    i = 0
+    while i < len(codes):
+        code = codes[i] or Codes.RESET
+        if code in ('38', '48') and i + 1 < len(codes):
+            # Extended colors consume their arguments: 38;5;n or 38;2;r;g;b
+            length = 3 if codes[i + 1] == '5' else 5
+            state['fg' if code == '38' else 'bg'] = ';'.join(codes[i:i + length])
+            i += length
+            continue
+
+        if code == Codes.RESET:
+            state.clear()
+        elif code in _SET_SLOTS:
+            state[_SET_SLOTS[code]] = code
+        elif code in _RESET_SLOTS:
+            for slot in _RESET_SLOTS[code]:
+                state.pop(slot, None)
+        elif code.isdigit() and (30 <= int(code) <= 37 or 90 <= int(code) <= 97):
+            state['fg'] = code
+        elif code.isdigit() and (40 <= int(code) <= 47 or 100 <= int(code) <= 107):
+            state['bg'] = code
+        else:
+            # Anything we do not understand can only be safely undone with a full reset
+            state[f'other:{code}'] = code
+        i += 1
+
+def _transition(current: dict[str, str], target: dict[str, str]) -> str:
+    """
+    Returns the shortest escape that moves the terminal from one graphic state to another.
+
+    Args:
+        current (dict[str, str]): The state the terminal is in.
+        target (dict[str, str]): The state the terminal should be in.
+    Returns:
+        str: A single escape sequence, or '' if the states already match.
+    """
+    if current == target:
+        return ''
+
+    # Option 1: reset everything, then set the target state from scratch
+    from_reset = style(Codes.RESET, *target.values())
+
+    # Option 2: only touch the slots that differ, which is impossible if an unknown code has to be undone
+    removed = [slot for slot in current if slot not in target]
+    if any(slot.startswith('other:') for slot in removed):
+        return from_reset
+
+    codes = [] # type: list[str]
+    for slot in removed:
+        if _UNSET_CODES[slot] not in codes:
+            codes.append(_UNSET_CODES[slot])
+    for slot, code in target.items():
+        # Bold and dim share a reset code, so clearing one may have cleared the other too
+        cleared_by_shared_reset = slot in ('bold', 'dim') and Codes.RESET_BOLD in codes
+        if current.get(slot) != code or cleared_by_shared_reset:
+            codes.append(code)
+    incremental = style(*codes)
+
+    return incremental if len(incremental) < len(from_reset) else from_reset
+
+def minimize_styles(text: str) -> str:
+    """
+    Removes redundant ANSI styles from the given text by tracking the terminal's graphic state. Escapes
+    that do not change the state are dropped, consecutive escapes are merged into one, and style
+    changes are delayed past whitespace that would look the same either way. The result renders
+    identically to the input, assuming the terminal starts in its default state.
+
+    Args:
+        text (str): The text with ANSI styles.
+    Returns:
+        str: The text with the minimal set of ANSI styles.
+    """
+    if '\033' not in text:
+        return text
+
+    output = [] # type: list[str]
+    current = {} # type: dict[str, str]
+    target = {} # type: dict[str, str]
+    position = 0
+    for match in [*ANSI_ESCAPE_PATTERN.finditer(text), None]:
+        segment = text[position:match.start()] if match else text[position:]
+        if segment:
+            if current != target:
+                # Whitespace can be written early if every slot that affects a blank cell already matches
+                blank_prefix = len(segment) - len(segment.lstrip(' \n'))
+                blank_slots = [*_BLANK_VISIBLE_SLOTS, *(slot for slot in {**current, **target} if slot.startswith('other:'))]
+                if blank_prefix and all(current.get(slot) == target.get(slot) for slot in blank_slots):
+                    output.append(segment[:blank_prefix])
+                    segment = segment[blank_prefix:]
+                if segment:
+                    output.append(_transition(current, target))
+                    current = dict(target)
+            output.append(segment)
+
+        if match:
+            _apply_codes(target, match.group()[2:-1])
+            position = match.end()
+
+    # Leave the terminal in the same state the original text would have
+    output.append(_transition(current, target))
+    return ''.join(output)
 
 class Graphics:
     """
@@ -160,3 +309,18 @@ class BrightBackgroundColors:
     MAGENTA = style(Codes.BG_COLOR_BRIGHT_MAGENTA)
     CYAN    = style(Codes.BG_COLOR_BRIGHT_CYAN)
     WHITE   = style(Codes.BG_COLOR_BRIGHT_WHITE)
+
+class Controls:
+    """
+    Enum representing pre-rendered terminal control sequences that are not styles.
+    """
+    ALT_SCREEN_ENTER = '\033[?1049h'
+    ALT_SCREEN_EXIT  = '\033[?1049l'
+    SYNC_START       = '\033[?2026h'
+    SYNC_END         = '\033[?2026l'
+    CURSOR_HIDE      = '\033[?25l'
+    CURSOR_SHOW      = '\033[?25h'
+    CURSOR_HOME      = '\033[H'
+    CURSOR_SAVE      = '\0337'
+    CURSOR_RESTORE   = '\0338'
+    ERASE_BELOW      = '\033[J'
@@ -0,0 +1,382 @@
+import threading
+
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence
+
+from google.genai import types
+from pydantic import BaseModel
+
+from candidates import CandidateRanker, CandidateRanking
+from model_client import DEFAULT_MODEL, ModelClient, ModelRequest, TurnCancelled
+from partial_json import PartialJSONError, PartialJSONParser
+from strings import GamePrompts
+
+if TYPE_CHECKING:
+    from model_router import ModelRouter, ModelTier
+
+HOST_CHARACTER_NAME = "Rotanika"
+"""Name of the host character."""
+
+TURNS_BEFORE_SURRENDER = 20
+"""Questions the host may ask before it has to offer to surrender."""
+
+TURNS_AFTER_SURRENDER = 10
+"""Extra questions the host gets each time the player chooses to keep playing."""
+
+RANK_FROM_QUESTION = 8
+"""Question number from which the shortlist is ranked alongside each host turn, to estimate how close a guess is."""
+
+GUESS_HINT_CONFIDENCE = 0.5
+"""Ranking confidence from which the host is told the most likely candidates, to steer its next guess."""
+
+GUESS_HINT_CANDIDATES = 3
+"""How many of the best ranked candidates the host is told about."""
+
+class RunOutput(BaseModel):
+    """
+    Structured reply from the host for a single turn.
+    """
+    is_question: bool
+    content: str
+    reasoning: str
+
+class GameState(Enum):
+    QUESTION_ROUND = 1
+    SURRENDER_ROUND = 2
+
+def is_last_question(question_num: int) -> bool:
+    """
+    Returns whether the given question is the last one before the host has to offer to surrender.
+
+    Args:
+        question_num (int): The 1-based question number.
+    """
+    questions_before_surrender = question_num - TURNS_BEFORE_SURRENDER
+    return questions_before_surrender >= 0 and questions_before_surrender % TURNS_AFTER_SURRENDER == 0
+
+def system_instructions() -> str:
+    """
+    Returns the host's system instructions.
+    """
+    return GamePrompts.SYSTEM_INSTRUCTIONS.format(
+        host_character_name=HOST_CHARACTER_NAME,
+        turns_before_surrender=TURNS_BEFORE_SURRENDER,
+        turns_after_surrender=TURNS_AFTER_SURRENDER,
+        system_prefix=GamePrompts.SYSTEM_PREFIX,
+    )
+
+class TurnRecord:
+    """
+    Timing and usage of a single host turn.
+    """
+    def __init__(
+        self,
+        question_num: int,
+        model: str,
+        first_token_secs: float,
+        total_secs: float,
+        token_count: int,
+        tier: Optional['ModelTier'] = None,
+    ):
+        self.question_num = question_num
+        self.model = model
+        self.tier = tier
+        self.first_token_secs = first_token_secs
+        self.total_secs = total_secs
+        self.token_count = token_count
+
+class Game:
+    """
+    The game engine. Keeps the conversation with the host model and moves between question and surrender
+    rounds. Does no input or output itself, so it can be driven by the console or by a simulated player.
+    """
+    def __init__(
+        self,
+        client: ModelClient,
+        model: str = DEFAULT_MODEL,
+        router: Optional['ModelRouter'] = None,
+        ranker: Optional[CandidateRanker] = None,
+        shortlist: Optional[Callable[[str], Sequence[str]]] = None,
+    ):
+        """
+        Args:
+            client (ModelClient): The client used to talk to the host model.
+            model (str): The model playing the host. Defaults to DEFAULT_MODEL.
+            router (Optional[ModelRouter]): Picks the model per turn instead, if given.
+            ranker (Optional[CandidateRanker]): Scores the shortlist in late question rounds, to set `confidence`.
+                Runs in the background while the host replies, so it never delays a turn.
+            shortlist (Optional[Callable[[str], Sequence[str]]]): Returns the characters worth ranking, given
+                the known facts. Ranking only happens when both this and `ranker` are given.
+        """
+        self.client = client
+        self.model = model
+        self.router = router
+        self.ranker = ranker
+        self.shortlist = shortlist
+
+        self.confidence = None # type: Optional[float]
+        """The engine's confidence in its leading candidate, from 0 to 1, once something has estimated it."""
+
+        self.ranking = None # type: Optional[CandidateRanking]
+        """The latest ranking of the shortlist, which steers the host's guesses."""
+
+        self.question_num = 0
+        self.game_state = GameState.QUESTION_ROUND
+        self.contents = [] # type: List[dict]
+        self.turns = [] # type: List[TurnRecord]
+        self.ranking_tokens = 0
+        """Tokens spent ranking candidates, which are not part of any turn record."""
+        self._ranking_thread = None # type: Optional[threading.Thread]
+
+    # --------- Utility Methods ---------
+    def _config(self) -> types.GenerateContentConfig:
+        """
+        Returns the generation config for host turns.
+        """
+        return types.GenerateContentConfig(
+            system_instruction=system_instructions(),
+            response_mime_type='application/json',
+            response_schema=RunOutput,
+        )
+
+    def _start_ranking(self, question_num: int, contents: List[dict]) -> None:
+        """
+        Starts ranking the shortlist against the conversation, including the player's pending answer, on a
+        background thread, once the game is far enough along for a guess to be likely. The ranking runs
+        alongside the host's reply and steers the next turn, so it never adds to the wait for a turn.
+        Does nothing while an earlier ranking is still running.
+
+        Args:
+            question_num (int): The question number of the upcoming turn.
+            contents (List[dict]): The conversation, ending with the player's pending turn.
+        """
+        if self.ranker is None or self.shortlist is None:
+            return
+        if self.game_state != GameState.QUESTION_ROUND or question_num < RANK_FROM_QUESTION:
+            return
+        if self._ranking_thread is not None and self._ranking_thread.is_alive():
+            return
+        self._ranking_thread = threading.Thread(target=self._rank, args=(self.ranker, self.shortlist, contents), daemon=True)
+        self._ranking_thread.start()
+
+    def _rank(self, ranker: CandidateRanker, shortlist: Callable[[str], Sequence[str]], contents: List[dict]) -> None:
+        """
+        Ranks the shortlist for the given conversation. Runs on the ranking thread.
+
+        Args:
+            ranker (CandidateRanker): The ranker to use.
+            shortlist (Callable[[str], Sequence[str]]): Returns the characters worth ranking.
+            contents (List[dict]): The conversation, ending with the player's pending turn.
+        """
+        try:
+            candidates = shortlist(self.known_facts(contents))
+            if candidates:
+                self.rank_candidates(ranker, candidates, contents)
+        except Exception:
+            # Ranking only steers the host, and nothing on this thread could report a failure without drawing
+            # over the console, so any error, malformed response or API problem just leaves the game unranked
+            pass
+
+    def _guess_hint(self, question_num: int, contents: List[dict]) -> Optional[str]:
+        """
+        Returns a note naming the best ranked candidates, once the latest ranking is confident or the host is
+        down to its last question, so the host's guess draws on the ranking instead of only its own reasoning.
+        Candidates the host has already asked about are left out, since a guess that is still being asked
+        about must have been wrong.
+
+        Args:
+            question_num (int): The question number of the upcoming turn.
+            contents (List[dict]): The conversation, ending with the player's pending turn.
+        """
+        ranking = self.ranking
+        if ranking is None or ranking.confidence <= 0:
+            return None
+        if ranking.confidence < GUESS_HINT_CONFIDENCE and not is_last_question(question_num):
+            return None
+        asked = self.known_facts(contents)
+        likely = [name for name in ranking.ranked if ranking.scores[name] > 0 and name not in asked]
+        if not likely:
+            return None
+        return GamePrompts.LIKELY_CANDIDATES.format(candidates=', '.join(likely[:GUESS_HINT_CANDIDATES]))
+
+    def _run_turn(
+        self,
+        question_num: int,
+        system_note: Optional[str] = None,
+        user_input: Optional[str] = None,
+        on_content: Optional[Callable[[str], None]] = None,
+        on_is_question: Optional[Callable[[bool], None]] = None,
+    ) -> RunOutput:
+        """
+        Sends the next user turn to the host and records its reply. The reply is parsed as it streams, so
+        the content can be shown before the host has finished writing its reasoning.
+
+        Args:
+            question_num (int): The question number the reply belongs to, for the turn record.
+            system_note (Optional[str]): Instructions for the host from the `system` role.
+            user_input (Optional[str]): What the player said.
+            on_content (Optional[Callable[[str], None]]): Called with each new piece of the reply content.
+            on_is_question (Optional[Callable[[bool], None]]): Called as soon as `is_question` is known.
+        Returns:
+            RunOutput: The host's reply.
+        Raises:
+            TurnCancelled: If Ctrl+C is pressed during the turn.
+        """
+        notes = [system_note] if system_note else [] # type: List[str]
+        answer = [{'text': user_input}] if user_input is not None else [] # type: List[dict]
+
+        def user_turn() -> dict:
+            # The player's answer always comes last, after any notes for the host
+            return {'role': 'user', 'parts': [{'text': f"{GamePrompts.SYSTEM_PREFIX} {note}"} for note in notes] + answer}
+
+        # The ranking sees the player's answer, but not the hint that came from the previous ranking
+        rank_contents = self.contents + [user_turn()]
+        hint = self._guess_hint(question_num, rank_contents) if self.game_state == GameState.QUESTION_ROUND else None
+        if hint is not None:
+            notes.append(hint)
+
+        def on_string_delta(name: str, delta: str) -> None:
+            if name == 'content' and on_content is not None:
+                on_content(delta)
+
+        def on_field(name: str, value: object) -> None:
+            if name == 'is_question' and on_is_question is not None:
+                on_is_question(bool(value))
+
+        model, tier = self.model, None
+        if self.router is not None:
+            tier = self.router.route(self.game_state, question_num, self.confidence)
+            model = self.router.model(tier)
+
+        contents = self.contents + [user_turn()]
+        stream = self.client.stream(ModelRequest(contents, model=model, config=self._config()))
+        parser = PartialJSONParser(on_string_delta, on_field) # type: Optional[PartialJSONParser]
+        chunks = [] # type: List[str]
+        try:
+            self._start_ranking(question_num, rank_contents)
+            for chunk in stream:
+                chunks.append(chunk.text)
+                if parser is not None:
+                    try:
+                        parser.feed(chunk.text)
+                    except PartialJSONError:
+                        # Stop streaming and leave it to the full validation below to report the problem
+                        parser = None
+        except KeyboardInterrupt:
+            # Ctrl+C can also land while the content is being shown, outside of the stream itself
+            raise TurnCancelled("Model turn cancelled")
+
+        result = stream.result(''.join(chunks))
+        output = RunOutput.model_validate_json(result.text)
+
+        # Only keep the turn once it succeeded, so a cancelled turn can simply be tried again
+        self.contents = contents + [{'role': 'model', 'parts': [{'text': result.text}]}]
+        self.turns.append(TurnRecord(question_num, model, result.first_token_secs, result.total_secs, result.token_count, tier))
+        if tier is not None:
+            self.router.record_turn(tier, result.first_token_secs, result.total_secs, result.token_count)
+        return output
+
+    # --------- Public Methods ---------
+    def start(
+        self,
+        on_content: Optional[Callable[[str], None]] = None,
+        on_is_question: Optional[Callable[[bool], None]] = None,
+    ) -> RunOutput:
+        """
+        Starts the game by having the host introduce themselves.
+
+        Args:
+            on_content (Optional[Callable[[str], None]]): Called with each new piece of the reply content.
+            on_is_question (Optional[Callable[[bool], None]]): Called as soon as `is_question` is known.
+        Returns:
+            RunOutput: The host's introduction.
+        """
+        return self._run_turn(self.question_num, GamePrompts.INTRODUCTION, None, on_content, on_is_question)
+
+    def respond(
+        self,
+        user_input: str,
+        on_content: Optional[Callable[[str], None]] = None,
+        on_is_question: Optional[Callable[[bool], None]] = None,
+    ) -> RunOutput:
+        """
+        Sends the player's reply to the host and advances the game state.
+
+        Args:
+            user_input (str): What the player said.
+            on_content (Optional[Callable[[str], None]]): Called with each new piece of the reply content.
+            on_is_question (Optional[Callable[[bool], None]]): Called as soon as `is_question` is known.
+        Returns:
+            RunOutput: The host's reply.
+        """
+        match self.game_state:
+            case GameState.QUESTION_ROUND:
+                question_num = self.question_num + 1
+                system_note = None
+                if is_last_question(question_num):
+                    # If this is the last question that the host can ask, provide instruction
+                    system_note = GamePrompts.LAST_QUESTION
+
+                output = self._run_turn(question_num, system_note, user_input, on_content, on_is_question)
+                self.question_num = question_num
+                if system_note is not None:
+                    self.game_state = GameState.SURRENDER_ROUND
+                return output
+
+            case GameState.SURRENDER_ROUND:
+                output = self._run_turn(self.question_num, GamePrompts.SURRENDER_ROUND, user_input, on_content, on_is_question)
+
+                # Surrender rounds only ever last a single turn
+                self.game_state = GameState.QUESTION_ROUND
+                return output
+
+    def known_facts(self, contents: Optional[List[dict]] = None) -> str:
+        """
+        Returns the host's questions so far with the player's answers, one pair per line, e.g. for searching
+        a character index with.
+
+        Args:
+            contents (Optional[List[dict]]): The conversation to read. Defaults to the game's conversation.
+        """
+        contents = self.contents if contents is None else contents
+        lines = [] # type: List[str]
+        for model_turn, user_turn in zip(contents, contents[1:]):
+            if model_turn['role'] != 'model':
+                continue
+            output = RunOutput.model_validate_json(model_turn['parts'][0]['text'])
+            if output.is_question:
+                lines.append(f"{output.content} {user_turn['parts'][-1]['text']}")
+        return '\n'.join(lines)
+
+    def rank_candidates(
+        self,
+        ranker: CandidateRanker,
+        candidates: Sequence[str],
+        contents: Optional[List[dict]] = None,
+    ) -> CandidateRanking:
+        """
+        Scores a shortlist of characters against the conversation so far, and updates the engine's confidence
+        from the result so the router can send the next turn to the strong tier once a guess is likely.
+
+        Args:
+            ranker (CandidateRanker): The ranker to use.
+            candidates (Sequence[str]): The shortlist.
+            contents (Optional[List[dict]]): The conversation to rank against. Defaults to the game's conversation.
+        Returns:
+            CandidateRanking: The scores.
+        """
+        ranking = ranker.score(self.contents if contents is None else contents, candidates)
+        self.ranking = ranking
+        self.confidence = ranking.confidence
+        self.ranking_tokens += ranking.token_count
+        return ranking
+
+    def wait_for_ranking(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits for a ranking running in the background to finish, e.g. before reporting the tokens it used.
+
+        Args:
+            timeout (Optional[float]): The longest wait in seconds. Defaults to no limit.
+        """
+        if self._ranking_thread is not None:
+            self._ranking_thread.join(timeout)
@@ -0,0 +1,357 @@
+import time
+import heapq
+import itertools
+import threading
+
+from enum import IntEnum
+from typing import Any, Callable, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+class Priority(IntEnum):
+    """
+    Order in which waiting model calls are served. Lower values go first.
+    """
+    INTERACTIVE = 0
+    """A player is waiting for this call."""
+
+    SPECULATIVE = 1
+    """Work that might be useful soon, like hedged requests or pre-computed branches."""
+
+    BACKGROUND = 2
+    """Work nobody is waiting for."""
+
+def is_quota_error(error: BaseException) -> bool:
+    """
+    Returns whether an error means the API quota was exceeded (HTTP 429).
+
+    Args:
+        error (BaseException): The error raised by the API client.
+    """
+    return getattr(error, 'code', None) == 429
+
+def quota_retry_after(error: BaseException) -> Optional[float]:
+    """
+    Returns how long the API asked us to wait before retrying, if it said.
+
+    Args:
+        error (BaseException): The quota error raised by the API client.
+    Returns:
+        Optional[float]: The delay in seconds, or None if the error does not include one.
+    """
+    details = getattr(error, 'details', None)
+    if not isinstance(details, dict):
+        return None
+    for detail in details.get('error', {}).get('details', []):
+        delay = detail.get('retryDelay') if isinstance(detail, dict) else None
+        if isinstance(delay, str) and delay.endswith('s'):
+            try:
+                return float(delay[:-1])
+            except ValueError:
+                return None
+    return None
+
+class TokenBucket:
+    """
+    Classic token bucket. Tokens refill continuously at a per-minute rate up to a burst capacity, and
+    each use takes tokens out. The level may go negative when actual usage turns out higher than estimated,
+    which delays later callers until the debt is paid back.
+    """
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            per_minute (float): Refill rate, in tokens per minute.
+            capacity (Optional[float]): Maximum tokens held at once. Defaults to one minute's worth.
+        """
+        self.per_minute = per_minute
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """
+        Adds the tokens that have accumulated since the last update.
+
+        Args:
+            now (float): The current `time.monotonic()` value.
+        """
+        self.level = min(self.capacity, self.level + (now - self._updated_at) * self.per_minute / 60)
+        self._updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Returns how many seconds until the given amount can be taken.
+
+        Args:
+            amount (float): The tokens needed. Clamped to the capacity, so huge requests can still run.
+            now (float): The current `time.monotonic()` value.
+        """
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(missing, 0) * 60 / self.per_minute if self.per_minute > 0 else float('inf')
+
+    def take(self, amount: float, now: float) -> None:
+        """
+        Takes tokens out of the bucket, even if that leaves it in debt.
+
+        Args:
+            amount (float): The tokens to take. Negative amounts give tokens back.
+            now (float): The current `time.monotonic()` value.
+        """
+        self._refill(now)
+        self.level = min(self.capacity, self.level - amount)
+
+    def drain(self, now: float) -> None:
+        """
+        Empties the bucket, so that calls restart gradually after a quota error.
+
+        Args:
+            now (float): The current `time.monotonic()` value.
+        """
+        self._refill(now)
+        self.level = min(self.level, 0)
+
+class Permit:
+    """
+    Permission to make one model call. Release it when the call is done, ideally with the actual token
+    usage so that the token budget stays accurate.
+    """
+    def __init__(self, governor: 'Governor', estimated_tokens: int):
+        self._governor = governor
+        self._released = False
+        self.estimated_tokens = estimated_tokens
+        self.actual_tokens = None # type: Optional[int]
+        self.used = True
+
+    def record_tokens(self, tokens: int) -> None:
+        """
+        Records how many tokens the call actually used.
+
+        Args:
+            tokens (int): The reported token usage.
+        """
+        self.actual_tokens = tokens
+
+    def mark_unused(self) -> None:
+        """
+        Records that the call was never made, so its request and tokens are given back on release.
+        """
+        self.used = False
+        self.actual_tokens = 0
+
+    def release(self, succeeded: bool = True) -> None:
+        """
+        Gives the concurrency slot back. Safe to call more than once.
+
+        Args:
+            succeeded (bool): Whether the call went through, which resets the quota backoff.
+        """
+        if self._released:
+            return
+        self._released = True
+        self._governor._release(self, succeeded)
+
+    def __enter__(self) -> 'Permit':
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        self.release(succeeded=exc is None or not is_quota_error(exc))
+
+class Governor:
+    """
+    Singleton that every model call goes through, so that all sessions sharing one API key stay under the
+    quota together. Calls wait for request and token budgets and a concurrency slot. Waiting calls are
+    served by priority, so interactive turns overtake speculative and background work. After a quota error
+    everything pauses for the requested delay and then restarts gradually.
+    """
+
+    # --------- Internal Variables ---------
+    # Singleton instance
+    _instance = None
+
+    #* Property Attributes *#
+    requests_per_minute: float = 60
+    """Request quota per minute."""
+
+    tokens_per_minute: float = 250_000
+    """Token quota per minute."""
+
+    max_concurrency: int = 8
+    """Maximum number of calls in flight at once."""
+
+    max_retries: int = 3
+    """How many times `call` retries after a quota error."""
+
+    backoff_initial_secs: float = 2
+    """Pause after the first quota error in a row, when the API does not say how long to wait."""
+
+    backoff_max_secs: float = 60
+    """Longest pause after repeated quota errors."""
+
+    on_pause: Optional[Callable[[float], None]] = None
+    """Called with the pause in seconds whenever calls are paused after a quota error, e.g. to show a countdown."""
+
+    # --------- Constructor ---------
+    def __new__(cls):
+        """
+        Ensures only one instance of Governor exists (Singleton pattern).
+        """
+        if cls._instance is None:
+            instance = super(Governor, cls).__new__(cls)
+            instance._condition = threading.Condition()
+            instance._waiting = [] # type: List[tuple[int, int]]
+            instance._sequence = itertools.count()
+            instance._active = 0
+            instance._blocked_until = 0.0
+            instance._consecutive_quota_errors = 0
+            instance._request_bucket = TokenBucket(cls.requests_per_minute)
+            instance._token_bucket = TokenBucket(cls.tokens_per_minute)
+            cls._instance = instance
+        return cls._instance
+
+    # --------- Utility Methods ---------
+    def _wait_time(self, estimated_tokens: int, now: float) -> float:
+        """
+        Returns how long the call at the head of the queue has to wait. Must hold the condition.
+
+        Args:
+            estimated_tokens (int): Tokens the call is expected to use.
+            now (float): The current `time.monotonic()` value.
+        Returns:
+            float: Seconds to wait, or infinity if it has to wait for another call to finish.
+        """
+        # Pick up any changes made to the limits since the buckets were created
+        self._request_bucket.per_minute = self._request_bucket.capacity = self.requests_per_minute
+        self._token_bucket.per_minute = self._token_bucket.capacity = self.tokens_per_minute
+
+        if self._active >= self.max_concurrency:
+            return float('inf')
+        return max(
+            self._blocked_until - now,
+            self._request_bucket.wait_time(1, now),
+            self._token_bucket.wait_time(estimated_tokens, now),
+        )
+
+    def _release(self, permit: Permit, succeeded: bool) -> None:
+        """
+        Frees a concurrency slot and settles the token estimate against the actual usage.
+
+        Args:
+            permit (Permit): The permit being released.
+            succeeded (bool): Whether the call went through.
+        """
+        with self._condition:
+            self._active -= 1
+            now = time.monotonic()
+            if permit.actual_tokens is not None:
+                self._token_bucket.take(permit.actual_tokens - permit.estimated_tokens, now)
+            if not permit.used:
+                self._request_bucket.take(-1, now)
+            if succeeded:
+                self._consecutive_quota_errors = 0
+            self._condition.notify_all()
+
+    # --------- Public Methods ---------
+    def acquire(self, priority: Priority = Priority.INTERACTIVE, estimated_tokens: int = 0) -> Permit:
+        """
+        Blocks until the call may go ahead.
+
+        Args:
+            priority (Priority): How urgent the call is. Defaults to interactive.
+            estimated_tokens (int): Tokens the call is expected to use, input and output. Defaults to 0.
+        Returns:
+            Permit: The permit, which must be released when the call is done. Usable as a context manager.
+        """
+        with self._condition:
+            ticket = (int(priority), next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    wait = None # type: Optional[float]
+                    if self._waiting[0] == ticket:
+                        now = time.monotonic()
+                        wait = self._wait_time(estimated_tokens, now)
+                        if wait <= 0:
+                            heapq.heappop(self._waiting)
+                            self._request_bucket.take(1, now)
+                            self._token_bucket.take(estimated_tokens, now)
+                            self._active += 1
+                            self._condition.notify_all()
+                            return Permit(self, estimated_tokens)
+                    self._condition.wait(None if wait is None or wait == float('inf') else wait)
+            except BaseException:
+                # Leave the queue cleanly, e.g. on Ctrl+C, so the next caller is not stuck behind us
+                if ticket in self._waiting:
+                    self._waiting.remove(ticket)
+                    heapq.heapify(self._waiting)
+                self._condition.notify_all()
+                raise
+
+    def report_quota_exceeded(self, retry_after: Optional[float] = None) -> float:
+        """
+        Pauses every call after a quota error, and empties the buckets so traffic ramps back up gradually.
+
+        Args:
+            retry_after (Optional[float]): How long the API asked us to wait, if it said.
+        Returns:
+            float: The pause, in seconds.
+        """
+        with self._condition:
+            if retry_after is None:
+                retry_after = min(self.backoff_initial_secs * 2 ** self._consecutive_quota_errors, self.backoff_max_secs)
+            self._consecutive_quota_errors += 1
+
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+            self._request_bucket.drain(now)
+            self._token_bucket.drain(now)
+            self._condition.notify_all()
+
+        if self.on_pause is not None:
+            self.on_pause(retry_after)
+        return retry_after
+
+    def call(
+        self,
+        func: Callable[[Permit], T],
+        priority: Priority = Priority.INTERACTIVE,
+        estimated_tokens: int = 0,
+        can_retry: Optional[Callable[[], bool]] = None,
+    ) -> T:
+        """
+        Runs a model call under a permit, retrying after quota errors.
+
+        Args:
+            func (Callable[[Permit], T]): Makes the call. Receives the permit so it can record token usage.
+            priority (Priority): How urgent the call is. Defaults to interactive.
+            estimated_tokens (int): Tokens the call is expected to use. Defaults to 0.
+            can_retry (Optional[Callable[[], bool]]): Checked after a quota error. Returning False raises the
+                error instead of retrying, e.g. if part of a streamed response was already used.
+        Returns:
+            T: Whatever `func` returns.
+        """
+        for attempt in itertools.count():
+            with self.acquire(priority, estimated_tokens) as permit:
+                try:
+                    return func(permit)
+                except Exception as e:
+                    if not is_quota_error(e):
+                        raise
+                    # Every quota error pauses the other calls, including the last one before giving up
+                    permit.release(succeeded=False)
+                    self.report_quota_exceeded(quota_retry_after(e))
+                    if attempt >= self.max_retries or not (can_retry is None or can_retry()):
+                        raise
+        raise AssertionError("unreachable")
+
+def estimate_tokens(contents: Any, expected_output_tokens: int = 512) -> int:
+    """
+    Roughly estimates the tokens a request will use, at about four characters per token.
+
+    Args:
+        contents (Any): The request contents.
+        expected_output_tokens (int): Tokens expected in the response. Defaults to 512.
+    Returns:
+        int: The estimated total tokens.
+    """
+    return len(str(contents)) // 4 + expected_output_tokens
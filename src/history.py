@@ -0,0 +1,238 @@
+import json
+import struct
+import tempfile
+
+from typing import IO, Iterator, List, Optional, Union
+
+from styled_text import StyledText
+
+_OFFSET = struct.Struct('<Q')
+"""Format of each entry in the spill index file: the byte offset of the entry in the spill file."""
+
+_INPUT_FLAG = 1
+_DINKUS_FLAG = 2
+
+class ConsoleEntry:
+    """
+    Represents a console entry.
+    """
+    __slots__ = ('_styled', 'is_input', 'is_dinkus', '_wrap_key', '_wrap_lines')
+
+    def __init__(self, text: Union[str, StyledText], is_input: bool = False, is_dinkus: bool = False):
+        self.styled = StyledText.coerce(text)
+        self.is_input = is_input
+        self.is_dinkus = is_dinkus
+
+    @property
+    def styled(self) -> StyledText:
+        """The styled text of the entry."""
+        return self._styled
+
+    @styled.setter
+    def styled(self, value: StyledText) -> None:
+        self._styled = value
+        self._wrap_key = None # type: Optional[tuple[int, str, str]]
+        self._wrap_lines = None # type: Optional[list[StyledText]]
+
+    @property
+    def text(self) -> str:
+        """The plain text of the entry, without any styles."""
+        return self._styled.plain
+
+    @text.setter
+    def text(self, value: Union[str, StyledText]) -> None:
+        self.styled = StyledText.coerce(value)
+
+    def wrap(self, max_width: int, prefix: str = '', color: str = '') -> list[StyledText]:
+        """
+        Returns the entry wrapped to the given width. The result is cached until the text, width, prefix or
+        color change, so unchanged entries are not wrapped again on every frame.
+
+        Args:
+            max_width (int): The maximum display width of each line.
+            prefix (str): Text shown before the entry, e.g. the input prompt.
+            color (str): The style to apply to any unstyled parts of the text.
+        Returns:
+            list[StyledText]: The wrapped lines.
+        """
+        key = (max_width, prefix, color)
+        if self._wrap_key != key or self._wrap_lines is None:
+            text = StyledText.coerce(prefix) + self._styled if prefix else self._styled
+            self._wrap_lines = text.with_default_style(color).wrap(max_width)
+            self._wrap_key = key
+        return self._wrap_lines
+
+    def to_record(self) -> str:
+        """
+        Serialises the entry to a single line of JSON, for spilling to disk.
+        """
+        flags = (_INPUT_FLAG if self.is_input else 0) | (_DINKUS_FLAG if self.is_dinkus else 0)
+        return json.dumps([flags, [list(span) for span in self._styled.spans]], ensure_ascii=False)
+
+    @classmethod
+    def from_record(cls, record: str) -> 'ConsoleEntry':
+        """
+        Reads an entry serialised with `to_record`.
+
+        Args:
+            record (str): The JSON line.
+        """
+        flags, spans = json.loads(record)
+        return cls(StyledText(*(tuple(span) for span in spans)), bool(flags & _INPUT_FLAG), bool(flags & _DINKUS_FLAG))
+
+class HistoryStore:
+    """
+    Bounded store of console entries. The newest entries are kept in a fixed-size in-memory ring, and older
+    ones are spilled to an append-only file that can be read back on demand, so memory use stays the same
+    however long a session runs. Entries keep their absolute index for the life of the store.
+    """
+    def __init__(self, capacity: int = 1000, spill_path: Optional[str] = None):
+        """
+        Args:
+            capacity (int): How many entries to keep in memory. Defaults to 1000.
+            spill_path (Optional[str]): File to spill older entries to, with an `.idx` file next to it. Defaults
+                to an anonymous temporary file that is deleted when the store is closed.
+        """
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._ring = [None] * capacity # type: List[Optional[ConsoleEntry]]
+        self._count = 0
+        self._spill = None # type: Optional[IO[bytes]]
+        self._spill_index = None # type: Optional[IO[bytes]]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    @property
+    def start(self) -> int:
+        """Absolute index of the oldest entry still held in memory."""
+        return max(self._count - self.capacity, 0)
+
+    # --------- Utility Methods ---------
+    def _absolute(self, index: int) -> int:
+        """
+        Converts a possibly negative index to an absolute one.
+
+        Args:
+            index (int): The index.
+        Raises:
+            IndexError: If the index is out of range.
+        """
+        absolute = index + self._count if index < 0 else index
+        if not 0 <= absolute < self._count:
+            raise IndexError("History index out of range")
+        return absolute
+
+    def _spill_entry(self, entry: ConsoleEntry) -> None:
+        """
+        Appends an entry evicted from the ring to the spill file.
+
+        Args:
+            entry (ConsoleEntry): The evicted entry.
+        """
+        if self._spill is None:
+            if self.spill_path is None:
+                self._spill = tempfile.TemporaryFile()
+                self._spill_index = tempfile.TemporaryFile()
+            else:
+                self._spill = open(self.spill_path, 'w+b')
+                self._spill_index = open(self.spill_path + '.idx', 'w+b')
+        assert self._spill_index is not None
+
+        self._spill.seek(0, 2)
+        self._spill_index.seek(0, 2)
+        self._spill_index.write(_OFFSET.pack(self._spill.tell()))
+        self._spill.write((entry.to_record() + '\n').encode('utf-8'))
+
+    def _read_spilled(self, start: int, stop: int) -> List[ConsoleEntry]:
+        """
+        Reads a range of spilled entries back from disk.
+
+        Args:
+            start (int): Absolute index of the first entry.
+            stop (int): Absolute index after the last entry. At most `self.start`.
+        """
+        if start >= stop or self._spill is None or self._spill_index is None:
+            return []
+        self._spill.flush()
+        self._spill_index.flush()
+        self._spill_index.seek(start * _OFFSET.size)
+        offset, = _OFFSET.unpack(self._spill_index.read(_OFFSET.size))
+        self._spill.seek(offset)
+        return [ConsoleEntry.from_record(self._spill.readline().decode('utf-8')) for _ in range(stop - start)]
+
+    # --------- Public Methods ---------
+    def append(self, entry: ConsoleEntry) -> None:
+        """
+        Adds an entry, spilling the oldest in-memory entry to disk if the ring is full.
+
+        Args:
+            entry (ConsoleEntry): The entry to add.
+        """
+        slot = self._count % self.capacity
+        evicted = self._ring[slot]
+        if evicted is not None:
+            self._spill_entry(evicted)
+        self._ring[slot] = entry
+        self._count += 1
+
+    def __getitem__(self, index: int) -> ConsoleEntry:
+        absolute = self._absolute(index)
+        if absolute < self.start:
+            return self._read_spilled(absolute, absolute + 1)[0]
+        entry = self._ring[absolute % self.capacity]
+        assert entry is not None
+        return entry
+
+    def __setitem__(self, index: int, entry: ConsoleEntry) -> None:
+        absolute = self._absolute(index)
+        if absolute < self.start:
+            raise IndexError("Spilled history entries cannot be changed")
+        self._ring[absolute % self.capacity] = entry
+
+    def __iter__(self) -> Iterator[ConsoleEntry]:
+        """
+        Iterates over the in-memory entries, oldest first.
+        """
+        for index in range(self.start, self._count):
+            entry = self._ring[index % self.capacity]
+            assert entry is not None
+            yield entry
+
+    def read(self, start: int, stop: int) -> List[ConsoleEntry]:
+        """
+        Returns a range of entries, reading any spilled ones back from disk.
+
+        Args:
+            start (int): Absolute index of the first entry.
+            stop (int): Absolute index after the last entry.
+        """
+        start, stop = max(start, 0), min(stop, self._count)
+        if start >= stop:
+            return []
+        memory_start = max(start, self.start)
+        entries = self._read_spilled(start, min(stop, self.start))
+        entries.extend(self._ring[index % self.capacity] for index in range(memory_start, stop)) # type: ignore
+        return entries
+
+    def clear(self) -> None:
+        """
+        Removes every entry, including spilled ones.
+        """
+        self.close()
+        self._ring = [None] * self.capacity
+        self._count = 0
+
+    def close(self) -> None:
+        """
+        Closes the spill files. Anonymous spill files are deleted.
+        """
+        for f in (self._spill, self._spill_index):
+            if f is not None:
+                f.close()
+        self._spill = self._spill_index = None
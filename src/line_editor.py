@@ -0,0 +1,277 @@
+import os
+import sys
+import codecs
+import select
+import threading
+
+from typing import Callable, Optional, Sequence
+
+from utils import display_len
+
+# termios only exists on POSIX systems. Everywhere else the line editor reports itself as unsupported.
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+    tty = None
+
+class Keys:
+    """
+    Enum representing the key sequences understood by the line editor.
+    """
+    ENTER       = ('\r', '\n')
+    BACKSPACE   = ('\x7f', '\x08')
+    DELETE      = '\x1b[3~'
+    UP          = ('\x1b[A', '\x1bOA')
+    DOWN        = ('\x1b[B', '\x1bOB')
+    RIGHT       = ('\x1b[C', '\x1bOC')
+    LEFT        = ('\x1b[D', '\x1bOD')
+    HOME        = ('\x1b[H', '\x1bOH', '\x1b[1~', '\x1b[7~', '\x01')
+    END         = ('\x1b[F', '\x1bOF', '\x1b[4~', '\x1b[8~', '\x05')
+    PAGE_UP     = '\x1b[5~'
+    PAGE_DOWN   = '\x1b[6~'
+    PREV_QUESTION = ('\x1b[1;5A', '\x1b[1;3A') # Ctrl+Up, Alt+Up
+    NEXT_QUESTION = ('\x1b[1;5B', '\x1b[1;3B') # Ctrl+Down, Alt+Down
+    CTRL_C      = '\x03'
+    CTRL_D      = '\x04'
+    CTRL_K      = '\x0b'
+    CTRL_U      = '\x15'
+    ESCAPE      = '\x1b'
+
+class LineBuffer:
+    """
+    An editable line of text with a cursor, and recall of previously entered lines.
+    """
+    def __init__(self, history: Sequence[str] = ()):
+        """
+        Args:
+            history (Sequence[str]): Previously entered lines, oldest first.
+        """
+        self.text = ''
+        self.cursor = 0
+        self._history = list(history)
+        self._history_index = len(self._history)
+        self._draft = ''
+
+    def insert(self, chars: str) -> None:
+        """
+        Inserts characters at the cursor.
+
+        Args:
+            chars (str): The characters to insert.
+        """
+        self.text = self.text[:self.cursor] + chars + self.text[self.cursor:]
+        self.cursor += len(chars)
+
+    def recall(self, offset: int) -> None:
+        """
+        Replaces the text with an earlier or later history entry. Moving past the newest entry brings back
+        whatever was being typed before history was recalled.
+
+        Args:
+            offset (int): -1 to move to an older entry, 1 to move to a newer one.
+        """
+        new_index = min(max(self._history_index + offset, 0), len(self._history))
+        if new_index == self._history_index:
+            return
+
+        if self._history_index == len(self._history):
+            self._draft = self.text
+        self._history_index = new_index
+        self.text = self._draft if new_index == len(self._history) else self._history[new_index]
+        self.cursor = len(self.text)
+
+    def handle_key(self, key: str) -> bool:
+        """
+        Applies a single key press to the buffer.
+
+        Args:
+            key (str): The key sequence, as read from the terminal.
+        Returns:
+            bool: Whether the key was understood. Unknown control sequences are ignored.
+        """
+        if key in Keys.BACKSPACE:
+            if self.cursor > 0:
+                self.text = self.text[:self.cursor - 1] + self.text[self.cursor:]
+                self.cursor -= 1
+        elif key == Keys.DELETE:
+            self.text = self.text[:self.cursor] + self.text[self.cursor + 1:]
+        elif key in Keys.LEFT:
+            self.cursor = max(self.cursor - 1, 0)
+        elif key in Keys.RIGHT:
+            self.cursor = min(self.cursor + 1, len(self.text))
+        elif key in Keys.HOME:
+            self.cursor = 0
+        elif key in Keys.END:
+            self.cursor = len(self.text)
+        elif key in Keys.UP:
+            self.recall(-1)
+        elif key in Keys.DOWN:
+            self.recall(1)
+        elif key == Keys.CTRL_U:
+            self.text = self.text[self.cursor:]
+            self.cursor = 0
+        elif key == Keys.CTRL_K:
+            self.text = self.text[:self.cursor]
+        elif key.isprintable():
+            self.insert(key)
+        else:
+            return False
+        return True
+
+def visible_window(prefix: str, text: str, cursor: int, max_width: int) -> tuple[str, int]:
+    """
+    Works out which part of a line fits on a single terminal row, keeping the cursor in view.
+
+    Args:
+        prefix (str): The prompt shown before the text. Always shown in full.
+        text (str): The text being edited.
+        cursor (int): The cursor position within the text.
+        max_width (int): The display width of the row.
+    Returns:
+        tuple[str, int]: The visible text (including the prefix) and the display column of the cursor.
+    """
+    available = max(max_width - display_len(prefix) - 1, 1) # Leave a column for the cursor itself
+    before = text[:cursor]
+    while before and display_len(before) > available:
+        before = before[1:]
+
+    after = ''
+    remaining = available - display_len(before)
+    for char in text[cursor:]:
+        remaining -= display_len(char)
+        if remaining < 0:
+            break
+        after += char
+
+    return prefix + before + after, display_len(prefix + before)
+
+class LineEditor:
+    """
+    Reads a line of input one key at a time with the terminal in cbreak mode. Only the input row is
+    redrawn on each key press, so editing stays fast however much is on screen, and the row can be
+    restored after anything else repaints the screen.
+    """
+    def __init__(
+        self,
+        lock: Optional[threading.RLock] = None,
+        get_width: Optional[Callable[[], int]] = None,
+        on_key: Optional[Callable[[str], bool]] = None,
+    ):
+        """
+        Args:
+            lock (Optional[threading.RLock]): Lock held while writing to the terminal, shared with whatever
+                else draws to the screen.
+            get_width (Optional[Callable[[], int]]): Returns the current terminal width.
+            on_key (Optional[Callable[[str], bool]]): Offered any key the line itself does not use, such as
+                PageUp. Returns whether it handled the key.
+        """
+        self._lock = lock or threading.RLock()
+        self._get_width = get_width or (lambda: os.get_terminal_size().columns)
+        self._on_key = on_key
+        self._buffer = None # type: Optional[LineBuffer]
+        self._prefix = ''
+
+    # --------- Utility Methods ---------
+    def _read_key(self, fd: int, decoder: codecs.IncrementalDecoder) -> str:
+        """
+        Blocks until a full key press has been read, including multi-byte characters and escape sequences.
+
+        Args:
+            fd (int): The terminal file descriptor.
+            decoder (codecs.IncrementalDecoder): UTF-8 decoder that holds partially read characters.
+        Returns:
+            str: The key sequence. Empty if the input was closed.
+        """
+        key = ''
+        while not key:
+            data = os.read(fd, 1)
+            if not data:
+                return ''
+            key = decoder.decode(data)
+
+        if key != Keys.ESCAPE:
+            return key
+
+        # Escape sequences arrive all at once. A lone escape key press has nothing following it.
+        while select.select([fd], [], [], 0.05)[0]:
+            key += os.read(fd, 1).decode('ascii', errors='replace')
+            if len(key) == 2 and key[1] not in '[O':
+                break
+            if len(key) > 2 and '\x40' <= key[-1] <= '\x7e':
+                break
+        return key
+
+    # --------- Public Methods ---------
+    @property
+    def active(self) -> bool:
+        """Whether a line is currently being edited."""
+        return self._buffer is not None
+
+    @staticmethod
+    def is_supported() -> bool:
+        """
+        Returns whether the line editor can be used, which requires termios and an interactive terminal.
+        """
+        return termios is not None and sys.stdin.isatty() and sys.stdout.isatty()
+
+    def redraw(self) -> None:
+        """
+        Redraws the input row from the current cursor row. Does nothing if no line is being edited.
+        """
+        with self._lock:
+            if self._buffer is None:
+                return
+
+            shown, cursor_column = visible_window(self._prefix, self._buffer.text, self._buffer.cursor, self._get_width())
+            move_back = display_len(shown) - cursor_column
+            sys.stdout.write(f"\r\033[2K{shown}" + (f"\033[{move_back}D" if move_back else ''))
+            sys.stdout.flush()
+
+    def read_line(self, prefix: str = '', history: Sequence[str] = ()) -> str:
+        """
+        Reads a line of input, like the builtin `input`.
+
+        Args:
+            prefix (str): The prompt to show before the input.
+            history (Sequence[str]): Previously entered lines that can be recalled with the arrow keys.
+        Returns:
+            str: The entered line.
+        Raises:
+            KeyboardInterrupt: If Ctrl+C is pressed.
+            EOFError: If Ctrl+D is pressed on an empty line, or the input is closed.
+        """
+        if tty is None:
+            raise RuntimeError("The line editor requires termios")
+
+        fd = sys.stdin.fileno()
+        original_attributes = termios.tcgetattr(fd)
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+        self._prefix = prefix
+        self._buffer = LineBuffer(history)
+        try:
+            tty.setcbreak(fd)
+            self.redraw()
+            while True:
+                key = self._read_key(fd, decoder)
+                if not key or (key == Keys.CTRL_D and not self._buffer.text):
+                    raise EOFError
+                if key == Keys.CTRL_C:
+                    raise KeyboardInterrupt
+                if key in Keys.ENTER:
+                    break
+                if self._buffer.handle_key(key):
+                    self.redraw()
+                elif self._on_key is not None:
+                    self._on_key(key)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, original_attributes)
+            line = self._buffer.text
+            with self._lock:
+                self._buffer = None
+                sys.stdout.write('\n')
+                sys.stdout.flush()
+
+        return line
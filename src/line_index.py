@@ -0,0 +1,182 @@
+from typing import List
+
+class FenwickTree:
+    """
+    Fenwick (binary indexed) tree over a fixed number of integer slots. Point updates, prefix sums and
+    finding the slot that contains a given cumulative position are all O(log n).
+    """
+    def __init__(self, size: int):
+        """
+        Args:
+            size (int): Number of slots, all starting at 0.
+        """
+        self.size = size
+        self._tree = [0] * (size + 1)
+        self._top_bit = 1 << (size.bit_length() - 1) if size else 0
+
+    def add(self, slot: int, delta: int) -> None:
+        """
+        Adds to a slot.
+
+        Args:
+            slot (int): 0-based slot.
+            delta (int): Amount to add.
+        """
+        i = slot + 1
+        while i <= self.size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, slot: int) -> int:
+        """
+        Returns the sum of the slots before the given one.
+
+        Args:
+            slot (int): 0-based slot. The slot itself is not included.
+        """
+        total = 0
+        i = slot
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, position: int) -> int:
+        """
+        Returns the slot containing a cumulative position, i.e. the first slot whose inclusive prefix sum is
+        greater than the position. Slots must not be negative.
+
+        Args:
+            position (int): 0-based cumulative position.
+        Returns:
+            int: The slot, or `size` if the position is past the end.
+        """
+        i = 0
+        bit = self._top_bit
+        while bit:
+            step = i + bit
+            if step <= self.size and self._tree[step] <= position:
+                i = step
+                position -= self._tree[step]
+            bit >>= 1
+        return i
+
+class LineIndex:
+    """
+    Wrapped row counts of the most recent history entries, for finding which entry is on a given row without
+    wrapping the whole history. Mirrors a `HistoryStore` ring of the same capacity, so entries keep their
+    absolute index and memory use stays bounded. After a resize the old counts are kept as estimates, and
+    entries are measured again as they come into view, so a resize never re-wraps the whole history.
+    """
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity (int): How many of the most recent entries to index.
+        """
+        self.capacity = capacity
+        self.count = 0
+        self._tree = FenwickTree(capacity)
+        self._rows = [0] * capacity # type: List[int]
+
+    # --------- Properties ---------
+    @property
+    def start(self) -> int:
+        """Absolute index of the oldest indexed entry."""
+        return max(self.count - self.capacity, 0)
+
+    @property
+    def total(self) -> int:
+        """Total rows of every indexed entry."""
+        return self._tree.prefix_sum(self.capacity)
+
+    # --------- Utility Methods ---------
+    def _slot(self, index: int) -> int:
+        """
+        Returns the ring slot of an absolute index.
+
+        Args:
+            index (int): Absolute entry index.
+        Raises:
+            IndexError: If the entry is not indexed.
+        """
+        if not self.start <= index < self.count:
+            raise IndexError("Entry is not in the line index")
+        return index % self.capacity
+
+    # --------- Public Methods ---------
+    def append(self, rows: int) -> None:
+        """
+        Indexes the next entry, dropping the oldest one if the index is full.
+
+        Args:
+            rows (int): Wrapped row count of the entry.
+        """
+        slot = self.count % self.capacity
+        self._tree.add(slot, rows - self._rows[slot])
+        self._rows[slot] = rows
+        self.count += 1
+
+    def set(self, index: int, rows: int) -> None:
+        """
+        Updates the row count of an entry.
+
+        Args:
+            index (int): Absolute entry index.
+            rows (int): Wrapped row count of the entry.
+        """
+        slot = self._slot(index)
+        if rows != self._rows[slot]:
+            self._tree.add(slot, rows - self._rows[slot])
+            self._rows[slot] = rows
+
+    def rows(self, index: int) -> int:
+        """
+        Returns the row count of an entry, as last measured.
+
+        Args:
+            index (int): Absolute entry index.
+        """
+        return self._rows[self._slot(index)]
+
+    def rows_before(self, index: int) -> int:
+        """
+        Returns the total rows of the indexed entries before the given one.
+
+        Args:
+            index (int): Absolute entry index. May equal `count`, for the total.
+        """
+        index = min(max(index, self.start), self.count)
+        first_slot = self.start % self.capacity
+        slot = index % self.capacity
+        if index == self.count and self.count - self.start == self.capacity:
+            return self.total
+        if slot >= first_slot:
+            return self._tree.prefix_sum(slot) - self._tree.prefix_sum(first_slot)
+        return self.total - self._tree.prefix_sum(first_slot) + self._tree.prefix_sum(slot)
+
+    def find(self, row: int) -> tuple[int, int]:
+        """
+        Finds the entry shown on a given row.
+
+        Args:
+            row (int): 0-based row, counted from the top of the oldest indexed entry.
+        Returns:
+            tuple[int, int]: The absolute entry index and the row within that entry. Rows past the end
+                return `count` and the number of rows past the end.
+        """
+        if row < 0:
+            return self.start, 0
+        if row >= self.total:
+            return self.count, row - self.total
+
+        first_slot = self.start % self.capacity
+        offset = self._tree.prefix_sum(first_slot)
+        tail = self.total - offset # Rows from the first slot to the end of the ring
+
+        if row < tail:
+            slot = self._tree.find(row + offset)
+            index = self.start + slot - first_slot
+        else:
+            slot = self._tree.find(row - tail)
+            index = self.start + self.capacity - first_slot + slot
+        return index, row - self.rows_before(index)
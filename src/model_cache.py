@@ -0,0 +1,98 @@
+import json
+import hashlib
+import threading
+
+from typing import Iterator, List, Optional
+
+from model_client import ModelBackend, ModelChunk, ModelRequest
+
+class ReplayMiss(KeyError):
+    """
+    Raised in replay mode when a request has not been recorded.
+    """
+
+def request_key(request: ModelRequest) -> str:
+    """
+    Returns a stable key identifying a request, so identical requests hit the same recording.
+
+    Args:
+        request (ModelRequest): The request.
+    Returns:
+        str: A hex digest of the model, contents and config.
+    """
+    config = request.config
+    if hasattr(config, 'model_dump'):
+        config = config.model_dump(exclude_none=True)
+    payload = json.dumps([request.model, request.contents, config], sort_keys=True, default=repr, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ReplayBackend(ModelBackend):
+    """
+    Backend that records responses to an append-only JSON lines file and replays them for identical
+    requests. In record mode misses are forwarded to another backend and saved. In replay mode misses
+    raise `ReplayMiss`, so runs are fully offline and deterministic.
+    """
+    def __init__(self, path: str, backend: Optional[ModelBackend] = None):
+        """
+        Args:
+            path (str): The recording file. Created on the first recorded response.
+            backend (Optional[ModelBackend]): Backend used for misses. Without one the cache only replays.
+        """
+        self.path = path
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._recordings = {} # type: dict[str, List[tuple[str, int]]]
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Reads any existing recordings from disk.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self._recordings[record['key']] = [tuple(chunk) for chunk in record['chunks']]
+        except FileNotFoundError:
+            pass
+
+    def _save(self, key: str, chunks: List[tuple[str, int]]) -> None:
+        """
+        Appends a recording to disk and to the in-memory cache.
+
+        Args:
+            key (str): The request key.
+            chunks (List[tuple[str, int]]): The (text, token_count) pairs of the response.
+        """
+        with self._lock:
+            self._recordings[key] = chunks
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'key': key, 'chunks': chunks}, ensure_ascii=False) + '\n')
+
+    def stream(self, request: ModelRequest) -> Iterator[ModelChunk]:
+        key = request_key(request)
+        # Games on many threads share one backend, so the counters are only updated under the lock
+        with self._lock:
+            recording = self._recordings.get(key)
+            if recording is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if recording is not None:
+            for text, token_count in recording:
+                yield ModelChunk(text, token_count)
+            return
+
+        if self.backend is None:
+            raise ReplayMiss(key)
+
+        # Only complete responses are saved, so an interrupted stream is simply requested again next time
+        chunks = [] # type: List[tuple[str, int]]
+        for chunk in self.backend.stream(request):
+            chunks.append((chunk.text, chunk.token_count))
+            yield chunk
+        self._save(key, chunks)
@@ -0,0 +1,462 @@
+import time
+import queue
+import threading
+
+from collections import deque
+from typing import Any, Iterator, List, Optional
+
+from governor import Governor, Permit, Priority, estimate_tokens
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+"""Model used when a request does not ask for a specific one."""
+
+class TurnCancelled(Exception):
+    """
+    Raised when an in-flight model turn is cancelled by the player (Ctrl+C).
+    """
+
+class TurnDeadlineExceeded(TimeoutError):
+    """
+    Raised when a model turn does not finish before its deadline.
+    """
+
+class ModelRequest:
+    """
+    A single request to a model.
+    """
+    def __init__(self, contents: Any, model: str = DEFAULT_MODEL, config: Any = None, priority: Priority = Priority.INTERACTIVE):
+        """
+        Args:
+            contents (Any): The contents to send, in any form accepted by `genai`.
+            model (str): The model to use. Defaults to DEFAULT_MODEL.
+            config (Any): Optional `genai` generation config.
+            priority (Priority): How urgent the request is. Defaults to interactive.
+        """
+        self.contents = contents
+        self.model = model
+        self.config = config
+        self.priority = priority
+
+class ModelChunk:
+    """
+    A piece of a streamed model response.
+    """
+    def __init__(self, text: str, token_count: int = 0):
+        """
+        Args:
+            text (str): The text in this chunk.
+            token_count (int): Total tokens used by the request so far, if the backend reports it.
+        """
+        self.text = text
+        self.token_count = token_count
+
+class ModelResult:
+    """
+    The complete result of a model turn.
+    """
+    def __init__(self, text: str, token_count: int, first_token_secs: float, total_secs: float, hedged: bool):
+        self.text = text
+        """The full response text."""
+
+        self.token_count = token_count
+        """Total tokens used by the winning request, if reported."""
+
+        self.first_token_secs = first_token_secs
+        """Seconds until the first chunk arrived."""
+
+        self.total_secs = total_secs
+        """Seconds until the response finished."""
+
+        self.hedged = hedged
+        """Whether a duplicate request was fired for this turn."""
+
+class ModelBackend:
+    """
+    Base class for something that can stream model responses.
+    """
+    def stream(self, request: ModelRequest) -> Iterator[ModelChunk]:
+        """
+        Streams the response to a request.
+
+        Args:
+            request (ModelRequest): The request to send.
+        Returns:
+            Iterator[ModelChunk]: The response chunks, in order.
+        """
+        raise NotImplementedError
+
+class StreamObserver:
+    """
+    Base class for something that follows the progress of model streams, e.g. to show it to the player.
+    Every method does nothing by default.
+    """
+    def stream_started(self) -> None:
+        """
+        Called when a stream starts waiting for its first token.
+        """
+
+    def attempt_started(self, index: int) -> None:
+        """
+        Called when a request is fired for a stream.
+
+        Args:
+            index (int): The attempt number. Attempts after the first are speculative duplicates.
+        """
+
+    def attempt_finished(self, index: int) -> None:
+        """
+        Called from the attempt's thread once it has finished, failed or been cancelled.
+
+        Args:
+            index (int): The attempt number.
+        """
+
+    def first_token(self, secs: float) -> None:
+        """
+        Called when the first chunk of the winning attempt arrives.
+
+        Args:
+            secs (float): Seconds since the stream started.
+        """
+
+    def chunk(self, chunk: 'ModelChunk') -> None:
+        """
+        Called with each chunk of the winning attempt.
+
+        Args:
+            chunk (ModelChunk): The chunk.
+        """
+
+    def stream_finished(self) -> None:
+        """
+        Called when a stream ends, whether it finished, failed or was cancelled.
+        """
+
+class GenAIBackend(ModelBackend):
+    """
+    Backend that calls the Gemini API through `genai.Client`.
+    """
+    def __init__(self, client: Any = None):
+        """
+        Args:
+            client (Any): The `genai.Client` to use. By default one is created on first use, which reads
+                the API key from the `GEMINI_API_KEY` environment variable.
+        """
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        """The underlying `genai.Client`."""
+        if self._client is None:
+            from google import genai
+            self._client = genai.Client()
+        return self._client
+
+    def stream(self, request: ModelRequest) -> Iterator[ModelChunk]:
+        response = self.client.models.generate_content_stream(
+            model=request.model,
+            contents=request.contents,
+            config=request.config,
+        )
+        for chunk in response:
+            usage = chunk.usage_metadata
+            yield ModelChunk(chunk.text or '', (usage.total_token_count or 0) if usage else 0)
+
+class LatencyTracker:
+    """
+    Keeps a sliding window of recent latencies so that percentiles can be estimated.
+    """
+    def __init__(self, max_samples: int = 100):
+        """
+        Args:
+            max_samples (int): How many recent samples to keep. Defaults to 100.
+        """
+        self._samples = deque(maxlen=max_samples) # type: deque[float]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """
+        Records a latency sample.
+
+        Args:
+            seconds (float): The latency, in seconds.
+        """
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Returns the given percentile of the recorded samples, using the nearest-rank method.
+
+        Args:
+            percent (float): The percentile, from 0 to 100.
+        Returns:
+            Optional[float]: The percentile, or None if nothing has been recorded yet.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(int(len(samples) * percent / 100 + 0.5), 1)
+        return samples[min(rank, len(samples)) - 1]
+
+class ModelClient:
+    """
+    Sends model requests with per-turn deadlines and hedging. If the first token of a response is slower
+    than the configured percentile of recent first-token latencies, a duplicate request is fired and
+    whichever answers first is used. The tail latency drops while only the slowest turns are paid for twice.
+    """
+    hedge_percentile: float = 95
+    """First-token latency percentile after which a duplicate request is fired."""
+
+    hedge_initial_delay: float = 5
+    """Seconds to wait for a first token before hedging, until enough samples have been recorded."""
+
+    hedge_min_samples: int = 10
+    """Number of first-token samples needed before the percentile is trusted."""
+
+    max_hedges: int = 1
+    """Maximum number of duplicate requests per turn. 0 disables hedging."""
+
+    deadline_secs: Optional[float] = 120
+    """Default time limit for a whole turn, or None for no limit."""
+
+    observer: Optional[StreamObserver] = None
+    """Follows the progress of every stream, e.g. to show it on the status line."""
+
+    def __init__(self, backend: Optional[ModelBackend] = None, governor: Optional[Governor] = None, **options: Any):
+        """
+        Args:
+            backend (Optional[ModelBackend]): The backend to send requests to. Defaults to the Gemini API.
+            governor (Optional[Governor]): Rate limiter every request goes through. Defaults to the shared one.
+            options (Any): Overrides for any of the class level settings, e.g. `hedge_percentile=90`.
+        """
+        self.backend = backend or GenAIBackend()
+        self.governor = governor or Governor()
+        self.first_token_latency = LatencyTracker()
+        for name, value in options.items():
+            if not hasattr(ModelClient, name):
+                raise TypeError(f"Unknown ModelClient option: {name}")
+            setattr(self, name, value)
+
+    # --------- Utility Methods ---------
+    def _hedge_delay(self) -> float:
+        """
+        Returns how long to wait for a first token before firing a duplicate request.
+        """
+        if len(self.first_token_latency) < self.hedge_min_samples:
+            return self.hedge_initial_delay
+        percentile = self.first_token_latency.percentile(self.hedge_percentile)
+        return percentile if percentile is not None else self.hedge_initial_delay
+
+    def _run_attempt(self, request: ModelRequest, index: int, events: queue.Queue, cancel: threading.Event) -> None:
+        """
+        Streams one attempt at a request into the shared event queue, until it finishes or is cancelled.
+
+        Args:
+            request (ModelRequest): The request to send.
+            index (int): The attempt number, used to tell attempts apart in the queue.
+            events (queue.Queue): Receives (index, chunk, error) tuples. A None chunk marks the end.
+            cancel (threading.Event): Set when this attempt is no longer wanted.
+        """
+        # Duplicate requests are only speculative, so they must never hold up someone's first attempt
+        priority = request.priority if index == 0 else max(request.priority, Priority.SPECULATIVE)
+        emitted = False
+
+        def stream_into_queue(permit: Permit) -> None:
+            nonlocal emitted
+            # A duplicate can wait for its permit until long after another attempt has won. Backends send the
+            # request on the first iteration, so give the budget back without ever sending it.
+            if cancel.is_set():
+                permit.mark_unused()
+                return
+            stream = self.backend.stream(request)
+            try:
+                for chunk in stream:
+                    if cancel.is_set():
+                        return
+                    emitted = True
+                    if chunk.token_count:
+                        permit.record_tokens(chunk.token_count)
+                    events.put((index, chunk, None))
+            finally:
+                close = getattr(stream, 'close', None)
+                if close is not None:
+                    close()
+
+        try:
+            # Quota errors are only retried before anything was streamed, so chunks are never repeated
+            self.governor.call(
+                stream_into_queue,
+                priority,
+                estimate_tokens(request.contents),
+                can_retry=lambda: not emitted and not cancel.is_set(),
+            )
+            events.put((index, None, None))
+        except Exception as e:
+            events.put((index, None, e))
+        finally:
+            if self.observer is not None:
+                self.observer.attempt_finished(index)
+
+    # --------- Public Methods ---------
+    def stream(self, request: ModelRequest, deadline_secs: Optional[float] = None) -> 'ModelStream':
+        """
+        Streams the response to a request, hedging if the first token is slow.
+
+        Args:
+            request (ModelRequest): The request to send.
+            deadline_secs (Optional[float]): Time limit for the whole turn. Defaults to the client setting.
+        Returns:
+            ModelStream: Iterates over the chunks of whichever attempt answered first.
+        """
+        return ModelStream(self, request, self.deadline_secs if deadline_secs is None else deadline_secs)
+
+    def generate(self, request: ModelRequest, deadline_secs: Optional[float] = None) -> ModelResult:
+        """
+        Sends a request and waits for the complete response.
+
+        Args:
+            request (ModelRequest): The request to send.
+            deadline_secs (Optional[float]): Time limit for the whole turn. Defaults to the client setting.
+        Returns:
+            ModelResult: The complete response.
+        Raises:
+            TurnCancelled: If Ctrl+C is pressed while waiting for the model.
+            TurnDeadlineExceeded: If the turn does not finish before the deadline.
+        """
+        stream = self.stream(request, deadline_secs)
+        try:
+            text = ''.join(chunk.text for chunk in stream)
+        except KeyboardInterrupt:
+            # Ctrl+C can also land between chunks, outside of the stream itself
+            raise TurnCancelled("Model turn cancelled")
+        return stream.result(text)
+
+class ModelStream:
+    """
+    Iterates over a hedged model response, and records how the turn went.
+    """
+    def __init__(self, client: ModelClient, request: ModelRequest, deadline_secs: Optional[float]):
+        """
+        Args:
+            client (ModelClient): The client sending the request.
+            request (ModelRequest): The request to send.
+            deadline_secs (Optional[float]): Time limit for the whole turn, or None for no limit.
+        """
+        self.client = client
+        self.request = request
+        self.deadline_secs = deadline_secs
+
+        self.attempts = 0
+        """Number of requests fired so far, including duplicates."""
+
+        self.first_token_secs = None # type: Optional[float]
+        """Seconds until the first chunk arrived, once it has."""
+
+        self.total_secs = None # type: Optional[float]
+        """Seconds until the response finished, once it has."""
+
+        self.token_count = 0
+        """Total tokens used by the winning request, as reported so far."""
+
+    def __iter__(self) -> Iterator[ModelChunk]:
+        """
+        Streams the chunks of whichever attempt answers first.
+
+        Raises:
+            TurnCancelled: If Ctrl+C is pressed while waiting for the model.
+            TurnDeadlineExceeded: If the turn does not finish before the deadline.
+        """
+        client = self.client
+        started_at = time.monotonic()
+        deadline = started_at + self.deadline_secs if self.deadline_secs is not None else float('inf')
+        hedge_delay = client._hedge_delay()
+        hedge_at = started_at + hedge_delay
+
+        events = queue.Queue() # type: queue.Queue
+        cancels = [] # type: List[threading.Event]
+        failed = set() # type: set[int]
+        winner = None # type: Optional[int]
+        observer = client.observer or StreamObserver()
+
+        def start_attempt() -> None:
+            cancel = threading.Event()
+            cancels.append(cancel)
+            self.attempts = len(cancels)
+            observer.attempt_started(len(cancels) - 1)
+            threading.Thread(
+                target=client._run_attempt,
+                args=(self.request, len(cancels) - 1, events, cancel),
+                daemon=True
+            ).start()
+
+        try:
+            observer.stream_started()
+            start_attempt()
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    raise TurnDeadlineExceeded(f"Model turn did not finish within {self.deadline_secs}s")
+
+                can_hedge = winner is None and len(cancels) <= client.max_hedges
+                if can_hedge and now >= hedge_at:
+                    start_attempt()
+                    hedge_at = now + hedge_delay
+                    continue
+
+                # Wake up regularly, so that a Ctrl+C is always noticed promptly
+                wake_at = min(deadline, hedge_at if can_hedge else deadline, now + 0.25)
+                try:
+                    index, chunk, error = events.get(timeout=max(wake_at - now, 0))
+                except queue.Empty:
+                    continue
+
+                if winner is None:
+                    if error is not None:
+                        # Another attempt may still succeed, so only give up once they have all failed
+                        failed.add(index)
+                        if len(failed) < len(cancels):
+                            continue
+                        raise error
+
+                    winner = index
+                    self.first_token_secs = time.monotonic() - started_at
+                    client.first_token_latency.record(self.first_token_secs)
+                    observer.first_token(self.first_token_secs)
+                    for other, cancel in enumerate(cancels):
+                        if other != winner:
+                            cancel.set()
+
+                if index != winner:
+                    continue
+                if error is not None:
+                    raise error
+                if chunk is None:
+                    self.total_secs = time.monotonic() - started_at
+                    return
+                self.token_count = max(self.token_count, chunk.token_count)
+                observer.chunk(chunk)
+                yield chunk
+        except KeyboardInterrupt:
+            raise TurnCancelled("Model turn cancelled")
+        finally:
+            for cancel in cancels:
+                cancel.set()
+            observer.stream_finished()
+
+    def result(self, text: str) -> ModelResult:
+        """
+        Builds the result of the finished turn.
+
+        Args:
+            text (str): The full response text.
+        Returns:
+            ModelResult: The result.
+        """
+        total_secs = self.total_secs or 0.0
+        first_token_secs = self.first_token_secs if self.first_token_secs is not None else total_secs
+        return ModelResult(text, self.token_count, first_token_secs, total_secs, self.attempts > 1)
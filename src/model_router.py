@@ -0,0 +1,141 @@
+import threading
+
+from enum import Enum
+from typing import Any, Optional
+
+from game import GameState, is_last_question
+from model_client import DEFAULT_MODEL, LatencyTracker
+
+class ModelTier(Enum):
+    """
+    Tiers of model a host turn can be routed to.
+    """
+    FAST = 'fast'
+    """Cheap, low latency model for broad early questions."""
+
+    STRONG = 'strong'
+    """Stronger model for guesses, late questions and surrender rounds."""
+
+class TierStats:
+    """
+    Latency, usage and guess accuracy of the turns routed to one tier.
+    """
+    def __init__(self):
+        self.turns = 0
+        self.tokens = 0
+        self.guesses = 0
+        self.correct_guesses = 0
+        self.first_token_latency = LatencyTracker(max_samples=1000)
+        self.total_latency = LatencyTracker(max_samples=1000)
+
+    @property
+    def accuracy(self) -> Optional[float]:
+        """The share of final guesses that were correct, or None if no guesses were recorded."""
+        return self.correct_guesses / self.guesses if self.guesses else None
+
+    def to_dict(self) -> dict:
+        """
+        Returns the stats as a plain dictionary, for reports.
+        """
+        return {
+            'turns': self.turns,
+            'tokens': self.tokens,
+            'guesses': self.guesses,
+            'accuracy': self.accuracy,
+            'first_token_p50_secs': self.first_token_latency.percentile(50),
+            'total_p50_secs': self.total_latency.percentile(50),
+            'total_p95_secs': self.total_latency.percentile(95),
+        }
+
+class ModelRouter:
+    """
+    Picks a model tier for each host turn. Broad early questions go to the fast tier, while final guesses,
+    late questions and surrender rounds go to the strong tier. Records latency and accuracy per tier, so the
+    thresholds can be tuned to move as much traffic as possible to the fast tier. Safe to share between games.
+    """
+    models: dict = {ModelTier.FAST: 'gemini-2.5-flash-lite', ModelTier.STRONG: DEFAULT_MODEL}
+    """Model used by each tier."""
+
+    strong_from_question: int = 15
+    """Question number from which every question goes to the strong tier."""
+
+    strong_confidence: float = 0.8
+    """Engine confidence in its leading candidate above which the next turn is likely a guess, and goes to the strong tier."""
+
+    def __init__(self, **options: Any):
+        """
+        Args:
+            options (Any): Overrides for any of the class level settings, e.g. `strong_from_question=10`.
+        """
+        for name, value in options.items():
+            if not hasattr(ModelRouter, name):
+                raise TypeError(f"Unknown ModelRouter option: {name}")
+            setattr(self, name, value)
+        self.stats = {tier: TierStats() for tier in ModelTier}
+        self._lock = threading.Lock()
+
+    def route(self, game_state: GameState, question_num: int, confidence: Optional[float] = None) -> ModelTier:
+        """
+        Picks the tier for a turn.
+
+        Args:
+            game_state (GameState): The phase the turn belongs to.
+            question_num (int): The question number the turn belongs to. 0 for the introduction.
+            confidence (Optional[float]): The engine's confidence in its leading candidate, from 0 to 1, if known.
+        Returns:
+            ModelTier: The tier to use.
+        """
+        if game_state == GameState.SURRENDER_ROUND:
+            return ModelTier.STRONG
+        if question_num > 0 and is_last_question(question_num):
+            return ModelTier.STRONG
+        if question_num >= self.strong_from_question:
+            return ModelTier.STRONG
+        if confidence is not None and confidence >= self.strong_confidence:
+            return ModelTier.STRONG
+        return ModelTier.FAST
+
+    def model(self, tier: ModelTier) -> str:
+        """
+        Returns the model used by a tier.
+
+        Args:
+            tier (ModelTier): The tier.
+        """
+        return self.models[tier]
+
+    def record_turn(self, tier: ModelTier, first_token_secs: float, total_secs: float, token_count: int) -> None:
+        """
+        Records the latency and usage of a finished turn.
+
+        Args:
+            tier (ModelTier): The tier the turn was routed to.
+            first_token_secs (float): Seconds until the first token.
+            total_secs (float): Seconds until the turn finished.
+            token_count (int): Tokens used by the turn.
+        """
+        stats = self.stats[tier]
+        with self._lock:
+            stats.turns += 1
+            stats.tokens += token_count
+        stats.first_token_latency.record(first_token_secs)
+        stats.total_latency.record(total_secs)
+
+    def record_guess(self, tier: ModelTier, correct: bool) -> None:
+        """
+        Records whether a guess made by a tier was correct.
+
+        Args:
+            tier (ModelTier): The tier of the turn that made the guess.
+            correct (bool): Whether the player confirmed the guess.
+        """
+        stats = self.stats[tier]
+        with self._lock:
+            stats.guesses += 1
+            stats.correct_guesses += int(correct)
+
+    def summary(self) -> dict:
+        """
+        Returns the stats of every tier as a plain dictionary keyed by tier name.
+        """
+        return {tier.value: stats.to_dict() for tier, stats in self.stats.items()}
@@ -0,0 +1,247 @@
+import json
+
+from typing import Any, Callable, Optional
+
+# Parser states
+_EXPECT_OBJECT = 0
+_EXPECT_KEY = 1
+_IN_KEY = 2
+_EXPECT_COLON = 3
+_EXPECT_VALUE = 4
+_IN_STRING = 5
+_IN_SCALAR = 6
+_IN_NESTED = 7
+_EXPECT_COMMA = 8
+_DONE = 9
+
+_SIMPLE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+class PartialJSONError(ValueError):
+    """
+    Raised when the streamed text cannot be the start of a JSON object.
+    """
+
+class PartialJSONParser:
+    """
+    Incremental parser for a streamed JSON object. Text can be fed in pieces of any size, and string fields
+    are reported as their characters arrive instead of once the whole object is complete. Other fields,
+    including nested objects and arrays, are reported as soon as their value is complete.
+    """
+    def __init__(
+        self,
+        on_string_delta: Optional[Callable[[str, str], None]] = None,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+    ):
+        """
+        Args:
+            on_string_delta (Optional[Callable[[str, str], None]]): Called with (field name, new text) as a
+                string field grows. Called at most once per field per `feed`.
+            on_field (Optional[Callable[[str, Any], None]]): Called with (field name, value) once a field
+                is complete.
+        """
+        self._on_string_delta = on_string_delta
+        self._on_field = on_field
+
+        self.fields = {} # type: dict[str, Any]
+        """Fields whose values are complete."""
+
+        self._state = _EXPECT_OBJECT
+        self._key = ''
+        self._buffer = [] # type: list[str]
+        self._escape = None # type: Optional[str]
+        self._pending_surrogate = None # type: Optional[int]
+        self._depth = 0
+        self._nested_in_string = False
+        self._nested_escaped = False
+
+    # --------- Properties ---------
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the object has been parsed."""
+        return self._state == _DONE
+
+    def partial(self, name: str) -> Optional[str]:
+        """
+        Returns the value of a string field, even if it is still being streamed.
+
+        Args:
+            name (str): The field name.
+        Returns:
+            Optional[str]: The text so far, or None if the field has not started.
+        """
+        if name in self.fields:
+            value = self.fields[name]
+            return value if isinstance(value, str) else None
+        if self._state == _IN_STRING and self._key == name:
+            return ''.join(self._buffer)
+        return None
+
+    # --------- Utility Methods ---------
+    def _complete(self, value: Any) -> None:
+        """
+        Records a finished field and moves on to the next one.
+
+        Args:
+            value (Any): The field value.
+        """
+        self.fields[self._key] = value
+        self._buffer = []
+        self._state = _EXPECT_COMMA
+        if self._on_field is not None:
+            self._on_field(self._key, value)
+
+    def _decode_escape(self, escape: str) -> Optional[str]:
+        """
+        Decodes a complete escape sequence, without its backslash.
+
+        Args:
+            escape (str): e.g. 'n' or 'u00e9'.
+        Returns:
+            Optional[str]: The decoded text. None while waiting for the low half of a surrogate pair.
+        """
+        if escape[0] != 'u':
+            if escape not in _SIMPLE_ESCAPES:
+                raise PartialJSONError(f"Invalid escape: \\{escape}")
+            return _SIMPLE_ESCAPES[escape]
+
+        code = int(escape[1:], 16)
+        if 0xD800 <= code <= 0xDBFF:
+            self._pending_surrogate = code
+            return None
+        if 0xDC00 <= code <= 0xDFFF and self._pending_surrogate is not None:
+            high, self._pending_surrogate = self._pending_surrogate, None
+            return chr(0x10000 + ((high - 0xD800) << 10) + (code - 0xDC00))
+        return chr(code)
+
+    def _read_string(self, text: str, position: int) -> tuple[int, bool, str]:
+        """
+        Reads string contents up to the closing quote or the end of the text.
+
+        Args:
+            text (str): The text being fed.
+            position (int): Where to start reading.
+        Returns:
+            tuple[int, bool, str]: The new position, whether the string was closed, and the decoded text read.
+        """
+        decoded = [] # type: list[str]
+        length = len(text)
+        while position < length:
+            if self._escape is not None:
+                # Finish an escape sequence, which may have been split across feeds
+                self._escape += text[position]
+                position += 1
+                if self._escape[0] == 'u' and len(self._escape) < 5:
+                    continue
+                char = self._decode_escape(self._escape)
+                self._escape = None
+                if char is not None:
+                    decoded.append(char)
+                continue
+
+            # Copy plain runs in bulk, stopping only at quotes and backslashes
+            quote = text.find('"', position)
+            backslash = text.find('\\', position)
+            stop = min(index for index in (quote, backslash, length) if index != -1)
+            decoded.append(text[position:stop])
+            position = stop
+            if position == length:
+                break
+            position += 1
+            if stop == quote:
+                return position, True, ''.join(decoded)
+            self._escape = ''
+        return position, False, ''.join(decoded)
+
+    # --------- Public Methods ---------
+    def feed(self, text: str) -> None:
+        """
+        Parses the next piece of the streamed JSON.
+
+        Args:
+            text (str): The next piece of text.
+        Raises:
+            PartialJSONError: If the text cannot be part of a JSON object.
+        """
+        position = 0
+        length = len(text)
+        while position < length:
+            state = self._state
+            char = text[position]
+
+            if state == _IN_STRING or state == _IN_KEY:
+                position, closed, decoded = self._read_string(text, position)
+                if decoded:
+                    self._buffer.append(decoded)
+                    if state == _IN_STRING and self._on_string_delta is not None:
+                        self._on_string_delta(self._key, decoded)
+                if closed:
+                    if state == _IN_KEY:
+                        self._key = ''.join(self._buffer)
+                        self._buffer = []
+                        self._state = _EXPECT_COLON
+                    else:
+                        self._complete(''.join(self._buffer))
+                continue
+
+            if state == _IN_SCALAR:
+                if char in ',}' or char.isspace():
+                    raw = ''.join(self._buffer)
+                    try:
+                        self._complete(json.loads(raw))
+                    except ValueError:
+                        raise PartialJSONError(f"Invalid value for {self._key!r}: {raw}")
+                    continue # Let the expect-comma state handle the delimiter
+                self._buffer.append(char)
+                position += 1
+                continue
+
+            if state == _IN_NESTED:
+                self._buffer.append(char)
+                position += 1
+                if self._nested_in_string:
+                    if self._nested_escaped:
+                        self._nested_escaped = False
+                    elif char == '\\':
+                        self._nested_escaped = True
+                    elif char == '"':
+                        self._nested_in_string = False
+                elif char == '"':
+                    self._nested_in_string = True
+                elif char in '[{':
+                    self._depth += 1
+                elif char in ']}':
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._complete(json.loads(''.join(self._buffer)))
+                continue
+
+            position += 1
+            if char.isspace():
+                continue
+
+            if state == _EXPECT_OBJECT and char == '{':
+                self._state = _EXPECT_KEY
+            elif state == _EXPECT_KEY and char == '"':
+                self._state = _IN_KEY
+            elif state == _EXPECT_KEY and char == '}' and not self.fields:
+                self._state = _DONE
+            elif state == _EXPECT_COLON and char == ':':
+                self._state = _EXPECT_VALUE
+            elif state == _EXPECT_VALUE:
+                if char == '"':
+                    self._state = _IN_STRING
+                elif char in '[{':
+                    self._state = _IN_NESTED
+                    self._depth = 1
+                    self._buffer = [char]
+                else:
+                    self._state = _IN_SCALAR
+                    self._buffer = [char]
+            elif state == _EXPECT_COMMA and char == ',':
+                self._state = _EXPECT_KEY
+            elif state == _EXPECT_COMMA and char == '}':
+                self._state = _DONE
+            elif state == _DONE:
+                raise PartialJSONError("Unexpected text after the end of the object")
+            else:
+                raise PartialJSONError(f"Unexpected character {char!r}")
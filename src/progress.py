@@ -0,0 +1,337 @@
+import time
+import threading
+
+from collections import deque
+from typing import Any, Callable, List, Optional
+
+from governor import estimate_tokens
+from model_client import ModelChunk, StreamObserver
+
+class ProgressIndicator:
+    """
+    Base class for a live indicator shown on the status line. Each indicator is re-rendered at its own
+    interval, so cheap fast-changing values and slow ones can share the same row.
+    """
+    interval: float = 1
+    """Seconds between re-renders of this indicator."""
+
+    def __init__(self, label: str, interval: Optional[float] = None):
+        """
+        Args:
+            label (str): The label shown before the indicator value.
+            interval (Optional[float]): Seconds between re-renders. Defaults to the class value.
+        """
+        self.label = label
+        if interval is not None:
+            self.interval = interval
+
+    def render(self, now: float) -> str:
+        """
+        Renders the indicator.
+
+        Args:
+            now (float): The current `time.monotonic()` value.
+        Returns:
+            str: The rendered indicator.
+        """
+        return self.label
+
+    def is_done(self, now: float) -> bool:
+        """
+        Returns whether the indicator has finished and should be removed from the status line.
+
+        Args:
+            now (float): The current `time.monotonic()` value.
+        """
+        return False
+
+class TimerIndicator(ProgressIndicator):
+    """
+    Shows how long something has been going on, e.g. how long we have been waiting for the first token.
+    """
+    interval = 0.1
+
+    def __init__(self, label: str, interval: Optional[float] = None):
+        super().__init__(label, interval)
+        self.started_at = time.monotonic()
+
+    def render(self, now: float) -> str:
+        return f"{self.label} {now - self.started_at:.1f}s"
+
+class RateIndicator(ProgressIndicator):
+    """
+    Shows how quickly something is being counted over a sliding window, e.g. tokens per second.
+    """
+    interval = 0.5
+
+    def __init__(self, label: str, unit: str, window_secs: float = 3, interval: Optional[float] = None):
+        """
+        Args:
+            label (str): The label shown before the rate.
+            unit (str): The unit being counted, e.g. 'tokens'.
+            window_secs (float): How far back the rate is averaged over. Defaults to 3.
+            interval (Optional[float]): Seconds between re-renders. Defaults to the class value.
+        """
+        super().__init__(label, interval)
+        self.unit = unit
+        self.window_secs = window_secs
+        self.total = 0
+        self._started_at = time.monotonic()
+        self._samples = deque() # type: deque[tuple[float, int]]
+        self._lock = threading.Lock()
+
+    def add(self, count: int = 1) -> None:
+        """
+        Records that more units have arrived.
+
+        Args:
+            count (int): The number of new units. Defaults to 1.
+        """
+        with self._lock:
+            self.total += count
+            self._samples.append((time.monotonic(), count))
+
+    def rate(self, now: float) -> float:
+        """
+        Returns the number of units per second over the window.
+
+        Args:
+            now (float): The current `time.monotonic()` value.
+        """
+        with self._lock:
+            while self._samples and self._samples[0][0] < now - self.window_secs:
+                self._samples.popleft()
+            window = min(self.window_secs, now - self._started_at)
+            return sum(count for _, count in self._samples) / window if window > 0 else 0.0
+
+    def render(self, now: float) -> str:
+        return f"{self.label} {self.rate(now):.1f} {self.unit}/s"
+
+class CountdownIndicator(ProgressIndicator):
+    """
+    Counts down to a moment in the future, e.g. the next retry. Finishes itself once the time is up.
+    """
+    interval = 1
+
+    def __init__(self, label: str, seconds: float, interval: Optional[float] = None):
+        super().__init__(label, interval)
+        self.ends_at = time.monotonic() + seconds
+
+    def render(self, now: float) -> str:
+        return f"{self.label} {max(self.ends_at - now, 0):.0f}s"
+
+    def is_done(self, now: float) -> bool:
+        return now >= self.ends_at
+
+class CounterIndicator(ProgressIndicator):
+    """
+    Shows a count of things in flight, e.g. speculative branches.
+    """
+    interval = 0.25
+
+    def __init__(self, label: str, interval: Optional[float] = None):
+        super().__init__(label, interval)
+        self.count = 0
+
+    def increment(self, amount: int = 1) -> None:
+        """
+        Changes the count.
+
+        Args:
+            amount (int): How much to add. Negative values decrement. Defaults to 1.
+        """
+        self.count += amount
+
+    def render(self, now: float) -> str:
+        return f"{self.label} {self.count}"
+
+class StatusLine:
+    """
+    A set of progress indicators sharing one row. A background thread wakes up whenever an indicator is
+    due, and reports the new row text only when it actually changed.
+    """
+    separator: str = ' | '
+    """Text placed between indicators."""
+
+    def __init__(self, on_update: Callable[[str], None]):
+        """
+        Args:
+            on_update (Callable[[str], None]): Called from the background thread with the new row text.
+        """
+        self._on_update = on_update
+        self._indicators = [] # type: List[ProgressIndicator]
+        self._rendered = {} # type: dict[int, tuple[float, str]]
+        self._text = ''
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._thread = None # type: Optional[threading.Thread]
+
+    # --------- Utility Methods ---------
+    def _refresh(self, now: float, force: bool = False) -> float:
+        """
+        Re-renders any indicators that are due and removes finished ones.
+
+        Args:
+            now (float): The current `time.monotonic()` value.
+            force (bool): Re-render every indicator, whether it is due or not.
+        Returns:
+            float: Seconds until the next indicator is due.
+        """
+        with self._lock:
+            for indicator in [i for i in self._indicators if i.is_done(now)]:
+                self._indicators.remove(indicator)
+                self._rendered.pop(id(indicator), None)
+
+            next_due = float('inf')
+            for indicator in self._indicators:
+                rendered_at, _ = self._rendered.get(id(indicator), (float('-inf'), ''))
+                if force or now - rendered_at >= indicator.interval:
+                    self._rendered[id(indicator)] = (now, indicator.render(now))
+                    rendered_at = now
+                next_due = min(next_due, rendered_at + indicator.interval - now)
+
+            text = self.separator.join(self._rendered[id(i)][1] for i in self._indicators)
+            changed = text != self._text
+            self._text = text
+
+        if changed:
+            self._on_update(text)
+        return next_due
+
+    def _run(self) -> None:
+        """
+        Background loop that keeps the indicators up to date until none are left.
+        """
+        while True:
+            delay = self._refresh(time.monotonic())
+            with self._lock:
+                if not self._indicators:
+                    self._thread = None
+                    return
+            self._wake_event.wait(max(delay, 0.01))
+            self._wake_event.clear()
+
+    # --------- Public Methods ---------
+    @property
+    def text(self) -> str:
+        """The current row text."""
+        return self._text
+
+    def add(self, indicator: ProgressIndicator) -> ProgressIndicator:
+        """
+        Adds an indicator to the end of the line, starting the background thread if needed.
+
+        Args:
+            indicator (ProgressIndicator): The indicator to add.
+        Returns:
+            ProgressIndicator: The same indicator, for convenience.
+        """
+        with self._lock:
+            self._indicators.append(indicator)
+            start_thread = self._thread is None
+            if start_thread:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+        self._refresh(time.monotonic(), force=True)
+        if start_thread and self._thread is not None:
+            self._thread.start()
+        else:
+            self._wake_event.set()
+        return indicator
+
+    def remove(self, indicator: ProgressIndicator) -> None:
+        """
+        Removes an indicator from the line. Does nothing if it is not on the line.
+
+        Args:
+            indicator (ProgressIndicator): The indicator to remove.
+        """
+        with self._lock:
+            if indicator not in self._indicators:
+                return
+            self._indicators.remove(indicator)
+            self._rendered.pop(id(indicator), None)
+        self._refresh(time.monotonic())
+        self._wake_event.set()
+
+    def clear(self) -> None:
+        """
+        Removes every indicator from the line.
+        """
+        with self._lock:
+            self._indicators.clear()
+            self._rendered.clear()
+        self._refresh(time.monotonic())
+        self._wake_event.set()
+
+class StreamProgress(StreamObserver):
+    """
+    Shows the progress of model streams as indicators: how long we have been waiting for the first token,
+    then tokens per second, the speculative requests in flight, and a countdown while calls are paused
+    after a quota error. Meant for a single player's client, where one turn streams at a time.
+    """
+    def __init__(self, add: Callable[[ProgressIndicator], Any], remove: Callable[[ProgressIndicator], None]):
+        """
+        Args:
+            add (Callable[[ProgressIndicator], Any]): Shows an indicator, e.g. `Console.status_add`.
+            remove (Callable[[ProgressIndicator], None]): Hides an indicator, e.g. `Console.status_remove`.
+        """
+        self._add = add
+        self._remove = remove
+        self._waiting = None # type: Optional[TimerIndicator]
+        self._speed = None # type: Optional[RateIndicator]
+        self._speculative = CounterIndicator("Speculative requests")
+        self._lock = threading.Lock()
+
+    def stream_started(self) -> None:
+        # Start each stream with a fresh count. The status line may have been cleared between turns while a
+        # hedge of the last turn was still in flight, and the old count would then keep the new one hidden.
+        with self._lock:
+            self._remove(self._speculative)
+            self._speculative = CounterIndicator("Speculative requests")
+        self._waiting = TimerIndicator("Waiting for reply")
+        self._add(self._waiting)
+
+    def attempt_started(self, index: int) -> None:
+        if index == 0:
+            return
+        with self._lock:
+            self._speculative.increment()
+            if self._speculative.count == 1:
+                self._add(self._speculative)
+
+    def attempt_finished(self, index: int) -> None:
+        if index == 0:
+            return
+        with self._lock:
+            # A hedge of an earlier stream may finish after the count was started afresh
+            if self._speculative.count == 0:
+                return
+            self._speculative.increment(-1)
+            if self._speculative.count == 0:
+                self._remove(self._speculative)
+
+    def first_token(self, secs: float) -> None:
+        if self._waiting is not None:
+            self._remove(self._waiting)
+            self._waiting = None
+        self._speed = RateIndicator("Speed", "tokens")
+        self._add(self._speed)
+
+    def chunk(self, chunk: ModelChunk) -> None:
+        if self._speed is not None:
+            self._speed.add(estimate_tokens(chunk.text, expected_output_tokens=0))
+
+    def stream_finished(self) -> None:
+        for indicator in (self._waiting, self._speed):
+            if indicator is not None:
+                self._remove(indicator)
+        self._waiting = self._speed = None
+
+    def quota_paused(self, secs: float) -> None:
+        """
+        Counts down to the end of a quota pause. Pass as `Governor.on_pause`.
+
+        Args:
+            secs (float): The pause, in seconds.
+        """
+        self._add(CountdownIndicator("Quota reached, retrying in", secs))
@@ -0,0 +1,477 @@
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Sequence
+
+from google.genai import types
+
+from candidates import CandidateRanker
+from game import HOST_CHARACTER_NAME, TURNS_BEFORE_SURRENDER, Game, GameState, RunOutput
+from governor import Governor, Priority, estimate_tokens
+from model_cache import ReplayBackend
+from model_client import DEFAULT_MODEL, ModelBackend, ModelChunk, ModelClient, ModelRequest, GenAIBackend
+from model_router import ModelRouter, ModelTier
+from strings import GamePrompts
+from vector_index import HashingEmbedder, Shortlister, VectorIndex
+
+class Character:
+    """
+    A character the simulated player can think of, with yes/no facts the stand-in model knows about.
+    """
+    def __init__(self, name: str, obscure: bool = False, **facts: bool):
+        """
+        Args:
+            name (str): The character's name.
+            obscure (bool): Whether the stand-in host has never heard of this character. Defaults to False.
+            facts (bool): Answers to each of the stand-in questions.
+        """
+        self.name = name
+        self.obscure = obscure
+        self.facts = facts
+
+STAND_IN_QUESTIONS = {
+    'real': "Is your character a real person?",
+    'human': "Is your character human?",
+    'female': "Is your character female?",
+    'alive': "Is your character alive today?",
+    'superpowers': "Does your character have superpowers?",
+    'animated': "Is your character from an animated show or film?",
+    'book': "Did your character first appear in a book?",
+}
+"""Questions the stand-in host can ask, keyed by the fact they ask about."""
+
+CHARACTERS = [
+    Character("Albert Einstein", real=True, human=True, female=False, alive=False, superpowers=False, animated=False, book=False),
+    Character("Marie Curie", real=True, human=True, female=True, alive=False, superpowers=False, animated=False, book=False),
+    Character("Ada Lovelace", obscure=True, real=True, human=True, female=True, alive=False, superpowers=False, animated=False, book=False),
+    Character("Taylor Swift", real=True, human=True, female=True, alive=True, superpowers=False, animated=False, book=False),
+    Character("Barack Obama", real=True, human=True, female=False, alive=True, superpowers=False, animated=False, book=False),
+    Character("Superman", real=False, human=False, female=False, alive=False, superpowers=True, animated=False, book=False),
+    Character("Wonder Woman", real=False, human=False, female=True, alive=False, superpowers=True, animated=False, book=False),
+    Character("Harry Potter", real=False, human=True, female=False, alive=False, superpowers=True, animated=False, book=True),
+    Character("Hermione Granger", real=False, human=True, female=True, alive=False, superpowers=True, animated=False, book=True),
+    Character("Sherlock Holmes", real=False, human=True, female=False, alive=False, superpowers=False, animated=False, book=True),
+    Character("Elizabeth Bennet", real=False, human=True, female=True, alive=False, superpowers=False, animated=False, book=True),
+    Character("Elsa", real=False, human=True, female=True, alive=False, superpowers=True, animated=True, book=False),
+    Character("Pikachu", real=False, human=False, female=False, alive=False, superpowers=True, animated=True, book=False),
+    Character("Mickey Mouse", real=False, human=False, female=False, alive=False, superpowers=False, animated=True, book=False),
+    Character("Bugs Bunny", real=False, human=False, female=False, alive=False, superpowers=False, animated=True, book=False),
+]
+"""Characters used by the stand-in model and as default self-play targets."""
+
+def describe_character(character: Character) -> str:
+    """
+    Describes a character as the stand-in questions with their answers, one pair per line, the same way
+    `Game.known_facts` reads.
+
+    Args:
+        character (Character): The character.
+    """
+    return '\n'.join(f"{question} {'Yes' if character.facts.get(fact) else 'No'}" for fact, question in STAND_IN_QUESTIONS.items())
+
+def catalogue_shortlister(k: int = 5) -> Shortlister:
+    """
+    Returns a shortlister over the characters the stand-in host knows. The index uses the hashing embedder,
+    so self-play stays offline and repeatable.
+
+    Args:
+        k (int): How many characters to shortlist. Defaults to 5.
+    """
+    known = [character for character in CHARACTERS if not character.obscure]
+    embedder = HashingEmbedder()
+    index = VectorIndex.build([character.name for character in known], [describe_character(character) for character in known], embedder)
+    return Shortlister(index, embedder, k)
+
+def _is_yes(text: str) -> bool:
+    """
+    Returns whether a reply reads as a yes.
+
+    Args:
+        text (str): The reply.
+    """
+    return text.strip().lower().startswith('yes')
+
+def _text(content: dict) -> str:
+    """
+    Returns all of the text in a single `genai` content dict.
+
+    Args:
+        content (dict): The content, with a list of text parts.
+    """
+    return '\n'.join(part.get('text', '') for part in content['parts'])
+
+class StandInBackend(ModelBackend):
+    """
+    Local stand-in for the real model, playing both sides of the game from a small catalogue of characters.
+    As the host it splits the remaining candidates with the most even question and guesses once one is left.
+    As the player it answers truthfully from the catalogue. Responses are deterministic, so self-play runs
+    are fast, free and repeatable.
+    """
+    def __init__(self, characters: Sequence[Character] = CHARACTERS, latency_secs: float = 0, chunks_per_response: int = 3):
+        """
+        Args:
+            characters (Sequence[Character]): The catalogue. The host ignores obscure characters.
+            latency_secs (float): Simulated delay before the first chunk of every response. Defaults to 0.
+            chunks_per_response (int): How many pieces each response is streamed in. Defaults to 3.
+        """
+        self.characters = list(characters)
+        self.latency_secs = latency_secs
+        self.chunks_per_response = chunks_per_response
+
+    # --------- Utility Methods ---------
+    def _read_game(self, contents: List[dict]) -> tuple[dict[str, bool], set[str], bool]:
+        """
+        Reads the host's moves so far and the player's answers to them.
+
+        Args:
+            contents (List[dict]): The host's conversation.
+        Returns:
+            tuple[dict[str, bool], set[str], bool]: The known facts, the rejected guesses, and whether a guess was right.
+        """
+        facts = {} # type: dict[str, bool]
+        rejected = set() # type: set[str]
+        won = False
+        for model_turn, user_turn in zip(contents, contents[1:]):
+            if model_turn['role'] != 'model':
+                continue
+            move = RunOutput.model_validate_json(_text(model_turn)).reasoning
+            answer = _is_yes(_text(user_turn).split('\n')[-1])
+            if move.startswith('ask:'):
+                facts[move[4:]] = answer
+            elif move.startswith('guess:'):
+                won = won or answer
+                if not answer:
+                    rejected.add(move[6:])
+        return facts, rejected, won
+
+    def _candidates(self, facts: dict[str, bool], rejected: set[str]) -> List[Character]:
+        """
+        Returns the characters the host knows that fit the facts and have not been guessed yet.
+
+        Args:
+            facts (dict[str, bool]): The known facts.
+            rejected (set[str]): The names of wrong guesses.
+        """
+        return [
+            character for character in self.characters
+            if not character.obscure and character.name not in rejected
+            and all(character.facts.get(fact) == value for fact, value in facts.items())
+        ]
+
+    def _host_reply(self, contents: List[dict]) -> RunOutput:
+        """
+        Works out the host's next move from the conversation so far.
+
+        Args:
+            contents (List[dict]): The host's conversation, ending with the player's turn.
+        Returns:
+            RunOutput: The host's reply.
+        """
+        facts, rejected, won = self._read_game(contents)
+        last_turn = _text(contents[-1])
+        if len(contents) == 1:
+            return RunOutput(is_question=False, content=f"Hello! I'm {HOST_CHARACTER_NAME} 👻 Think of a character and tell me when you're ready!", reasoning='intro')
+        if won:
+            return RunOutput(is_question=False, content="I knew it! 🪄 Want to play again?", reasoning='won')
+        if GamePrompts.SURRENDER_ROUND in last_turn:
+            return RunOutput(is_question=False, content="I give up! Who was your character?", reasoning='surrender')
+
+        candidates = self._candidates(facts, rejected)
+
+        # Pick the question that splits the remaining candidates most evenly
+        best_fact = None # type: Optional[str]
+        best_balance = 0
+        for fact in STAND_IN_QUESTIONS:
+            if fact in facts:
+                continue
+            yes_count = sum(1 for character in candidates if character.facts.get(fact))
+            balance = min(yes_count, len(candidates) - yes_count)
+            if balance > best_balance:
+                best_fact, best_balance = fact, balance
+
+        if best_fact is None and candidates:
+            name = candidates[0].name
+            return RunOutput(is_question=True, content=f"Is your character {name}?", reasoning=f'guess:{name}')
+        if best_fact is None:
+            best_fact = next((fact for fact in STAND_IN_QUESTIONS if fact not in facts), 'real')
+        return RunOutput(is_question=True, content=STAND_IN_QUESTIONS[best_fact], reasoning=f'ask:{best_fact}')
+
+    def _score_reply(self, contents: List[dict], names: Sequence[str]) -> dict[str, int]:
+        """
+        Scores a shortlist the way the ranker asks for, splitting 100 evenly between the characters that
+        still fit the conversation.
+
+        Args:
+            contents (List[dict]): The host's conversation, ending with the ranking prompt.
+            names (Sequence[str]): The shortlist.
+        Returns:
+            dict[str, int]: The score of each name, from 0 to 100.
+        """
+        facts, rejected, _ = self._read_game(contents)
+        fitting = {character.name for character in self._candidates(facts, rejected)} & set(names)
+        return {name: round(100 / len(fitting)) if name in fitting else 0 for name in names}
+
+    def _player_reply(self, system_instruction: str, contents: List[dict]) -> str:
+        """
+        Works out the simulated player's answer to the host's latest message.
+
+        Args:
+            system_instruction (str): The player's instructions, which name their character.
+            contents (List[dict]): The player's conversation, ending with the host's message.
+        Returns:
+            str: The player's answer.
+        """
+        character = next(character for character in self.characters if character.name in system_instruction)
+        message = _text(contents[-1])
+        if "give up" in message.lower():
+            return f"Yes, you can give up. It was {character.name}!"
+        if message.startswith("Is your character ") and message not in STAND_IN_QUESTIONS.values():
+            return "Yes! You got it!" if message[18:-1] == character.name else "No, that's not them."
+        for fact, question in STAND_IN_QUESTIONS.items():
+            if question in message:
+                return "Yes" if character.facts.get(fact) else "No"
+        return "I'm ready!"
+
+    # --------- Public Methods ---------
+    def stream(self, request: ModelRequest) -> Iterator[ModelChunk]:
+        if self.latency_secs:
+            time.sleep(self.latency_secs)
+
+        config = request.config
+        if getattr(config, 'response_schema', None) is RunOutput:
+            text = self._host_reply(request.contents).model_dump_json()
+        elif getattr(config, 'response_json_schema', None) is not None:
+            text = json.dumps(self._score_reply(request.contents, list(config.response_json_schema['properties'])))
+        else:
+            text = self._player_reply(getattr(config, 'system_instruction', '') or '', request.contents)
+
+        chunk_size = max(len(text) // self.chunks_per_response, 1)
+        token_count = estimate_tokens(request.contents, expected_output_tokens=len(text) // 4)
+        for start in range(0, len(text), chunk_size):
+            yield ModelChunk(text[start:start + chunk_size], token_count)
+
+class AnsweringAgent:
+    """
+    Simulated player who knows the target character and answers the host's questions.
+    """
+    def __init__(self, client: ModelClient, character: str):
+        """
+        Args:
+            client (ModelClient): The client used to talk to the player model.
+            character (str): The character the player is thinking of.
+        """
+        self.client = client
+        self.character = character
+        self.contents = [] # type: List[dict]
+
+    def reply(self, host_message: str) -> str:
+        """
+        Answers the host's latest message.
+
+        Args:
+            host_message (str): What the host said.
+        Returns:
+            str: The player's answer.
+        """
+        config = types.GenerateContentConfig(
+            system_instruction=GamePrompts.ANSWERER_INSTRUCTIONS.format(host_character_name=HOST_CHARACTER_NAME, character=self.character),
+        )
+        contents = self.contents + [{'role': 'user', 'parts': [{'text': host_message}]}]
+        answer = self.client.generate(ModelRequest(contents, config=config)).text.strip()
+        self.contents = contents + [{'role': 'model', 'parts': [{'text': answer}]}]
+        return answer
+
+class GameResult:
+    """
+    Outcome of a single self-play game.
+    """
+    def __init__(self, target: str):
+        self.target = target
+        self.won = False
+        self.surrendered = False
+        """Whether the game ended with the host's surrender round, rather than being cut off."""
+        self.questions = 0
+        self.turn_latencies = [] # type: List[float]
+        self.tokens = 0
+        self.error = None # type: Optional[str]
+
+def play_game(
+    client: ModelClient,
+    target: str,
+    max_turns: int = TURNS_BEFORE_SURRENDER + 5,
+    router: Optional[ModelRouter] = None,
+) -> GameResult:
+    """
+    Plays one full game between the host and a simulated player.
+
+    Args:
+        client (ModelClient): The client used for both sides.
+        target (str): The character the player is thinking of.
+        max_turns (int): Turns after which the game is cut off, counting as neither a win nor a surrender.
+        router (Optional[ModelRouter]): Routes host turns between model tiers, and is told how the final guess went.
+    Returns:
+        GameResult: The outcome.
+    """
+    result = GameResult(target)
+    # Ranking is a short constrained call that runs alongside host turns, so it goes to the fast tier when
+    # there is one, behind the turns themselves
+    model = router.model(ModelTier.FAST) if router is not None else DEFAULT_MODEL
+    ranker = CandidateRanker(client, model, Priority.SPECULATIVE)
+    game = Game(client, router=router, ranker=ranker, shortlist=catalogue_shortlister())
+    player = AnsweringAgent(client, target)
+    guess_tier = None # type: Optional[ModelTier]
+    try:
+        output = game.start()
+        for _ in range(max_turns):
+            was_surrender_round = game.game_state == GameState.SURRENDER_ROUND
+            output = game.respond(player.reply(output.content))
+            if output.is_question:
+                # The last question asked is the guess the game was decided on, right or wrong
+                guess_tier = game.turns[-1].tier
+            if output.is_question and target.lower() in output.content.lower():
+                result.won = True
+                break
+            if was_surrender_round:
+                result.surrendered = True
+                break
+        if router is not None and guess_tier is not None:
+            router.record_guess(guess_tier, result.won)
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+
+    game.wait_for_ranking()
+    result.questions = game.question_num
+    result.turn_latencies = [turn.total_secs for turn in game.turns]
+    result.tokens = sum(turn.token_count for turn in game.turns) + game.ranking_tokens
+    return result
+
+def _percentile(values: Sequence[float], percent: float) -> float:
+    """
+    Returns a percentile using the nearest-rank method, or 0 for no values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(max(int(len(ordered) * percent / 100 + 0.5), 1), len(ordered)) - 1]
+
+class SelfPlayReport:
+    """
+    Summary statistics over a batch of self-play games.
+    """
+    def __init__(self, results: Sequence[GameResult], wall_secs: float = 0, router: Optional[ModelRouter] = None):
+        self.results = list(results)
+        self.wall_secs = wall_secs
+        self.router = router
+
+    def to_dict(self) -> dict:
+        """
+        Returns the summary as a plain dictionary, for saving and comparing runs.
+        """
+        finished = [result for result in self.results if result.error is None]
+        wins = [result for result in finished if result.won]
+        latencies = [latency for result in finished for latency in result.turn_latencies]
+        summary = {
+            'games': len(self.results),
+            'errors': len(self.results) - len(finished),
+            'win_rate': len(wins) / len(finished) if finished else 0.0,
+            'surrender_rate': sum(1 for result in finished if result.surrendered) / len(finished) if finished else 0.0,
+            'cut_off_rate': sum(1 for result in finished if not result.won and not result.surrendered) / len(finished) if finished else 0.0,
+            'questions_to_correct_guess': sum(result.questions for result in wins) / len(wins) if wins else 0.0,
+            'turn_latency_p50_secs': _percentile(latencies, 50),
+            'turn_latency_p95_secs': _percentile(latencies, 95),
+            'tokens_per_game': sum(result.tokens for result in finished) / len(finished) if finished else 0.0,
+            'wall_secs': self.wall_secs,
+        }
+        if self.router is not None:
+            summary['tiers'] = self.router.summary()
+        return summary
+
+    def format(self) -> str:
+        """
+        Returns the summary as human readable text.
+        """
+        summary = self.to_dict()
+        lines = [
+            f"Games:                       {summary['games']} ({summary['errors']} errors) in {summary['wall_secs']:.1f}s",
+            f"Win rate:                    {summary['win_rate']:.1%}",
+            f"Surrender rate:              {summary['surrender_rate']:.1%}",
+            f"Cut off rate:                {summary['cut_off_rate']:.1%}",
+            f"Questions to correct guess:  {summary['questions_to_correct_guess']:.2f}",
+            f"Turn latency p50 / p95:      {summary['turn_latency_p50_secs'] * 1000:.0f}ms / {summary['turn_latency_p95_secs'] * 1000:.0f}ms",
+            f"Tokens per game:             {summary['tokens_per_game']:.0f}",
+        ]
+        for name, tier in summary.get('tiers', {}).items():
+            accuracy = f"{tier['accuracy']:.1%}" if tier['accuracy'] is not None else "n/a"
+            latency = f"{tier['total_p50_secs'] * 1000:.0f}ms" if tier['total_p50_secs'] is not None else "n/a"
+            lines.append(f"Tier {name + ':':<24}{tier['turns']} turns, {latency} p50, {accuracy} of {tier['guesses']} guesses correct")
+        return '\n'.join(lines)
+
+async def run_self_play(
+    client: ModelClient,
+    targets: Sequence[str],
+    games: int,
+    workers: int = 16,
+    router: Optional[ModelRouter] = None,
+) -> SelfPlayReport:
+    """
+    Plays many games in parallel on a pool of worker threads.
+
+    Args:
+        client (ModelClient): The client used for every game.
+        targets (Sequence[str]): Characters to play, cycled through in order.
+        games (int): How many games to play.
+        workers (int): How many games to play at once. Defaults to 16.
+        router (Optional[ModelRouter]): Routes host turns between model tiers. Its stats are added to the report.
+    Returns:
+        SelfPlayReport: The summary of every game.
+    """
+    loop = asyncio.get_running_loop()
+    started_at = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, play_game, client, targets[i % len(targets)], TURNS_BEFORE_SURRENDER + 5, router)
+            for i in range(games)
+        ))
+    return SelfPlayReport(results, time.monotonic() - started_at, router)
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Command line entry point. Prints a self-play report.
+    """
+    parser = argparse.ArgumentParser(description="Run simulated games of Rotanika and report how the host performs.")
+    parser.add_argument('--games', type=int, default=200, help="number of games to play")
+    parser.add_argument('--workers', type=int, default=16, help="number of games to play at once")
+    parser.add_argument('--backend', choices=['stand-in', 'record', 'replay'], default='stand-in',
+                        help="stand-in: local fake model, record: call the API and save responses, replay: only use saved responses")
+    parser.add_argument('--cache', default='self_play_cache.jsonl', help="record/replay cache file")
+    parser.add_argument('--latency', type=float, default=0, help="simulated stand-in latency, in seconds")
+    parser.add_argument('--router', action='store_true', help="route host turns between fast and strong models, and report each tier")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    backend = None # type: Optional[ModelBackend]
+    if args.backend == 'stand-in':
+        backend = StandInBackend(latency_secs=args.latency)
+    elif args.backend == 'record':
+        backend = ReplayBackend(args.cache, GenAIBackend())
+    else:
+        backend = ReplayBackend(args.cache)
+
+    # Offline runs have no quota to protect
+    if args.backend != 'record':
+        governor = Governor()
+        governor.requests_per_minute = governor.tokens_per_minute = 1e12
+        governor.max_concurrency = args.workers * 2
+
+    client = ModelClient(backend)
+    router = ModelRouter() if args.router else None
+    targets = [character.name for character in CHARACTERS]
+    report = asyncio.run(run_self_play(client, targets, args.games, args.workers, router))
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.format())
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,444 @@
+import sys
+import gzip
+import json
+import time
+import atexit
+import argparse
+import threading
+
+from typing import Any, Callable, Iterator, List, Optional, Sequence, TextIO, Union
+
+from console import Console
+from strings import GameStrings
+from styled_text import StyledText
+
+TRACE_VERSION = 1
+"""Version of the trace format, written in the header line."""
+
+TRACED_SETTINGS = (
+    'border_char', 'border_color', 'top_border_text', 'break_char', 'dinkus_char', 'dinkus_color',
+    'input_prefix', 'input_color', 'status_color', 'alternate_screen', 'synchronized_output',
+)
+"""Console settings that change what is rendered, recorded whenever they change."""
+
+_FAST_LOADING_INTERVAL = 3600
+"""Loading animation interval used by fast replays, so the animation thread never renders."""
+
+def _open_trace(path: str, mode: str) -> TextIO:
+    """
+    Opens a trace file as text, compressed with gzip if the path ends in `.gz`.
+
+    Args:
+        path (str): The trace file.
+        mode (str): 'r' or 'w'.
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8') # type: ignore
+    return open(path, mode, encoding='utf-8')
+
+def _encode_text(text: Union[str, StyledText]) -> Union[str, list]:
+    """
+    Encodes console text for a trace. Plain strings are kept as they are, so inline escapes are parsed
+    again on replay, and styled text is stored as a list of spans.
+
+    Args:
+        text (str | StyledText): The text.
+    """
+    if isinstance(text, StyledText):
+        return [list(span) for span in text.spans]
+    return text
+
+def _decode_text(value: Union[str, list]) -> Union[str, StyledText]:
+    """
+    Decodes console text encoded with `_encode_text`.
+
+    Args:
+        value (str | list): The encoded text.
+    """
+    if isinstance(value, list):
+        return StyledText(*(tuple(span) for span in value))
+    return value
+
+class SessionRecorder:
+    """
+    Records the calls a session makes to a console, with timestamps, into a trace file that `replay` can play
+    back. Each line of the trace is JSON: a header with the console size and settings, then one
+    `[milliseconds, op, args...]` event per call. Calls made by the console itself, e.g. the `load_end` done by
+    `write`, are not recorded, since replaying the outer call repeats them. Resizes and setting changes are
+    recorded as they are noticed, before the next call. When the recording stops, the last frame is saved as
+    a snapshot for replays to check against.
+
+    Op codes:
+        w: write(text, overwrite)
+        a: append(text)
+        e: write_empty()
+        ls: load_start(message, interval)
+        le: load_end()
+        i: input(prompt), with the line read, or null if input was interrupted
+        x: exit(code, message)
+        r: resize(width, height)
+        c: settings changed, as a dictionary
+        s: snapshot of the final frame
+    """
+    def __init__(self, console: Console, path: str):
+        """
+        Args:
+            console (Console): The console to record.
+            path (str): The trace file. Compressed with gzip if it ends in `.gz`.
+        """
+        self.console = console
+        self.path = path
+        self._file = None # type: Optional[TextIO]
+        self._start = 0.0
+        self._size = (0, 0)
+        self._settings = {} # type: dict[str, Any]
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._wrapped = [] # type: List[str]
+
+    def __enter__(self) -> 'SessionRecorder':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    @property
+    def recording(self) -> bool:
+        """Whether the recorder is running."""
+        return self._file is not None
+
+    # --------- Utility Methods ---------
+    def _current_settings(self) -> dict[str, Any]:
+        """
+        Returns the traced settings of the console.
+        """
+        return {name: getattr(self.console, name) for name in TRACED_SETTINGS}
+
+    def _event(self, op: str, *args: Any) -> None:
+        """
+        Writes an event to the trace.
+
+        Args:
+            op (str): The op code.
+            args (Any): The op arguments.
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            ms = int((time.monotonic() - self._start) * 1000)
+            self._file.write(json.dumps([ms, op, *args], ensure_ascii=False, separators=(',', ':')) + '\n')
+            self._file.flush()
+
+    def _sync_state(self) -> None:
+        """
+        Records any resize or setting change since the last call.
+        """
+        size = self.console._get_console_size()
+        if size != self._size:
+            self._size = size
+            self._event('r', *size)
+        settings = self._current_settings()
+        changed = {name: value for name, value in settings.items() if self._settings.get(name) != value}
+        if changed:
+            self._settings = settings
+            self._event('c', changed)
+
+    def _wrap(self, name: str, encode: Optional[Callable[..., tuple]]) -> None:
+        """
+        Replaces a console method on the instance with one that records outermost calls.
+
+        Args:
+            name (str): The method name.
+            encode (Optional[Callable[..., tuple]]): Takes the call arguments and returns the op code and
+                arguments to record, or None to record nothing for the call itself.
+        """
+        original = getattr(self.console, name)
+        def wrapper(*args, **kwargs):
+            if getattr(self._local, 'depth', 0):
+                return original(*args, **kwargs)
+            self._sync_state()
+            if encode is not None:
+                self._event(*encode(*args, **kwargs))
+            self._local.depth = 1
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self._local.depth = 0
+        setattr(self.console, name, wrapper)
+        self._wrapped.append(name)
+
+    def _wrap_read_line(self) -> None:
+        """
+        Replaces the console's line reader with one that records the lines read.
+        """
+        original = self.console._read_line
+        def read_line(prefix: str) -> str:
+            try:
+                line = original(prefix)
+            except KeyboardInterrupt:
+                self._event('i', prefix, None)
+                raise
+            self._event('i', prefix, line)
+            return line
+        self.console._read_line = read_line # type: ignore
+        self._wrapped.append('_read_line')
+
+    # --------- Public Methods ---------
+    def start(self) -> 'SessionRecorder':
+        """
+        Starts recording, writing the trace header. The recording is stopped when the program exits.
+
+        Returns:
+            SessionRecorder: The recorder, for convenience.
+        """
+        if self.recording:
+            return self
+        self._file = _open_trace(self.path, 'w')
+        self._start = time.monotonic()
+        self._size = self.console._get_console_size()
+        self._settings = self._current_settings()
+        header = {'version': TRACE_VERSION, 'width': self._size[0], 'height': self._size[1], 'settings': self._settings}
+        self._file.write(json.dumps(header, ensure_ascii=False) + '\n')
+
+        self._wrap('write', lambda text, overwrite=False: ('w', _encode_text(text), overwrite))
+        self._wrap('append', lambda text: ('a', _encode_text(text)))
+        self._wrap('write_empty', lambda: ('e',))
+        self._wrap('load_start', lambda message=GameStrings.LOADING_MESSAGE, interval=1: ('ls', message, interval))
+        self._wrap('load_end', lambda: ('le',))
+        self._wrap('exit', lambda code=0, delay_secs=1.5, message=GameStrings.EXIT_MESSAGE: ('x', code, message))
+        self._wrap('input', None)
+        self._wrap_read_line()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops recording, restoring the console methods. The last frame is saved as a snapshot, unless the
+        loading animation or status line are active, since replays do not reproduce them.
+        """
+        if not self.recording:
+            return
+        for name in self._wrapped:
+            self.console.__dict__.pop(name, None)
+        self._wrapped = []
+        atexit.unregister(self.stop)
+
+        status_line = self.console._status_line
+        if not self.console._is_loading and not (status_line is not None and status_line.text):
+            self._event('s', self.console._last_frame)
+        with self._lock:
+            assert self._file is not None
+            self._file.close()
+            self._file = None
+
+def read_trace(path: str) -> tuple[dict, Iterator[list]]:
+    """
+    Reads a trace file. A half-written last line, left by a session that was killed, is ignored.
+
+    Args:
+        path (str): The trace file.
+    Returns:
+        tuple[dict, Iterator[list]]: The header, and the events in order.
+    Raises:
+        ValueError: If the trace version is not supported.
+    """
+    with _open_trace(path, 'r') as f:
+        lines = f.read().splitlines()
+    header = json.loads(lines[0])
+    if header.get('version') != TRACE_VERSION:
+        raise ValueError(f"Unsupported session trace version: {header.get('version')}")
+
+    def events() -> Iterator[list]:
+        for line in lines[1:]:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                return
+    return header, events()
+
+class _CountingOutput:
+    """
+    Stream that discards what is written to it, counting the UTF-8 bytes a terminal would have received.
+    """
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text.encode('utf-8'))
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+class ReplayReport:
+    """
+    Result of replaying a session trace.
+    """
+    def __init__(self, events: int, frames: int, bytes_written: int, secs: float, snapshot_match: Optional[bool]):
+        self.events = events
+        self.frames = frames
+        self.bytes_written = bytes_written
+        self.secs = secs
+        self.snapshot_match = snapshot_match
+
+    @property
+    def fps(self) -> float:
+        """Frames rendered per second of replay."""
+        return self.frames / self.secs if self.secs > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Returns the report as a plain dictionary, for saving and comparing runs.
+        """
+        return {
+            'events': self.events,
+            'frames': self.frames,
+            'bytes': self.bytes_written,
+            'secs': self.secs,
+            'fps': self.fps,
+            'bytes_per_frame': self.bytes_written / self.frames if self.frames else 0.0,
+            'snapshot_match': self.snapshot_match,
+        }
+
+    def format(self) -> str:
+        """
+        Returns the report as human readable text.
+        """
+        summary = self.to_dict()
+        snapshot = {True: "match", False: "MISMATCH", None: "none recorded"}[summary['snapshot_match']]
+        lines = [
+            f"Events:           {summary['events']}",
+            f"Frames:           {summary['frames']} in {summary['secs']:.3f}s ({summary['fps']:.0f} frames/s)",
+            f"Bytes:            {summary['bytes']} ({summary['bytes_per_frame']:.0f} per frame)",
+            f"Final snapshot:   {snapshot}",
+        ]
+        return '\n'.join(lines)
+
+def _apply_event(console: Console, op: str, args: list, lines: List[Optional[str]], realtime: bool) -> None:
+    """
+    Makes the console call recorded by a trace event.
+
+    Args:
+        console (Console): The console being replayed.
+        op (str): The op code.
+        args (list): The op arguments.
+        lines (List[Optional[str]]): Input lines for the console's input source to return, in order.
+        realtime (bool): Whether the loading animation should run at its recorded interval.
+    """
+    if op == 'w':
+        console.write(_decode_text(args[0]), args[1])
+    elif op == 'a':
+        console.append(_decode_text(args[0]))
+    elif op == 'e':
+        console.write_empty()
+    elif op == 'ls':
+        console.load_start(args[0], args[1] if realtime else _FAST_LOADING_INTERVAL)
+    elif op == 'le':
+        console.load_end()
+    elif op == 'i':
+        lines.append(args[1])
+        console.input(args[0])
+    elif op == 'x':
+        console.exit(args[0], 0, args[1])
+    elif op == 'r':
+        console.width, console.height = args
+    elif op == 'c':
+        for name, value in args[0].items():
+            setattr(console, name, value)
+
+def replay(path: str, realtime: bool = False) -> ReplayReport:
+    """
+    Replays a session trace on a fresh headless console, then checks the final frame against the recorded
+    snapshot. The usual console is restored afterwards.
+
+    Args:
+        path (str): The trace file.
+        realtime (bool): Wait between events as long as the session did, and let the loading animation run.
+            Defaults to False, which replays as fast as possible with the animation paused and every append
+            rendered straight away, so that frame counts and output are deterministic.
+    Returns:
+        ReplayReport: Frames rendered, bytes written and whether the snapshot matched.
+    """
+    header, events = read_trace(path)
+    previous = Console._instance
+    Console._instance = None
+    console = Console()
+    output = _CountingOutput()
+    lines = [] # type: List[Optional[str]]
+
+    def read_line(prefix: str) -> str:
+        line = lines.pop(0)
+        if line is None:
+            raise KeyboardInterrupt
+        return line
+
+    frames = 0
+    render = console._render
+    def counted_render() -> None:
+        nonlocal frames
+        frames += 1
+        render()
+
+    console.headless = True
+    console.output = output # type: ignore
+    console.input_source = read_line
+    console.width, console.height = header['width'], header['height']
+    if not realtime:
+        # Render every append straight away, so frame counts do not depend on how fast the replay runs
+        console.append_interval = 0
+    for name, value in header['settings'].items():
+        setattr(console, name, value)
+    console._render = counted_render # type: ignore
+
+    count = 0
+    exited = False
+    snapshot = None # type: Optional[str]
+    started = time.perf_counter()
+    try:
+        for event in events:
+            ms, op, args = event[0], event[1], event[2:]
+            count += 1
+            if op == 's':
+                snapshot = args[0]
+                continue
+            if exited:
+                continue
+            if realtime:
+                time.sleep(max(ms / 1000 - (time.perf_counter() - started), 0))
+            try:
+                _apply_event(console, op, args, lines, realtime)
+            except SystemExit:
+                # The snapshot is recorded after the session exits
+                exited = True
+    finally:
+        secs = time.perf_counter() - started
+        console.load_end()
+        console._history.close()
+        Console._instance = previous
+
+    snapshot_match = console._last_frame == snapshot if snapshot is not None else None
+    return ReplayReport(count, frames, output.bytes, secs, snapshot_match)
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Command line entry point. Replays session traces and prints a report for each.
+    """
+    parser = argparse.ArgumentParser(description="Replay recorded Rotanika console sessions and report rendering performance.")
+    parser.add_argument('traces', nargs='+', help="trace files, recorded with ROTANIKA_TRACE=<file> poe run")
+    parser.add_argument('--realtime', action='store_true', help="replay with the recorded timing instead of as fast as possible")
+    parser.add_argument('--json', action='store_true', help="print the reports as JSON")
+    args = parser.parse_args(argv)
+
+    failed = False
+    for path in args.traces:
+        report = replay(path, args.realtime)
+        failed = failed or report.snapshot_match is False
+        if args.json:
+            print(json.dumps({'trace': path, **report.to_dict()}))
+        else:
+            print(f"{path}\n{report.format()}\n")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,282 @@
+import unicodedata
+
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, Optional, Union
+
+from console_styles import ANSI_ESCAPE_PATTERN, Colors
+
+Span = tuple[str, str]
+"""A (style, text) pair. The style is a string of ANSI escape codes, or '' for the default style."""
+
+def _char_width(char: str) -> int:
+    """
+    Returns the display width of a single character.
+
+    Args:
+        char (str): The character to measure.
+    Returns:
+        int: 2 for wide characters and emojis, 1 otherwise.
+    """
+    return 2 if unicodedata.east_asian_width(char) in ['W', 'F'] else 1
+
+class StyledText:
+    """
+    Immutable run of text made up of (style, text) spans. The plain text and display width are
+    computed once and cached, and ANSI escapes are only produced when the text is rendered.
+    """
+    __slots__ = ('_spans', '_plain', '_width', '_offsets')
+
+    def __init__(self, *spans: Union[str, Span]):
+        """
+        Args:
+            spans (str | tuple[str, str]): The spans of the text. Bare strings are unstyled.
+        """
+        normalized = [] # type: list[Span]
+        for span in spans:
+            style, text = ('', span) if isinstance(span, str) else span
+            if not text:
+                continue
+
+            # Merge neighbours that share a style so that rendering emits as few escapes as possible
+            if normalized and normalized[-1][0] == style:
+                normalized[-1] = (style, normalized[-1][1] + text)
+            else:
+                normalized.append((style, text))
+
+        self._spans = tuple(normalized)
+        self._plain = ''.join(text for _, text in self._spans)
+        self._width = None # type: Optional[int]
+        self._offsets = None # type: Optional[list[int]]
+
+    # --------- Constructors ---------
+    @classmethod
+    def from_ansi(cls, text: str) -> 'StyledText':
+        """
+        Parses a string containing inline ANSI escapes into styled spans.
+
+        Args:
+            text (str): The text, optionally containing ANSI escapes.
+        Returns:
+            StyledText: The parsed styled text.
+        """
+        if '\033' not in text:
+            return cls(text)
+
+        spans = [] # type: list[Span]
+        style = ''
+        position = 0
+        for match in ANSI_ESCAPE_PATTERN.finditer(text):
+            spans.append((style, text[position:match.start()]))
+            escape = match.group()
+            if escape in (Colors.RESET, '\033[m'):
+                style = ''
+            else:
+                style += escape
+            position = match.end()
+        spans.append((style, text[position:]))
+        return cls(*spans)
+
+    @classmethod
+    def coerce(cls, value: Union[str, 'StyledText']) -> 'StyledText':
+        """
+        Returns the value as styled text, parsing any inline escapes if it is a plain string.
+
+        Args:
+            value (str | StyledText): The value to convert.
+        Returns:
+            StyledText: The styled text.
+        """
+        if isinstance(value, StyledText):
+            return value
+        return cls.from_ansi(value)
+
+    # --------- Properties ---------
+    @property
+    def spans(self) -> tuple[Span, ...]:
+        """The (style, text) spans that make up this text."""
+        return self._spans
+
+    @property
+    def plain(self) -> str:
+        """The text with all styling removed."""
+        return self._plain
+
+    @property
+    def width(self) -> int:
+        """The display width of the text, accounting for emojis and wide characters."""
+        if self._width is None:
+            self._width = self._column_offsets()[-1]
+        return self._width
+
+    # --------- Utility Methods ---------
+    def _column_offsets(self) -> list[int]:
+        """
+        Returns the display column at which each character of the plain text starts, with the total
+        display width as the final element.
+        """
+        if self._offsets is None:
+            self._offsets = list(accumulate((_char_width(char) for char in self._plain), initial=0))
+        return self._offsets
+
+    # --------- Public Methods ---------
+    def slice(self, start: int, end: Optional[int] = None) -> 'StyledText':
+        """
+        Returns the styled text between two character offsets of the plain text.
+
+        Args:
+            start (int): The start offset, inclusive.
+            end (Optional[int]): The end offset, exclusive. Defaults to the end of the text.
+        Returns:
+            StyledText: The sliced text, with styles preserved.
+        """
+        end = len(self._plain) if end is None else end
+        spans = [] # type: list[Span]
+        position = 0
+        for style, text in self._spans:
+            span_end = position + len(text)
+            if span_end > start and position < end:
+                spans.append((style, text[max(start - position, 0):end - position]))
+            position = span_end
+            if position >= end:
+                break
+        return StyledText(*spans)
+
+    def wrap(self, max_width: int) -> list['StyledText']:
+        """
+        Wraps the text to fit within the specified maximum display width. Each line of the text is
+        wrapped on its own, so line breaks always start a new row, and an empty line gives an empty row.
+        Breaks happen in exactly the same places as `utils.wrap_line`, but styles are carried across
+        the breaks.
+
+        Args:
+            max_width (int): The maximum display width of each line.
+        Returns:
+            list[StyledText]: A list of wrapped lines.
+        """
+        # Special case: Empty input
+        if self._plain == '':
+            return [StyledText()]
+
+        offsets = self._column_offsets()
+        lines = [] # type: list[tuple[int, int]]
+        paragraph_start = 0
+        for paragraph in self._plain.split('\n'):
+            paragraph_lines = self._wrap_paragraph(paragraph, paragraph_start, max_width, offsets)
+            lines.extend(paragraph_lines or [(paragraph_start, paragraph_start)])
+            paragraph_start += len(paragraph) + 1
+
+        return [self.slice(start, end) for start, end in lines]
+
+    @staticmethod
+    def _wrap_paragraph(paragraph: str, start: int, max_width: int, offsets: list[int]) -> list[tuple[int, int]]:
+        """
+        Wraps a single line of the text, without any line breaks, at its spaces.
+
+        Args:
+            paragraph (str): The line's plain text.
+            start (int): The character offset of the line within the whole text.
+            max_width (int): The maximum display width of each row.
+            offsets (list[int]): The column offset of every character of the whole text.
+        Returns:
+            list[tuple[int, int]]: The start and end character offsets of each row.
+        """
+        lines = [] # type: list[tuple[int, int]]
+        line_start = line_end = position = start
+        for word in paragraph.split(' '):
+            word_start, word_end = position, position + len(word)
+            position = word_end + 1
+
+            # An empty current line never gains a leading space, just like `wrap_line`
+            candidate_start = line_start if line_end > line_start else word_start
+            if offsets[word_end] - offsets[candidate_start] <= max_width:
+                line_start, line_end = candidate_start, word_end
+            else:
+                if line_end > line_start:
+                    lines.append((line_start, line_end))
+                line_start, line_end = word_start, word_end
+
+        if line_end > line_start:
+            lines.append((line_start, line_end))
+        return lines
+
+    def pad(self, target_width: int) -> 'StyledText':
+        """
+        Pads the text with unstyled spaces up to the target display width.
+
+        Args:
+            target_width (int): The target display width.
+        Returns:
+            StyledText: The padded text.
+        """
+        padding_needed = target_width - self.width
+        if padding_needed <= 0:
+            return self
+        return StyledText(*self._spans, ' ' * padding_needed)
+
+    def truncate(self, max_width: int) -> 'StyledText':
+        """
+        Cuts the text down to the given display width, never splitting a wide character.
+
+        Args:
+            max_width (int): The maximum display width.
+        Returns:
+            StyledText: The truncated text.
+        """
+        if self.width <= max_width:
+            return self
+        return self.slice(0, bisect_right(self._column_offsets(), max_width) - 1)
+
+    def with_default_style(self, style: str) -> 'StyledText':
+        """
+        Returns a copy of the text where every unstyled span uses the given style instead.
+
+        Args:
+            style (str): The ANSI escape codes to apply.
+        Returns:
+            StyledText: The restyled text.
+        """
+        if not style:
+            return self
+        return StyledText(*((span_style or style, text) for span_style, text in self._spans))
+
+    def render(self) -> str:
+        """
+        Serialises the text to a string with inline ANSI escapes. Every styled span is closed with a
+        reset, so the rendered string never leaks its styles into whatever follows it.
+
+        Returns:
+            str: The rendered string.
+        """
+        return ''.join(f"{style}{text}{Colors.RESET}" if style else text for style, text in self._spans)
+
+    @staticmethod
+    def join(parts: Iterable['StyledText']) -> 'StyledText':
+        """
+        Concatenates several styled texts into one.
+
+        Args:
+            parts (Iterable[StyledText]): The texts to join.
+        Returns:
+            StyledText: The joined text.
+        """
+        return StyledText(*(span for part in parts for span in part.spans))
+
+    # --------- Dunder Methods ---------
+    def __add__(self, other: Union[str, 'StyledText']) -> 'StyledText':
+        return StyledText.join((self, StyledText.coerce(other)))
+
+    def __radd__(self, other: str) -> 'StyledText':
+        return StyledText.join((StyledText.coerce(other), self))
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, StyledText) and self._spans == other._spans
+
+    def __hash__(self) -> int:
+        return hash(self._spans)
+
+    def __repr__(self) -> str:
+        return f"StyledText{self._spans!r}"
+
+    def __str__(self) -> str:
+        return self.render()
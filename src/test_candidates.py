@@ -0,0 +1,80 @@
+import json
+import unittest
+from typing import Iterator
+from candidates import CandidateRanker, CandidateRanking, candidate_enum
+from game import Game
+from model_client import ModelBackend, ModelChunk, ModelClient, ModelRequest
+
+class FixedBackend(ModelBackend):
+    """Backend that always gives the same response and remembers the last request."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.request = None
+
+    def stream(self, request: ModelRequest) -> Iterator[ModelChunk]:
+        self.request = request
+        yield ModelChunk(self.text, token_count=1)
+
+class TestCandidateEnum(unittest.TestCase):
+    """Unit tests for candidate_enum."""
+
+    def test_values(self):
+        """Test that any candidate name becomes a value, without duplicates."""
+        enum = candidate_enum(["Marie Curie", "Pikachu", "Marie Curie", "Dr. Who?"])
+        self.assertEqual([member.value for member in enum], ["Marie Curie", "Pikachu", "Dr. Who?"])
+
+class TestCandidateRanking(unittest.TestCase):
+    """Unit tests for CandidateRanking."""
+
+    def test_ranking(self):
+        """Test ordering and confidence."""
+        ranking = CandidateRanking({'Elsa': 0.2, 'Superman': 0.6, 'Pikachu': 0.2})
+        self.assertEqual(ranking.ranked, ['Superman', 'Elsa', 'Pikachu'])
+        self.assertEqual(ranking.best, 'Superman')
+        self.assertAlmostEqual(ranking.confidence, 0.36)
+        self.assertAlmostEqual(CandidateRanking({'Elsa': 0.1, 'Superman': 0.2}).confidence, 0.2 * 2 / 3)
+        self.assertIsNone(CandidateRanking({}).best)
+        self.assertEqual(CandidateRanking({}).confidence, 0.0)
+
+class TestCandidateRanker(unittest.TestCase):
+    """Unit tests for CandidateRanker."""
+
+    contents = [{'role': 'user', 'parts': [{'text': 'Yes'}]}]
+    candidates = ['Elsa', 'Superman', 'Pikachu']
+
+    def test_choose(self):
+        """Test that the choice is constrained to an enum of the candidates."""
+        backend = FixedBackend("Superman")
+        self.assertEqual(CandidateRanker(ModelClient(backend)).choose(self.contents, self.candidates), 'Superman')
+        self.assertEqual(backend.request.config.response_mime_type, 'text/x.enum')
+        self.assertEqual([member.value for member in backend.request.config.response_schema], self.candidates)
+        self.assertEqual(backend.request.contents[:-1], self.contents)
+
+    def test_choose_invalid(self):
+        """Test that a response outside the shortlist is rejected."""
+        with self.assertRaises(ValueError):
+            CandidateRanker(ModelClient(FixedBackend("Batman"))).choose(self.contents, self.candidates)
+
+    def test_score(self):
+        """Test that scores are normalised and missing candidates score 0."""
+        backend = FixedBackend(json.dumps({'Elsa': 20, 'Superman': 150}))
+        ranking = CandidateRanker(ModelClient(backend)).score(self.contents, self.candidates)
+        self.assertEqual(ranking.scores, {'Elsa': 0.2, 'Superman': 1.0, 'Pikachu': 0.0})
+        self.assertEqual(backend.request.config.response_json_schema['required'], self.candidates)
+
+    def test_score_not_a_number(self):
+        """Test that null or other non-numeric scores count as 0."""
+        backend = FixedBackend(json.dumps({'Elsa': None, 'Superman': "high", 'Pikachu': 40}))
+        ranking = CandidateRanker(ModelClient(backend)).score(self.contents, self.candidates)
+        self.assertEqual(ranking.scores, {'Elsa': 0.0, 'Superman': 0.0, 'Pikachu': 0.4})
+
+    def test_game_confidence(self):
+        """Test that ranking candidates updates the game's confidence."""
+        client = ModelClient(FixedBackend(json.dumps({'Elsa': 10, 'Superman': 90, 'Pikachu': 0})))
+        game = Game(client)
+        game.rank_candidates(CandidateRanker(client), self.candidates)
+        self.assertAlmostEqual(game.confidence, 0.81)
+
+if __name__ == "__main__":
+    unittest.main()
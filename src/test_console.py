@@ -0,0 +1,163 @@
+import io
+import sys
+import time
+import unittest
+from unittest import mock
+from console import Console
+from console_styles import Colors, Controls
+from strings import GameStrings
+from styled_text import StyledText
+from utils import display_len
+
+class TestFrameTemplates(unittest.TestCase):
+    """Unit tests for the console's frame template cache."""
+
+    def setUp(self):
+        self.console = Console()
+        self.original = (self.console.width, self.console.height, self.console.border_color, self.console.top_border_text)
+        self.console.width, self.console.height = 40, 20
+        self.width, _ = self.console._get_console_size()
+
+    def tearDown(self):
+        self.console.width, self.console.height, self.console.border_color, self.console.top_border_text = self.original
+
+    def test_reused(self):
+        """Test that layout rows are reused while nothing they depend on changes."""
+        templates = self.console._get_templates(self.width)
+        self.assertIs(self.console._get_templates(self.width), templates)
+
+    def test_invalidated(self):
+        """Test that changing the width or a layout setting renders the rows again."""
+        templates = self.console._get_templates(self.width)
+        self.console.border_color = Colors.RED
+        recoloured = self.console._get_templates(self.width)
+        self.assertIsNot(recoloured, templates)
+        self.assertIn(Colors.RED, recoloured.bottom)
+
+        self.console.top_border_text = "Header"
+        self.assertEqual(len(self.console._get_templates(self.width).top), 4)
+        self.assertIsNot(self.console._get_templates(self.width + 1), self.console._get_templates(self.width))
+
+class TestAppend(unittest.TestCase):
+    """Unit tests for appending streamed text."""
+
+    def setUp(self):
+        self.previous = Console._instance
+        Console._instance = None
+        self.console = Console()
+        self.console.headless = True
+        self.console.output = io.StringIO()
+        self.console.width, self.console.height = 40, 12
+        self.frames = []
+        render = self.console._render
+        self.console._render = lambda: (self.frames.append(None), render())
+
+    def tearDown(self):
+        self.console._history.close()
+        Console._instance = self.previous
+
+    def test_throttled(self):
+        """Test that quick appends share one render, and the rest is rendered at the end of the interval."""
+        self.console.append_interval = 0.1
+        self.console.append("Once ")
+        self.console.append("upon ")
+        self.console.append("a time")
+        self.assertEqual(len(self.frames), 1)
+        self.assertEqual(self.console._history[-1].text, "Once upon a time")
+
+        deadline = time.monotonic() + 1
+        while len(self.frames) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.frames), 2)
+        self.assertIn("Once upon a time", self.console._last_frame)
+
+    def test_unthrottled(self):
+        """Test that every append renders when the interval is 0."""
+        self.console.append_interval = 0
+        for piece in ("a", "b", "c"):
+            self.console.append(piece)
+        self.assertEqual(len(self.frames), 3)
+
+    def test_frame_built_under_lock(self):
+        """Test that the history rows are built while holding the render lock, not only written under it."""
+        held = []
+        sync = self.console._sync_line_index
+        self.console._sync_line_index = lambda width: (held.append(self.console._render_lock._is_owned()), sync(width))
+        self.console.append_interval = 0
+        self.console.append("Once upon a time")
+        self.assertEqual(held, [True])
+
+    def test_multiline(self):
+        """Test that line breaks in appended text start new bordered rows, with blank lines kept."""
+        self.console.append_interval = 0
+        self.console.width = 30
+        self.console.append("Hello!\n\nThink of a character.")
+        plain = [StyledText.from_ansi(row).plain for row in self.console._last_frame.split('\n')]
+        self.assertTrue(all(display_len(row) == 30 for row in plain if row))
+        start = next(i for i, row in enumerate(plain) if "Hello!" in row)
+        self.assertEqual([row.strip(' ' + plain[start][0]) for row in plain[start:start + 3]], ["Hello!", "", "Think of a character."])
+
+class TestAlternateScreen(unittest.TestCase):
+    """Unit tests for rendering into the alternate screen buffer."""
+
+    def setUp(self):
+        self.previous = Console._instance
+        Console._instance = None
+        self.console = Console()
+        self.console.headless = True
+        self.console.output = io.StringIO()
+        self.console.width, self.console.height = 40, 12
+        self.console.alternate_screen = True
+        self.excepthook = sys.excepthook
+
+    def tearDown(self):
+        self.console._leave_alternate_screen()
+        self.console._history.close()
+        Console._instance = self.previous
+        sys.excepthook = self.excepthook
+
+    def test_synchronized_frames(self):
+        """Test that the screen is entered once and each frame is painted in place inside sync markers."""
+        self.console.write("Hello")
+        self.console._render()
+        self.console._render()
+        output = self.console.output.getvalue()
+        frame = f"{Controls.SYNC_START}{Controls.CURSOR_HIDE}{Controls.CURSOR_HOME}{self.console._last_frame}\n{Controls.ERASE_BELOW}{Controls.CURSOR_SHOW}{Controls.SYNC_END}"
+        self.assertEqual(output, Controls.ALT_SCREEN_ENTER + frame * 2)
+
+    def test_unsynchronized_frames(self):
+        """Test that sync markers are left out when synchronized output is off."""
+        self.console.synchronized_output = False
+        self.console._render()
+        output = self.console.output.getvalue()
+        self.assertNotIn(Controls.SYNC_START, output)
+        self.assertTrue(output.startswith(Controls.ALT_SCREEN_ENTER + Controls.CURSOR_HIDE))
+
+    def test_exit_restores(self):
+        """Test that the exit hooks are installed with the alternate screen, and removed on exit."""
+        self.console.headless = False # Hooks are only installed for a real terminal
+        with mock.patch('console.atexit') as atexit:
+            self.console._render()
+            self.assertIsNot(sys.excepthook, self.excepthook)
+            atexit.register.assert_called_once_with(self.console._leave_alternate_screen)
+
+            with self.assertRaises(SystemExit):
+                self.console.exit(delay_secs=0)
+            self.assertIs(sys.excepthook, self.excepthook)
+            atexit.unregister.assert_called_once_with(self.console._leave_alternate_screen)
+        output = self.console.output.getvalue()
+        self.assertTrue(output.endswith(f"{Controls.CURSOR_SHOW}{Colors.RESET}{Controls.ALT_SCREEN_EXIT}{GameStrings.EXIT_MESSAGE}\n"))
+
+    def test_interrupt_restores(self):
+        """Test that an uncaught exception leaves the alternate screen before it is reported."""
+        reported = []
+        sys.excepthook = lambda *args: reported.append(self.console._alternate_screen_active)
+        self.console.headless = False
+        with mock.patch('console.atexit'):
+            self.console._render()
+        sys.excepthook(KeyboardInterrupt, KeyboardInterrupt(), None)
+        self.assertEqual(reported, [False])
+        self.assertTrue(self.console.output.getvalue().endswith(Controls.ALT_SCREEN_EXIT))
+
+if __name__ == "__main__":
+    unittest.main()
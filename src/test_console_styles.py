@@ -0,0 +1,55 @@
+import unittest
+from console_styles import BackgroundColors, Codes, Colors, Graphics, minimize_styles, remove_styles, style
+
+class TestRemoveStyles(unittest.TestCase):
+    """Unit tests for remove_styles."""
+
+    def test_remove_styles(self):
+        """Test that all escapes are removed."""
+        text = f"{Colors.RED}red{Colors.RESET} {style(Codes.BOLD, Codes.COLOR_BLUE)}bold blue{Colors.RESET}"
+        self.assertEqual(remove_styles(text), "red bold blue")
+
+    def test_remove_styles_plain(self):
+        """Test that text without escapes is returned unchanged."""
+        self.assertEqual(remove_styles("plain text"), "plain text")
+
+class TestMinimizeStyles(unittest.TestCase):
+    """Unit tests for minimize_styles."""
+
+    def test_plain_text_unchanged(self):
+        """Test that text without escapes is returned unchanged."""
+        self.assertEqual(minimize_styles("plain\ntext"), "plain\ntext")
+
+    def test_repeated_color_dropped(self):
+        """Test that resetting and re-applying the same color is collapsed."""
+        text = f"{Colors.BLUE}#{Colors.RESET}{Colors.BLUE}#{Colors.RESET}"
+        self.assertEqual(minimize_styles(text), f"{Colors.BLUE}##{Colors.RESET}")
+
+    def test_adjacent_codes_merged(self):
+        """Test that consecutive escapes are merged into a single escape."""
+        text = f"{Graphics.BOLD}{Colors.RED}x{Colors.RESET}"
+        self.assertEqual(minimize_styles(text), f"{style(Codes.BOLD, Codes.COLOR_RED)}x{Colors.RESET}")
+
+    def test_style_change_deferred_past_whitespace(self):
+        """Test that foreground changes are not emitted for whitespace."""
+        text = f"{Colors.BLUE}#{Colors.RESET}   \n{Colors.BLUE}#{Colors.RESET}"
+        self.assertEqual(minimize_styles(text), f"{Colors.BLUE}#   \n#{Colors.RESET}")
+
+    def test_background_not_deferred(self):
+        """Test that background changes are applied before whitespace."""
+        text = f"{BackgroundColors.RED} {Colors.RESET}"
+        self.assertEqual(minimize_styles(text), text)
+
+    def test_incremental_transition(self):
+        """Test that removing one attribute keeps the others without a full reset."""
+        text = f"{style(Codes.BOLD, Codes.COLOR_RED)}a{Graphics.RESET_BOLD}b{Colors.RESET}"
+        self.assertEqual(remove_styles(minimize_styles(text)), "ab")
+        self.assertIn(Graphics.RESET_BOLD + "b", minimize_styles(text))
+
+    def test_final_state_restored(self):
+        """Test that a trailing reset is kept when it changes the state."""
+        self.assertEqual(minimize_styles(f"{Colors.RED}a"), f"{Colors.RED}a")
+        self.assertEqual(minimize_styles(f"{Colors.RED}a{Colors.RESET}"), f"{Colors.RED}a{Colors.RESET}")
+
+if __name__ == "__main__":
+    unittest.main()
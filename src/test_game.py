@@ -0,0 +1,133 @@
+import time
+import unittest
+from candidates import CandidateRanker, CandidateRanking
+from game import GUESS_HINT_CONFIDENCE, RANK_FROM_QUESTION, TURNS_BEFORE_SURRENDER, TURNS_AFTER_SURRENDER, Game, GameState, is_last_question
+from model_client import ModelClient
+from self_play import AnsweringAgent, StandInBackend, catalogue_shortlister
+from strings import GamePrompts
+
+class TestIsLastQuestion(unittest.TestCase):
+    """Unit tests for is_last_question."""
+
+    def test_is_last_question(self):
+        """Test that the surrender point comes after the first limit and then every extra block."""
+        self.assertFalse(is_last_question(TURNS_BEFORE_SURRENDER - 1))
+        self.assertTrue(is_last_question(TURNS_BEFORE_SURRENDER))
+        self.assertFalse(is_last_question(TURNS_BEFORE_SURRENDER + 1))
+        self.assertTrue(is_last_question(TURNS_BEFORE_SURRENDER + TURNS_AFTER_SURRENDER))
+
+class TestGame(unittest.TestCase):
+    """Unit tests for Game."""
+
+    def setUp(self):
+        self.game = Game(ModelClient(StandInBackend()))
+
+    def test_start(self):
+        """Test that the game starts with an introduction that is not a question."""
+        output = self.game.start()
+        self.assertFalse(output.is_question)
+        self.assertEqual(self.game.question_num, 0)
+        self.assertEqual([content['role'] for content in self.game.contents], ['user', 'model'])
+        self.assertIn(GamePrompts.SYSTEM_PREFIX, self.game.contents[0]['parts'][0]['text'])
+
+    def test_questions_counted(self):
+        """Test that each reply in a question round counts as a question."""
+        self.game.start()
+        output = self.game.respond("I'm ready")
+        self.assertTrue(output.is_question)
+        self.game.respond("Yes")
+        self.assertEqual(self.game.question_num, 2)
+        self.assertEqual(len(self.game.turns), 3)
+
+    def test_streamed_content(self):
+        """Test that the content is streamed before the turn finishes, and is_question is reported."""
+        pieces, questions = [], []
+        output = self.game.start(on_content=pieces.append, on_is_question=questions.append)
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual(''.join(pieces), output.content)
+        self.assertEqual(questions, [False])
+
+    def test_surrender_round(self):
+        """Test that the last question leads to a single surrender round."""
+        self.game.start()
+        self.game.question_num = TURNS_BEFORE_SURRENDER - 1
+        self.game.respond("No")
+        self.assertEqual(self.game.game_state, GameState.SURRENDER_ROUND)
+        self.assertIn(GamePrompts.LAST_QUESTION, self.game.contents[-2]['parts'][0]['text'])
+
+        output = self.game.respond("No")
+        self.assertFalse(output.is_question)
+        self.assertEqual(self.game.game_state, GameState.QUESTION_ROUND)
+        self.assertEqual(self.game.question_num, TURNS_BEFORE_SURRENDER)
+
+    def test_confidence_ranked(self):
+        """Test that late question rounds rank the shortlist, and confidence rises as candidates are ruled out."""
+        client = ModelClient(StandInBackend())
+        game = Game(client, ranker=CandidateRanker(client), shortlist=catalogue_shortlister())
+        player = AnsweringAgent(client, "Sherlock Holmes")
+        output = game.respond(player.reply(game.start().content))
+        game.wait_for_ranking()
+        self.assertIsNone(game.confidence)
+
+        game.question_num = RANK_FROM_QUESTION - 1
+        confidences = []
+        while "Sherlock Holmes" not in output.content and len(confidences) < 10:
+            output = game.respond(player.reply(output.content))
+            game.wait_for_ranking()
+            confidences.append(game.confidence)
+        self.assertIn("Sherlock Holmes", output.content)
+        self.assertEqual(confidences, sorted(confidences))
+        self.assertAlmostEqual(confidences[-1], 1.0)
+        self.assertGreater(game.ranking_tokens, 0)
+
+        # The guess was made before the confident ranking was ready, and it is not suggested again afterwards
+        game.respond(player.reply(output.content))
+        self.assertFalse(any(GamePrompts.LIKELY_CANDIDATES.split('{')[0] in part['text'] for turn in game.contents for part in turn['parts']))
+
+    def test_guess_hint(self):
+        """Test that a confident ranking is passed on to the next turn, ahead of the player's answer."""
+        self.game.start()
+        self.game.ranking = CandidateRanking({'Sherlock Holmes': 0.9, 'Elsa': 0.1, 'Pikachu': 0})
+        self.game.respond("I'm ready")
+        parts = [part['text'] for part in self.game.contents[-2]['parts']]
+        self.assertEqual(parts, [f"{GamePrompts.SYSTEM_PREFIX} {GamePrompts.LIKELY_CANDIDATES.format(candidates='Sherlock Holmes, Elsa')}", "I'm ready"])
+
+        self.game.ranking = CandidateRanking({'Sherlock Holmes': 0.4, 'Elsa': 0.6})
+        self.game.respond("No")
+        self.assertEqual(len(self.game.contents[-2]['parts']), 1)
+
+    def test_last_question_hint(self):
+        """Test that the best candidates are passed on for the last question, even when the ranking is unsure."""
+        client = ModelClient(StandInBackend())
+        game = Game(client, ranker=CandidateRanker(client), shortlist=catalogue_shortlister())
+        game.start()
+        game.question_num = TURNS_BEFORE_SURRENDER - 2
+        game.respond("I'm ready")
+        game.wait_for_ranking()
+        self.assertLess(game.confidence, GUESS_HINT_CONFIDENCE)
+        game.respond("No")
+        parts = [part['text'] for part in game.contents[-2]['parts']]
+        self.assertEqual(len(parts), 3)
+        self.assertIn(GamePrompts.LAST_QUESTION, parts[0])
+        self.assertIn(GamePrompts.LIKELY_CANDIDATES.split('{')[0], parts[1])
+        self.assertEqual(parts[2], "No")
+
+    def test_ranking_in_background(self):
+        """Test that a slow or failing ranking neither delays nor fails the host's turn."""
+        class SlowRanker(CandidateRanker):
+            def score(self, contents, candidates):
+                time.sleep(0.3)
+                raise ConnectionError("ranking failed")
+
+        client = ModelClient(StandInBackend())
+        game = Game(client, ranker=SlowRanker(client), shortlist=catalogue_shortlister())
+        game.start()
+        game.question_num = RANK_FROM_QUESTION - 1
+        started_at = time.monotonic()
+        self.assertTrue(game.respond("I'm ready").is_question)
+        self.assertLess(time.monotonic() - started_at, 0.2)
+        game.wait_for_ranking()
+        self.assertIsNone(game.confidence)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import time
+import threading
+import unittest
+from governor import Governor, Priority, TokenBucket, estimate_tokens, is_quota_error, quota_retry_after
+
+class QuotaError(Exception):
+    """Stand-in for the API client's 429 error."""
+    code = 429
+
+    def __init__(self, retry_delay: str = '0s'):
+        super().__init__("quota exceeded")
+        self.details = {'error': {'details': [{'@type': 'type.googleapis.com/google.rpc.RetryInfo', 'retryDelay': retry_delay}]}}
+
+class TestTokenBucket(unittest.TestCase):
+    """Unit tests for TokenBucket."""
+
+    def test_wait_and_refill(self):
+        """Test that an empty bucket reports how long until it refills."""
+        bucket = TokenBucket(per_minute=60)
+        now = time.monotonic()
+        self.assertEqual(bucket.wait_time(60, now), 0)
+        bucket.take(60, now)
+        self.assertAlmostEqual(bucket.wait_time(2, now), 2, places=3)
+        self.assertAlmostEqual(bucket.wait_time(2, now + 2), 0, places=3)
+
+    def test_debt(self):
+        """Test that taking more than is available leaves the bucket in debt."""
+        bucket = TokenBucket(per_minute=60)
+        now = time.monotonic()
+        bucket.take(90, now)
+        self.assertAlmostEqual(bucket.wait_time(1, now), 31, places=3)
+
+    def test_oversized_requests_clamped(self):
+        """Test that a request larger than the bucket only waits for a full bucket."""
+        bucket = TokenBucket(per_minute=60)
+        self.assertEqual(bucket.wait_time(1000, time.monotonic()), 0)
+
+class TestQuotaHelpers(unittest.TestCase):
+    """Unit tests for the quota error helpers."""
+
+    def test_quota_error(self):
+        """Test recognising quota errors and reading their retry delay."""
+        self.assertTrue(is_quota_error(QuotaError()))
+        self.assertFalse(is_quota_error(ValueError()))
+        self.assertEqual(quota_retry_after(QuotaError('12s')), 12)
+        self.assertIsNone(quota_retry_after(ValueError()))
+
+    def test_estimate_tokens(self):
+        """Test the rough token estimate."""
+        self.assertEqual(estimate_tokens('x' * 400, expected_output_tokens=10), 110)
+
+class TestGovernor(unittest.TestCase):
+    """Unit tests for Governor."""
+
+    def setUp(self):
+        Governor._instance = None
+        self.governor = Governor()
+
+    def tearDown(self):
+        Governor._instance = None
+
+    def test_singleton(self):
+        """Test that every Governor() is the same instance."""
+        self.assertIs(Governor(), self.governor)
+
+    def test_priority_order(self):
+        """Test that interactive calls are served before earlier background calls."""
+        self.governor.max_concurrency = 1
+        order = []
+        blocker = self.governor.acquire()
+
+        def wait_for_permit(name: str, priority: Priority):
+            with self.governor.acquire(priority):
+                order.append(name)
+
+        background = threading.Thread(target=wait_for_permit, args=('background', Priority.BACKGROUND))
+        background.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(target=wait_for_permit, args=('interactive', Priority.INTERACTIVE))
+        interactive.start()
+        time.sleep(0.05)
+
+        blocker.release()
+        background.join(1)
+        interactive.join(1)
+        self.assertEqual(order, ['interactive', 'background'])
+
+    def test_request_rate_limited(self):
+        """Test that calls wait for the request bucket to refill."""
+        self.governor.requests_per_minute = 600 # One request every 0.1s, with a burst of 600
+        self.governor._request_bucket.level = 0
+        started_at = time.monotonic()
+        self.governor.acquire().release()
+        self.assertGreaterEqual(time.monotonic() - started_at, 0.09)
+
+    def test_call_retries_quota_errors(self):
+        """Test that call pauses and retries after a quota error."""
+        self.governor.requests_per_minute = 60_000
+        attempts, pauses = [], []
+        self.governor.on_pause = pauses.append
+
+        def flaky(permit):
+            attempts.append(permit)
+            if len(attempts) == 1:
+                raise QuotaError('0.05s')
+            permit.record_tokens(5)
+            return 'ok'
+
+        self.assertEqual(self.governor.call(flaky, estimated_tokens=10), 'ok')
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(self.governor._active, 0)
+        self.assertEqual(self.governor._consecutive_quota_errors, 0)
+        self.assertEqual(pauses, [0.05])
+
+    def test_call_respects_can_retry(self):
+        """Test that quota errors are raised when the caller says retrying is unsafe."""
+        pauses = []
+        self.governor.on_pause = pauses.append
+
+        def failing(permit):
+            raise QuotaError('5s')
+
+        with self.assertRaises(QuotaError):
+            self.governor.call(failing, can_retry=lambda: False)
+        self.assertEqual(self.governor._active, 0)
+        self.assertEqual(pauses, [5])
+
+    def test_call_retries_exhausted(self):
+        """Test that the last quota error still pauses other calls before it is raised."""
+        self.governor.requests_per_minute = 60_000
+        self.governor.max_retries = 2
+        attempts, pauses = [], []
+        self.governor.on_pause = pauses.append
+
+        def failing(permit):
+            attempts.append(permit)
+            raise QuotaError('0.01s')
+
+        with self.assertRaises(QuotaError):
+            self.governor.call(failing)
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(pauses, [0.01] * 3)
+        self.assertEqual(self.governor._consecutive_quota_errors, 3)
+        self.assertEqual(self.governor._active, 0)
+
+    def test_backoff_grows(self):
+        """Test that repeated quota errors without a retry delay back off exponentially."""
+        self.assertEqual(self.governor.report_quota_exceeded(), 2)
+        self.assertEqual(self.governor.report_quota_exceeded(), 4)
+        self.assertEqual(self.governor.report_quota_exceeded(1), 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from console_styles import Colors
+from history import ConsoleEntry, HistoryStore
+from styled_text import StyledText
+
+class TestConsoleEntry(unittest.TestCase):
+    """Unit tests for ConsoleEntry."""
+
+    def test_slots(self):
+        """Test that entries carry no per-instance dictionary."""
+        self.assertFalse(hasattr(ConsoleEntry("hi"), '__dict__'))
+
+    def test_wrap_cache(self):
+        """Test that wrapping is cached until the text or layout changes."""
+        entry = ConsoleEntry("one two three four")
+        lines = entry.wrap(9)
+        self.assertIs(entry.wrap(9), lines)
+        self.assertEqual([line.plain for line in entry.wrap(9, prefix='> ')], ['> one two', 'three', 'four'])
+        entry.text = "five"
+        self.assertEqual([line.plain for line in entry.wrap(9)], ['five'])
+
+    def test_record_round_trip(self):
+        """Test that styles and flags survive serialisation."""
+        entry = ConsoleEntry(StyledText((Colors.RED, "red"), ('', ' plain')), is_input=True)
+        restored = ConsoleEntry.from_record(entry.to_record())
+        self.assertEqual(restored.styled, entry.styled)
+        self.assertTrue(restored.is_input)
+        self.assertFalse(restored.is_dinkus)
+
+class TestHistoryStore(unittest.TestCase):
+    """Unit tests for HistoryStore."""
+
+    def setUp(self):
+        self.store = HistoryStore(capacity=3)
+
+    def tearDown(self):
+        self.store.close()
+
+    def fill(self, count):
+        for i in range(count):
+            self.store.append(ConsoleEntry(f"entry {i}", is_dinkus=i == 1))
+
+    def test_ring(self):
+        """Test that only the newest entries are kept in memory, under their absolute indexes."""
+        self.fill(5)
+        self.assertEqual(len(self.store), 5)
+        self.assertEqual(self.store.start, 2)
+        self.assertEqual([entry.text for entry in self.store], ["entry 2", "entry 3", "entry 4"])
+        self.assertEqual(self.store[-1].text, "entry 4")
+        self.assertEqual(self.store[3].text, "entry 3")
+
+    def test_spilled_entries(self):
+        """Test that spilled entries are read back from disk on demand."""
+        self.fill(7)
+        self.assertEqual([entry.text for entry in self.store.read(0, 7)], [f"entry {i}" for i in range(7)])
+        self.assertEqual(self.store[1].text, "entry 1")
+        self.assertTrue(self.store[1].is_dinkus)
+        self.assertEqual([entry.text for entry in self.store.read(2, 5)], ["entry 2", "entry 3", "entry 4"])
+
+    def test_set(self):
+        """Test that in-memory entries can be replaced but spilled ones cannot."""
+        self.fill(4)
+        self.store[-1] = ConsoleEntry("replaced")
+        self.assertEqual(self.store[3].text, "replaced")
+        with self.assertRaises(IndexError):
+            self.store[0] = ConsoleEntry("too late")
+        with self.assertRaises(IndexError):
+            self.store[4]
+
+    def test_spill_path(self):
+        """Test spilling to a named file, and clearing."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'history.jsonl')
+            store = HistoryStore(capacity=1, spill_path=path)
+            store.append(ConsoleEntry("a"))
+            store.append(ConsoleEntry("b"))
+            self.assertEqual(store[0].text, "a")
+            self.assertTrue(os.path.exists(path + '.idx'))
+            store.clear()
+            self.assertEqual(len(store), 0)
+            self.assertFalse(store)
+
+if __name__ == "__main__":
+    unittest.main()
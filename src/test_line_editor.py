@@ -0,0 +1,71 @@
+import unittest
+from line_editor import Keys, LineBuffer, visible_window
+
+class TestLineBuffer(unittest.TestCase):
+    """Unit tests for LineBuffer."""
+
+    def type_keys(self, buffer: LineBuffer, *keys: str) -> None:
+        for key in keys:
+            buffer.handle_key(key)
+
+    def test_insert_and_backspace(self):
+        """Test typing and deleting characters."""
+        buffer = LineBuffer()
+        self.type_keys(buffer, 'h', 'e', 'y', Keys.BACKSPACE[0], 'l', 'p')
+        self.assertEqual(buffer.text, 'help')
+        self.assertEqual(buffer.cursor, 4)
+
+    def test_cursor_movement(self):
+        """Test inserting in the middle of the line after moving the cursor."""
+        buffer = LineBuffer()
+        self.type_keys(buffer, 'a', 'c', Keys.LEFT[0], 'b', Keys.HOME[0], '>', Keys.END[0], '!')
+        self.assertEqual(buffer.text, '>abc!')
+
+    def test_delete_and_kill(self):
+        """Test deleting forward and clearing either side of the cursor."""
+        buffer = LineBuffer()
+        self.type_keys(buffer, 'a', 'b', 'c', 'd', Keys.LEFT[0], Keys.LEFT[0], Keys.DELETE)
+        self.assertEqual(buffer.text, 'abd')
+        buffer.handle_key(Keys.CTRL_K)
+        self.assertEqual(buffer.text, 'ab')
+        buffer.handle_key(Keys.CTRL_U)
+        self.assertEqual(buffer.text, '')
+
+    def test_history_recall(self):
+        """Test recalling earlier lines and returning to the draft."""
+        buffer = LineBuffer(['yes', 'no'])
+        self.type_keys(buffer, 'm', Keys.UP[0])
+        self.assertEqual(buffer.text, 'no')
+        self.type_keys(buffer, Keys.UP[0], Keys.UP[0])
+        self.assertEqual(buffer.text, 'yes')
+        self.type_keys(buffer, Keys.DOWN[0], Keys.DOWN[0])
+        self.assertEqual(buffer.text, 'm')
+        self.assertEqual(buffer.cursor, 1)
+
+    def test_unknown_sequences_ignored(self):
+        """Test that unrecognised control sequences do not change the text."""
+        buffer = LineBuffer()
+        self.assertFalse(buffer.handle_key('\x1b[99~'))
+        self.assertEqual(buffer.text, '')
+
+class TestVisibleWindow(unittest.TestCase):
+    """Unit tests for visible_window."""
+
+    def test_fits(self):
+        """Test that short lines are shown in full."""
+        self.assertEqual(visible_window('> ', 'hello', 5, 20), ('> hello', 7))
+
+    def test_scrolls_to_cursor(self):
+        """Test that long lines are scrolled so the cursor stays visible."""
+        shown, column = visible_window('> ', 'abcdefghij', 10, 8)
+        self.assertEqual(shown, '> fghij')
+        self.assertEqual(column, 7)
+
+    def test_cursor_in_middle(self):
+        """Test that text after the cursor is clipped to the row."""
+        shown, column = visible_window('> ', 'abcdefghij', 2, 8)
+        self.assertEqual(shown, '> abcde')
+        self.assertEqual(column, 4)
+
+if __name__ == "__main__":
+    unittest.main()
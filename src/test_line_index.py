@@ -0,0 +1,59 @@
+import random
+import unittest
+from line_index import FenwickTree, LineIndex
+
+class TestFenwickTree(unittest.TestCase):
+    """Unit tests for FenwickTree."""
+
+    def test_sums_and_find(self):
+        """Test prefix sums and position lookups against a plain list."""
+        values = [3, 0, 1, 4, 1, 5, 0, 2]
+        tree = FenwickTree(len(values))
+        for slot, value in enumerate(values):
+            tree.add(slot, value)
+        for slot in range(len(values) + 1):
+            self.assertEqual(tree.prefix_sum(slot), sum(values[:slot]))
+        self.assertEqual([tree.find(position) for position in range(sum(values))],
+                         [slot for slot, value in enumerate(values) for _ in range(value)])
+        self.assertEqual(tree.find(sum(values)), len(values))
+
+class TestLineIndex(unittest.TestCase):
+    """Unit tests for LineIndex."""
+
+    def check(self, index, rows):
+        """Compares every lookup against the row counts still in the window."""
+        window = rows[index.start:]
+        self.assertEqual(index.total, sum(window))
+        position = 0
+        for entry, count in enumerate(window, start=index.start):
+            self.assertEqual(index.rows_before(entry), position)
+            for row in range(count):
+                self.assertEqual(index.find(position), (entry, row))
+                position += 1
+        self.assertEqual(index.rows_before(index.count), position)
+        self.assertEqual(index.find(position + 2), (index.count, 2))
+
+    def test_ring(self):
+        """Test lookups while the oldest entries drop out of the index."""
+        generator = random.Random(7)
+        for capacity in (1, 3, 8):
+            index, rows = LineIndex(capacity), []
+            for _ in range(20):
+                rows.append(generator.randint(1, 4))
+                index.append(rows[-1])
+                self.check(index, rows)
+
+    def test_set(self):
+        """Test that re-measured entries move everything after them."""
+        index, rows = LineIndex(4), [2, 1, 3, 1, 2]
+        for count in rows:
+            index.append(count)
+        index.set(2, 5)
+        rows[2] = 5
+        self.check(index, rows)
+        self.assertEqual(index.rows(2), 5)
+        with self.assertRaises(IndexError):
+            index.set(0, 1)
+
+if __name__ == "__main__":
+    unittest.main()
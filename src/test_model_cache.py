@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from google.genai import types
+from model_cache import ReplayBackend, ReplayMiss, request_key
+from model_client import ModelRequest
+from self_play import StandInBackend
+
+class TestReplayBackend(unittest.TestCase):
+    """Unit tests for ReplayBackend."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'cache.jsonl')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_request_key(self):
+        """Test that identical requests share a key and different ones do not."""
+        contents = [{'role': 'user', 'parts': [{'text': 'hi'}]}]
+        self.assertEqual(request_key(ModelRequest(contents)), request_key(ModelRequest(list(contents))))
+        self.assertNotEqual(request_key(ModelRequest(contents)), request_key(ModelRequest(contents, model='other')))
+
+    def test_record_then_replay(self):
+        """Test that recorded responses are replayed from disk without the live backend."""
+        config = types.GenerateContentConfig(system_instruction="The character you are thinking of is: Elsa.")
+        request = ModelRequest([{'role': 'user', 'parts': [{'text': 'Is your character human?'}]}], config=config)
+        recorder = ReplayBackend(self.path, StandInBackend())
+        recorded = [chunk.text for chunk in recorder.stream(request)]
+        self.assertEqual(recorder.misses, 1)
+
+        replayer = ReplayBackend(self.path)
+        self.assertEqual([chunk.text for chunk in replayer.stream(request)], recorded)
+        self.assertEqual(replayer.hits, 1)
+
+    def test_counters_thread_safe(self):
+        """Test that hits are counted exactly when many threads replay at once."""
+        config = types.GenerateContentConfig(system_instruction="The character you are thinking of is: Elsa.")
+        request = ModelRequest([{'role': 'user', 'parts': [{'text': 'Is your character human?'}]}], config=config)
+        list(ReplayBackend(self.path, StandInBackend()).stream(request))
+        replayer = ReplayBackend(self.path)
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            list(executor.map(lambda _: list(replayer.stream(request)), range(2000)))
+        self.assertEqual(replayer.hits, 2000)
+        self.assertEqual(replayer.misses, 0)
+
+    def test_replay_miss(self):
+        """Test that unknown requests raise in replay mode."""
+        with self.assertRaises(ReplayMiss):
+            list(ReplayBackend(self.path).stream(ModelRequest('hi')))
+
+if __name__ == "__main__":
+    unittest.main()
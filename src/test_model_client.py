@@ -0,0 +1,145 @@
+import time
+import _thread
+import threading
+import unittest
+from typing import Iterator
+from governor import Governor
+from model_client import LatencyTracker, ModelBackend, ModelChunk, ModelClient, ModelRequest, TurnCancelled, TurnDeadlineExceeded
+
+class ScriptedBackend(ModelBackend):
+    """Backend that answers each attempt after a scripted delay."""
+
+    def __init__(self, *delays: float, error: Exception | None = None, gap: float = 0):
+        self.delays = list(delays)
+        self.error = error
+        self.gap = gap
+        self.calls = 0
+        self.started_at = [] # type: list[float]
+
+    def stream(self, request: ModelRequest) -> Iterator[ModelChunk]:
+        attempt = self.calls
+        self.calls += 1
+        self.started_at.append(time.monotonic())
+        time.sleep(self.delays[attempt])
+        if self.error is not None and attempt == 0:
+            raise self.error
+        yield ModelChunk(f"attempt {attempt}", token_count=3)
+        time.sleep(self.gap)
+        yield ModelChunk("!", token_count=5)
+
+class TestLatencyTracker(unittest.TestCase):
+    """Unit tests for LatencyTracker."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        tracker = LatencyTracker()
+        self.assertIsNone(tracker.percentile(50))
+        for sample in range(1, 101):
+            tracker.record(sample)
+        self.assertEqual(tracker.percentile(50), 50)
+        self.assertEqual(tracker.percentile(95), 95)
+        self.assertEqual(tracker.percentile(100), 100)
+
+class TestModelClient(unittest.TestCase):
+    """Unit tests for ModelClient."""
+
+    def setUp(self):
+        Governor._instance = None
+
+    def tearDown(self):
+        Governor._instance = None
+
+    def test_generate(self):
+        """Test that a fast response is returned without hedging."""
+        client = ModelClient(ScriptedBackend(0), hedge_initial_delay=1)
+        result = client.generate(ModelRequest("hi"))
+        self.assertEqual(result.text, "attempt 0!")
+        self.assertEqual(result.token_count, 5)
+        self.assertFalse(result.hedged)
+        self.assertEqual(len(client.first_token_latency), 1)
+
+    def test_hedge_wins(self):
+        """Test that a slow first attempt is overtaken by the duplicate request."""
+        backend = ScriptedBackend(1, 0)
+        client = ModelClient(backend, hedge_initial_delay=0.05)
+        result = client.generate(ModelRequest("hi"))
+        self.assertEqual(result.text, "attempt 1!")
+        self.assertTrue(result.hedged)
+        self.assertEqual(backend.calls, 2)
+
+    def test_hedges_spaced(self):
+        """Test that each further hedge waits another hedge delay, instead of all firing at once."""
+        backend = ScriptedBackend(1, 1, 0)
+        client = ModelClient(backend, hedge_initial_delay=0.1, max_hedges=2)
+        result = client.generate(ModelRequest("hi"))
+        self.assertEqual(result.text, "attempt 2!")
+        self.assertEqual(backend.calls, 3)
+        self.assertGreaterEqual(backend.started_at[2] - backend.started_at[1], 0.09)
+
+    def test_hedge_delay_uses_percentile(self):
+        """Test that the hedge delay follows recent first-token latencies once there are enough samples."""
+        client = ModelClient(ScriptedBackend(), hedge_min_samples=2, hedge_percentile=50, hedge_initial_delay=9)
+        self.assertEqual(client._hedge_delay(), 9)
+        client.first_token_latency.record(0.1)
+        client.first_token_latency.record(0.3)
+        self.assertEqual(client._hedge_delay(), 0.1)
+
+    def test_queued_hedge_not_sent(self):
+        """Test that a hedge still waiting for the governor is never sent once the first attempt has won."""
+        governor = Governor()
+        governor.max_concurrency = 1
+        backend = ScriptedBackend(0.2, 0, gap=0.1)
+        client = ModelClient(backend, governor, hedge_initial_delay=0.05)
+        requests_before = governor._request_bucket.level
+        result = client.generate(ModelRequest("hi"))
+        self.assertEqual(result.text, "attempt 0!")
+        self.assertTrue(result.hedged)
+
+        # The hedge gets its permit once the first attempt releases it, and must hand it straight back
+        deadline = time.monotonic() + 1
+        while (governor._active or governor._waiting) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(governor._active, 0)
+        self.assertEqual(backend.calls, 1)
+        # Only the first attempt's request is spent, give or take the refill while the test ran
+        self.assertAlmostEqual(governor._request_bucket.level, requests_before - 1, delta=0.5)
+
+    def test_hedging_disabled(self):
+        """Test that no duplicate is fired when hedging is disabled."""
+        backend = ScriptedBackend(0.1)
+        client = ModelClient(backend, hedge_initial_delay=0, max_hedges=0)
+        self.assertEqual(client.generate(ModelRequest("hi")).text, "attempt 0!")
+        self.assertEqual(backend.calls, 1)
+
+    def test_failed_attempt_falls_back_to_hedge(self):
+        """Test that an error in one attempt is ignored while the other can still answer."""
+        backend = ScriptedBackend(0.1, 0.2, error=RuntimeError("boom"))
+        client = ModelClient(backend, hedge_initial_delay=0.05)
+        self.assertEqual(client.generate(ModelRequest("hi")).text, "attempt 1!")
+
+    def test_error_raised(self):
+        """Test that an error is raised when every attempt fails."""
+        client = ModelClient(ScriptedBackend(0, error=RuntimeError("boom")), max_hedges=0)
+        with self.assertRaises(RuntimeError):
+            client.generate(ModelRequest("hi"))
+
+    def test_deadline(self):
+        """Test that a turn that takes too long raises TurnDeadlineExceeded."""
+        client = ModelClient(ScriptedBackend(1, 1), hedge_initial_delay=0)
+        with self.assertRaises(TurnDeadlineExceeded):
+            client.generate(ModelRequest("hi"), deadline_secs=0.1)
+
+    def test_cancel(self):
+        """Test that Ctrl+C while waiting raises TurnCancelled instead of KeyboardInterrupt."""
+        client = ModelClient(ScriptedBackend(1), max_hedges=0)
+        threading.Timer(0.1, _thread.interrupt_main).start()
+        with self.assertRaises(TurnCancelled):
+            client.generate(ModelRequest("hi"))
+
+    def test_unknown_option(self):
+        """Test that unknown options are rejected."""
+        with self.assertRaises(TypeError):
+            ModelClient(ScriptedBackend(), hedge_sometimes=True)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from game import TURNS_BEFORE_SURRENDER, Game, GameState
+from model_client import ModelClient
+from model_router import ModelRouter, ModelTier
+from self_play import StandInBackend
+
+class TestModelRouter(unittest.TestCase):
+    """Unit tests for ModelRouter."""
+
+    def setUp(self):
+        self.router = ModelRouter(strong_from_question=10, strong_confidence=0.75)
+
+    def test_route(self):
+        """Test that only broad, early questions go to the fast tier."""
+        self.assertEqual(self.router.route(GameState.QUESTION_ROUND, 0), ModelTier.FAST)
+        self.assertEqual(self.router.route(GameState.QUESTION_ROUND, 3, confidence=0.5), ModelTier.FAST)
+        self.assertEqual(self.router.route(GameState.QUESTION_ROUND, 3, confidence=0.9), ModelTier.STRONG)
+        self.assertEqual(self.router.route(GameState.QUESTION_ROUND, 10), ModelTier.STRONG)
+        self.assertEqual(self.router.route(GameState.SURRENDER_ROUND, 3), ModelTier.STRONG)
+
+    def test_last_question(self):
+        """Test that the last question before surrendering always goes to the strong tier."""
+        router = ModelRouter(strong_from_question=TURNS_BEFORE_SURRENDER * 2)
+        self.assertEqual(router.route(GameState.QUESTION_ROUND, TURNS_BEFORE_SURRENDER), ModelTier.STRONG)
+
+    def test_unknown_option(self):
+        """Test that misspelt options are rejected."""
+        with self.assertRaises(TypeError):
+            ModelRouter(strong_from=3)
+
+    def test_stats(self):
+        """Test that turns and guesses are recorded per tier."""
+        self.router.record_turn(ModelTier.FAST, 0.1, 0.5, 100)
+        self.router.record_guess(ModelTier.STRONG, True)
+        self.router.record_guess(ModelTier.STRONG, False)
+        summary = self.router.summary()
+        self.assertEqual(summary['fast']['turns'], 1)
+        self.assertEqual(summary['fast']['total_p50_secs'], 0.5)
+        self.assertIsNone(summary['fast']['accuracy'])
+        self.assertEqual(summary['strong']['accuracy'], 0.5)
+
+    def test_game_routing(self):
+        """Test that the game sends each turn to the routed model and records it."""
+        game = Game(ModelClient(StandInBackend()), router=self.router)
+        game.start()
+        game.confidence = 0.9
+        game.respond("I'm ready")
+        self.assertEqual([turn.tier for turn in game.turns], [ModelTier.FAST, ModelTier.STRONG])
+        self.assertEqual(game.turns[1].model, self.router.model(ModelTier.STRONG))
+        self.assertEqual(self.router.stats[ModelTier.FAST].turns, 1)
+
+if __name__ == "__main__":
+    unittest.main()
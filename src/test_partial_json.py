@@ -0,0 +1,51 @@
+import json
+import unittest
+from partial_json import PartialJSONError, PartialJSONParser
+
+class TestPartialJSONParser(unittest.TestCase):
+    """Unit tests for PartialJSONParser."""
+
+    def feed_pieces(self, text, size, **callbacks):
+        parser = PartialJSONParser(**callbacks)
+        for start in range(0, len(text), size):
+            parser.feed(text[start:start + size])
+        return parser
+
+    def test_matches_json_loads(self):
+        """Test that any split of the text gives the same fields as json.loads."""
+        value = {'is_question': True, 'content': 'Ghosts say "boo"\né \U0001F47B', 'score': -1.5e3, 'extra': None,
+                 'nested': {'list': [1, "]}", {'a': '\\'}]}}
+        text = json.dumps(value, ensure_ascii=True)
+        for size in (1, 2, 3, 7, len(text)):
+            parser = self.feed_pieces(text, size)
+            self.assertEqual(parser.fields, value)
+            self.assertTrue(parser.done)
+
+    def test_string_deltas(self):
+        """Test that string fields are reported as they arrive, once per feed."""
+        deltas = []
+        parser = PartialJSONParser(on_string_delta=lambda name, delta: deltas.append((name, delta)))
+        parser.feed('{"content": "Hel')
+        self.assertEqual(deltas, [('content', 'Hel')])
+        self.assertEqual(parser.partial('content'), 'Hel')
+        parser.feed('lo \\u00')
+        parser.feed('e9!", "reasoning": "x"}')
+        self.assertEqual(''.join(delta for name, delta in deltas if name == 'content'), 'Hello é!')
+        self.assertEqual(parser.partial('content'), 'Hello é!')
+
+    def test_fields_reported_early(self):
+        """Test that a field is reported before the rest of the object arrives."""
+        fields = []
+        parser = PartialJSONParser(on_field=lambda name, value: fields.append((name, value)))
+        parser.feed('{"is_question": false,')
+        self.assertEqual(fields, [('is_question', False)])
+        self.assertFalse(parser.done)
+
+    def test_invalid(self):
+        """Test that text that cannot be a JSON object is rejected."""
+        for text in ('[1, 2]', '{"a" 1}', '{"a": tru}', '{"a": "\\q"}', '{} x'):
+            with self.subTest(text=text), self.assertRaises(PartialJSONError):
+                PartialJSONParser().feed(text)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import time
+import threading
+import unittest
+from typing import Iterator
+from model_client import ModelBackend, ModelChunk, ModelClient, ModelRequest
+from progress import CountdownIndicator, CounterIndicator, ProgressIndicator, RateIndicator, StatusLine, StreamProgress, TimerIndicator
+
+class DelayedBackend(ModelBackend):
+    """Backend whose first attempt is slow, so that it gets hedged."""
+
+    def __init__(self, *delays: float):
+        self.delays = list(delays)
+        self.calls = 0
+
+    def stream(self, request: ModelRequest) -> Iterator[ModelChunk]:
+        attempt = self.calls
+        self.calls += 1
+        time.sleep(self.delays[attempt])
+        yield ModelChunk("x" * 40)
+        yield ModelChunk("y" * 40)
+
+class TestIndicators(unittest.TestCase):
+    """Unit tests for the progress indicators."""
+
+    def test_timer(self):
+        """Test that the timer shows elapsed time."""
+        timer = TimerIndicator("Waiting")
+        self.assertEqual(timer.render(timer.started_at + 1.25), "Waiting 1.2s")
+
+    def test_rate(self):
+        """Test that the rate is averaged over the window."""
+        rate = RateIndicator("Speed", "tokens", window_secs=2)
+        rate.add(10)
+        rate.add(10)
+        self.assertEqual(rate.total, 20)
+        self.assertEqual(rate.render(time.monotonic() + 1.9), "Speed 10.5 tokens/s")
+        self.assertEqual(rate.rate(time.monotonic() + 5), 0)
+
+    def test_countdown(self):
+        """Test that the countdown finishes once the time is up."""
+        countdown = CountdownIndicator("Retrying in", 3)
+        self.assertEqual(countdown.render(countdown.ends_at - 2), "Retrying in 2s")
+        self.assertFalse(countdown.is_done(countdown.ends_at - 1))
+        self.assertTrue(countdown.is_done(countdown.ends_at))
+
+    def test_counter(self):
+        """Test incrementing and decrementing the counter."""
+        counter = CounterIndicator("Branches")
+        counter.increment(2)
+        counter.increment(-1)
+        self.assertEqual(counter.render(0), "Branches 1")
+
+class TestStatusLine(unittest.TestCase):
+    """Unit tests for StatusLine."""
+
+    def test_updates_on_add_and_remove(self):
+        """Test that adding and removing indicators reports the new text."""
+        updates = []
+        status = StatusLine(updates.append)
+        first = status.add(ProgressIndicator("one"))
+        status.add(ProgressIndicator("two"))
+        self.assertEqual(status.text, "one | two")
+        status.remove(first)
+        self.assertEqual(updates, ["one", "one | two", "two"])
+        status.clear()
+        self.assertEqual(status.text, "")
+
+    def test_indicators_refresh_in_background(self):
+        """Test that due indicators are re-rendered by the background thread."""
+        changed = threading.Event()
+        counter = CounterIndicator("Count", interval=0.01)
+        status = StatusLine(lambda text: changed.set() if text == "Count 1" else None)
+        status.add(counter)
+        counter.increment()
+        self.assertTrue(changed.wait(1))
+        status.clear()
+
+    def test_finished_indicators_removed(self):
+        """Test that finished indicators drop off the line."""
+        status = StatusLine(lambda text: None)
+        status.add(CountdownIndicator("Soon", 0, interval=0.01))
+        deadline = time.monotonic() + 1
+        while status.text and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(status.text, "")
+
+class TestStreamProgress(unittest.TestCase):
+    """Unit tests for StreamProgress."""
+
+    def setUp(self):
+        self.shown = []
+        self.history = []
+        self.progress = StreamProgress(self.add, self.remove)
+
+    def add(self, indicator):
+        self.shown.append(indicator)
+        self.history.append(indicator.label)
+        return indicator
+
+    def remove(self, indicator):
+        if indicator in self.shown:
+            self.shown.remove(indicator)
+
+    def test_stream(self):
+        """Test that the wait is shown until the first token, then the speed, and nothing once the stream ends."""
+        client = ModelClient(DelayedBackend(0), observer=self.progress, max_hedges=0)
+        stream = client.stream(ModelRequest("hi"))
+        for chunk in stream:
+            self.assertEqual([indicator.label for indicator in self.shown], ["Speed"])
+        self.assertEqual(self.history, ["Waiting for reply", "Speed"])
+        self.assertEqual(self.shown, [])
+
+    def test_speculative_requests(self):
+        """Test that hedged requests are counted while in flight."""
+        client = ModelClient(DelayedBackend(0.3, 0), observer=self.progress, hedge_initial_delay=0.05)
+        client.generate(ModelRequest("hi"))
+        self.assertIn("Speculative requests", self.history)
+        deadline = time.monotonic() + 1
+        while self.shown and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.shown, [])
+
+    def test_speculative_count_per_stream(self):
+        """Test that a hedge still in flight when the status line is cleared does not hide the next turn's hedges."""
+        self.progress.stream_started()
+        self.progress.attempt_started(1)
+        self.shown.clear()
+
+        self.progress.stream_started()
+        self.progress.attempt_started(1)
+        counters = [indicator for indicator in self.shown if isinstance(indicator, CounterIndicator)]
+        self.assertEqual(len(counters), 1)
+        self.assertEqual(counters[0].count, 1)
+
+        self.progress.attempt_finished(1)
+        self.progress.attempt_finished(1)
+        self.assertEqual(counters[0].count, 0)
+        self.assertNotIn(counters[0], self.shown)
+
+    def test_quota_paused(self):
+        """Test that a quota pause shows a countdown."""
+        self.progress.quota_paused(5)
+        self.assertIsInstance(self.shown[0], CountdownIndicator)
+        self.assertEqual(self.shown[0].render(self.shown[0].ends_at - 5), "Quota reached, retrying in 5s")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+from governor import Governor
+from model_client import ModelClient
+from self_play import CHARACTERS, GameResult, SelfPlayReport, StandInBackend, play_game, run_self_play
+
+class TestSelfPlay(unittest.TestCase):
+    """Unit tests for the self-play harness."""
+
+    def setUp(self):
+        Governor._instance = None
+        Governor().requests_per_minute = Governor().tokens_per_minute = 1e12
+        self.client = ModelClient(StandInBackend())
+
+    def tearDown(self):
+        Governor._instance = None
+
+    def test_play_game_win(self):
+        """Test that the stand-in host guesses a character it knows."""
+        result = play_game(self.client, "Sherlock Holmes")
+        self.assertIsNone(result.error)
+        self.assertTrue(result.won)
+        self.assertGreater(result.questions, 0)
+        self.assertGreater(result.tokens, 0)
+
+    def test_play_game_surrender(self):
+        """Test that the stand-in host surrenders on a character it does not know."""
+        obscure = next(character.name for character in CHARACTERS if character.obscure)
+        result = play_game(self.client, obscure)
+        self.assertIsNone(result.error)
+        self.assertTrue(result.surrendered)
+
+    def test_play_game_cut_off(self):
+        """Test that a game stopped by the turn limit is not counted as a surrender."""
+        result = play_game(self.client, "Sherlock Holmes", max_turns=2)
+        self.assertIsNone(result.error)
+        self.assertFalse(result.won)
+        self.assertFalse(result.surrendered)
+
+    def test_run_self_play(self):
+        """Test a small parallel run and its report."""
+        targets = [character.name for character in CHARACTERS]
+        report = asyncio.run(run_self_play(self.client, targets, games=len(targets) * 2, workers=4))
+        summary = report.to_dict()
+        self.assertEqual(summary['games'], len(targets) * 2)
+        self.assertEqual(summary['errors'], 0)
+        self.assertAlmostEqual(summary['win_rate'] + summary['surrender_rate'], 1)
+        self.assertEqual(summary['cut_off_rate'], 0)
+        self.assertIn("Questions to correct guess", report.format())
+
+    def test_report_percentiles(self):
+        """Test the latency percentiles in the report."""
+        result = GameResult("x")
+        result.turn_latencies = [float(i) for i in range(1, 21)]
+        summary = SelfPlayReport([result]).to_dict()
+        self.assertEqual(summary['turn_latency_p50_secs'], 10)
+        self.assertEqual(summary['turn_latency_p95_secs'], 19)
+
+if __name__ == "__main__":
+    unittest.main()
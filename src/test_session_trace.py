@@ -0,0 +1,94 @@
+import io
+import os
+import json
+import tempfile
+import unittest
+from console import Console
+from session_trace import SessionRecorder, read_trace, replay
+from styled_text import StyledText
+
+class TestSessionTrace(unittest.TestCase):
+    """Unit tests for recording and replaying console sessions."""
+
+    def setUp(self):
+        self.previous = Console._instance
+        Console._instance = None
+        self.console = Console()
+        self.console.headless = True
+        self.console.output = io.StringIO()
+        self.console.width, self.console.height = 40, 12
+        self.lines = []
+        self.console.input_source = lambda prefix: self.lines.pop(0)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'session.jsonl')
+
+    def tearDown(self):
+        self.console._history.close()
+        Console._instance = self.previous
+        self.directory.cleanup()
+
+    def record_session(self, path: str) -> None:
+        """Records a short session that ends with the player typing exit."""
+        self.lines = ["Is it a cat?", "exit"]
+        with SessionRecorder(self.console, path):
+            self.console.top_border_text = "Trace Test"
+            self.console.write(StyledText("Welcome ", ("back", "\033[31m")))
+            self.console.write_empty()
+            self.console.input()
+            self.console.load_start("Thinking", interval=60)
+            self.console.append("No, ")
+            self.console.append("it is not.")
+            self.console.width = 30
+            self.console.write("Ask again", overwrite=False)
+            with self.assertRaises(SystemExit):
+                self.console.input()
+
+    def test_record(self):
+        """Test that only outermost calls are recorded, with resizes, setting changes and a snapshot."""
+        self.record_session(self.path)
+        header, events = read_trace(self.path)
+        self.assertEqual((header['width'], header['height']), (40, 12))
+        ops = [event[1] for event in events]
+        self.assertEqual(ops, ['c', 'w', 'e', 'i', 'ls', 'a', 'a', 'r', 'w', 'i', 's'])
+        self.assertNotIn('write', self.console.__dict__)
+
+    def test_replay(self):
+        """Test that a replay renders the same final frame and counts frames and bytes."""
+        self.record_session(self.path)
+        recorded_frame = self.console._last_frame
+        report = replay(self.path)
+        self.assertTrue(report.snapshot_match)
+        self.assertEqual(report.frames, 7)
+        self.assertGreater(report.bytes_written, 0)
+        self.assertGreater(report.fps, 0)
+        self.assertIs(Console._instance, self.console)
+        self.assertEqual(self.console._last_frame, recorded_frame)
+
+    def test_replay_gzip(self):
+        """Test that compressed traces replay the same as plain ones."""
+        self.record_session(self.path + '.gz')
+        self.assertTrue(replay(self.path + '.gz').snapshot_match)
+
+    def test_snapshot_mismatch(self):
+        """Test that a replay that renders a different final frame is reported."""
+        self.record_session(self.path)
+        with open(self.path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        snapshot = json.loads(lines[-1])
+        snapshot[2] = snapshot[2].replace("Ask again", "Ask later")
+        lines[-1] = json.dumps(snapshot)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        self.assertIs(replay(self.path).snapshot_match, False)
+
+    def test_truncated_trace(self):
+        """Test that a half-written last line is ignored."""
+        self.record_session(self.path)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('[12,"w","unfinis')
+        report = replay(self.path)
+        self.assertEqual(report.events, 11)
+        self.assertTrue(report.snapshot_match)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from console_styles import Colors
+from history import ConsoleEntry
+from styled_text import StyledText
+from utils import wrap_line
+
+class TestStyledText(unittest.TestCase):
+    """Unit tests for StyledText."""
+
+    def test_plain_and_width(self):
+        """Test that the plain text and display width ignore styles."""
+        text = StyledText((Colors.RED, "Hello "), "👻")
+        self.assertEqual(text.plain, "Hello 👻")
+        self.assertEqual(text.width, 8)
+
+    def test_adjacent_spans_merge(self):
+        """Test that neighbouring spans with the same style are merged and empty spans dropped."""
+        text = StyledText((Colors.RED, "a"), (Colors.RED, "b"), "", "c")
+        self.assertEqual(text.spans, ((Colors.RED, "ab"), ("", "c")))
+
+    def test_from_ansi(self):
+        """Test parsing a string with inline escapes into spans."""
+        text = StyledText.from_ansi(f"plain {Colors.GREEN}green{Colors.RESET} plain")
+        self.assertEqual(text.spans, (("", "plain "), (Colors.GREEN, "green"), ("", " plain")))
+        self.assertEqual(text.width, 17)
+
+    def test_render_round_trip(self):
+        """Test that rendering only emits escapes around styled spans."""
+        text = StyledText("a", (Colors.BLUE, "b"))
+        self.assertEqual(text.render(), f"a{Colors.BLUE}b{Colors.RESET}")
+        self.assertEqual(StyledText.from_ansi(text.render()), text)
+
+    def test_slice_preserves_styles(self):
+        """Test slicing across span boundaries."""
+        text = StyledText("abc", (Colors.RED, "def"))
+        self.assertEqual(text.slice(2, 4).spans, (("", "c"), (Colors.RED, "d")))
+
+    def test_wrap_matches_wrap_line(self):
+        """Test that styled wrapping, and the console entry rows built from it, break in the same places as wrap_line."""
+        samples = [
+            ("This is a simple test case for wrapping.", 10),
+            ("   Leading spaces should be                 removed.", 15),
+            ("Supercalifragilisticexpialidocious is a long word.", 10),
+            ("Test some emojis🚀 👻 that should be wrapped properly.", 20),
+            ("", 10),
+            ("Hello!\n\nThink of a character.", 10),
+        ]
+        for sample, max_width in samples:
+            styled = StyledText((Colors.CYAN, sample[:5]), sample[5:])
+            lines = styled.wrap(max_width)
+            self.assertEqual([line.plain for line in lines], wrap_line(sample, max_width))
+            self.assertEqual(ConsoleEntry(styled).wrap(max_width), lines)
+
+    def test_wrap_carries_styles(self):
+        """Test that a style spanning a line break is applied on both lines."""
+        lines = StyledText((Colors.RED, "red words here")).wrap(9)
+        self.assertEqual([line.spans for line in lines], [((Colors.RED, "red words"),), ((Colors.RED, "here"),)])
+
+    def test_pad(self):
+        """Test padding to a target display width."""
+        self.assertEqual(StyledText("👻").pad(4).plain, "👻  ")
+        self.assertEqual(StyledText("long").pad(2).plain, "long")
+
+    def test_with_default_style(self):
+        """Test that only unstyled spans take on the default style."""
+        text = StyledText("a", (Colors.RED, "b")).with_default_style(Colors.GREEN)
+        self.assertEqual(text.spans, ((Colors.GREEN, "a"), (Colors.RED, "b")))
+
+if __name__ == "__main__":
+    unittest.main()
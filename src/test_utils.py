@@ -1,5 +1,9 @@
+import os
+import sys
+import tempfile
 import unittest
-from utils import display_len, get_version, wrap_line
+from unittest import mock
+from utils import display_len, get_cache_dir, get_version, wrap_line
 
 class TestDisplayLen(unittest.TestCase):
     """Unit tests for display_len."""
@@ -37,6 +41,17 @@ class TestGetVersion(unittest.TestCase):
         self.assertIsInstance(version, str)
         self.assertTrue(len(version) > 0)
 
+class TestGetCacheDir(unittest.TestCase):
+    """Unit tests for get_cache_dir."""
+
+    @unittest.skipIf(sys.platform in ('win32', 'darwin'), "XDG_CACHE_HOME is only used on Linux")
+    def test_get_cache_dir(self):
+        """Test that the cache directory is created under the user's cache home, outside any bundle."""
+        with tempfile.TemporaryDirectory() as directory, mock.patch.dict(os.environ, {'XDG_CACHE_HOME': directory}):
+            path = get_cache_dir()
+            self.assertEqual(path, os.path.join(directory, 'rotanika'))
+            self.assertTrue(os.path.isdir(path))
+
 class TestWrapLine(unittest.TestCase):
     """Unit tests for wrap_line."""
 
@@ -118,5 +133,13 @@ class TestWrapLine(unittest.TestCase):
         result = wrap_line(text, max_width)
         self.assertEqual(result, expected)
 
+    def test_wrap_lines_line_breaks(self):
+        """Test that line breaks start new lines and blank lines are kept."""
+        text = "Hello!\n\nThink of a character."
+        max_width = 10
+        expected = ["Hello!", "", "Think of a", "character."]
+        result = wrap_line(text, max_width)
+        self.assertEqual(result, expected)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,198 @@
+import os
+import json
+import tempfile
+import unittest
+import numpy as np
+from game import Game
+from model_client import ModelClient
+from self_play import CHARACTERS, StandInBackend, STAND_IN_QUESTIONS, describe_character as describe
+from utils import get_data_path
+from vector_index import EmbeddingCache, HashingEmbedder, Shortlister, VectorIndex, load_corpus
+
+class CountingEmbedder(HashingEmbedder):
+    """Hashing embedder that counts the texts it embeds."""
+
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.embedded = 0
+
+    def embed(self, texts):
+        self.embedded += len(texts)
+        return super().embed(texts)
+
+class TestHashingEmbedder(unittest.TestCase):
+    """Unit tests for HashingEmbedder."""
+
+    def test_deterministic(self):
+        """Test that vectors are repeatable, unit length and closer for similar texts."""
+        embedder = HashingEmbedder()
+        vectors = embedder.embed(["a ghost who guesses", "a ghost who guesses", "a friendly ghost who guesses", "quantum physics"])
+        self.assertEqual(vectors.shape, (4, 256))
+        self.assertEqual(vectors.dtype, np.float32)
+        np.testing.assert_array_equal(vectors[0], vectors[1])
+        self.assertAlmostEqual(float(np.linalg.norm(vectors[0])), 1.0, places=5)
+        self.assertGreater(vectors[0] @ vectors[2], vectors[0] @ vectors[3])
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Unit tests for EmbeddingCache."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'embeddings')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_embeds_once(self):
+        """Test that each text is embedded once, across instances."""
+        embedder = CountingEmbedder()
+        first = EmbeddingCache(self.path, embedder).embed(["a", "b", "a"])
+        self.assertEqual(embedder.embedded, 2)
+
+        cache = EmbeddingCache(self.path, embedder)
+        np.testing.assert_array_equal(cache.embed(["b", "a"]), first[[1, 0]])
+        self.assertEqual(embedder.embedded, 2)
+        self.assertEqual(cache.hits, 2)
+
+    def test_partial_write(self):
+        """Test that a half-written batch is dropped and later rows stay aligned."""
+        embedder = CountingEmbedder()
+        EmbeddingCache(self.path, embedder).embed(["a"])
+        with open(self.path + '.f32', 'ab') as f:
+            f.write(b'\0' * 12)
+
+        EmbeddingCache(self.path, embedder).embed(["b"])
+        np.testing.assert_array_equal(EmbeddingCache(self.path, embedder).embed(["b"]), embedder.embed(["b"]))
+
+class TestVectorIndex(unittest.TestCase):
+    """Unit tests for VectorIndex."""
+
+    def setUp(self):
+        self.embedder = HashingEmbedder()
+        self.index = VectorIndex.build(
+            [character.name for character in CHARACTERS],
+            [describe(character) for character in CHARACTERS],
+            self.embedder,
+            hash_bits=4,
+        )
+
+    def test_exact_search(self):
+        """Test that a character's own description finds them first."""
+        superman = next(character for character in CHARACTERS if character.name == "Superman")
+        results = self.index.search_text(describe(superman), self.embedder, k=3)
+        self.assertEqual(results[0][0], "Superman")
+        self.assertAlmostEqual(results[0][1], 1.0, places=5)
+        self.assertEqual(len(results), 3)
+        self.assertGreaterEqual(results[1][1], results[2][1])
+
+    def test_approximate_search(self):
+        """Test that approximate search finds the same best match and falls back when buckets are too small."""
+        query = self.index.vectors[3]
+        self.assertEqual(self.index.search(query, k=1, exact=False)[0][0], self.index.labels[3])
+        self.assertEqual(len(self.index.search(query, k=len(self.index), exact=False)), len(self.index))
+
+    def test_save_load(self):
+        """Test that a saved index is memory-mapped on load and searches the same."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'characters')
+            self.index.save(path)
+            loaded = VectorIndex.load(path)
+            self.assertIsInstance(loaded.vectors, np.memmap)
+            query = self.index.vectors[5]
+            self.assertEqual(loaded.search(query, k=4), self.index.search(query, k=4))
+            del loaded
+
+    def test_known_facts(self):
+        """Test that the facts gathered in a game find the player's character."""
+        game = Game(ModelClient(StandInBackend()))
+        game.start()
+        game.respond("I'm ready")
+        for _ in range(2):
+            question = game.contents[-1]['parts'][0]['text']
+            fact = next(fact for fact, text in STAND_IN_QUESTIONS.items() if text in question)
+            game.respond("Yes" if fact in ('real', 'human', 'female') else "No")
+
+        names = [name for name, _ in self.index.search_text(game.known_facts(), self.embedder, k=5)]
+        self.assertIn("Marie Curie", names)
+
+    def test_query_not_cached(self):
+        """Test that searching through a cache embeds the query directly, without adding it to the cache."""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = EmbeddingCache(os.path.join(directory, 'embeddings'), self.embedder)
+            cache.embed([describe(CHARACTERS[0])])
+            results = self.index.search_text(describe(CHARACTERS[0]), cache, k=1)
+            self.assertEqual(results[0][0], CHARACTERS[0].name)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            self.assertEqual(len(cache._rows), 1)
+
+class TestShortlister(unittest.TestCase):
+    """Unit tests for Shortlister."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.corpus_path = os.path.join(self.directory.name, 'characters.jsonl')
+        self.write_corpus(CHARACTERS)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_corpus(self, characters):
+        """Writes the given catalogue characters as a corpus."""
+        with open(self.corpus_path, 'w', encoding='utf-8') as f:
+            for character in characters:
+                f.write(json.dumps({'name': character.name, 'description': describe(character)}) + '\n')
+
+    def test_from_corpus(self):
+        """Test that the index is built on first use, saved once, and only changed descriptions are embedded again."""
+        embedder = CountingEmbedder()
+        unique = len({describe(character) for character in CHARACTERS})
+        cache_dir = os.path.join(self.directory.name, 'cache')
+        os.mkdir(cache_dir)
+        paths = {'index_path': os.path.join(cache_dir, 'characters'), 'cache_path': os.path.join(cache_dir, 'embeddings')}
+        shortlister = Shortlister.from_corpus(self.corpus_path, embedder, k=3, **paths)
+        self.assertEqual(embedder.embedded, 0)
+
+        superman = next(character for character in CHARACTERS if character.name == "Superman")
+        self.assertEqual(shortlister(describe(superman))[0], "Superman")
+        self.assertEqual(len(shortlister(describe(superman))), 3)
+        self.assertEqual(embedder.embedded, unique + 2)
+        self.assertEqual(len([name for name in os.listdir(cache_dir) if name.endswith('.npy')]), 1)
+
+        # A corpus that is unchanged apart from its file time, like one unpacked again by a packaged build
+        embedder.embedded = 0
+        os.utime(self.corpus_path, (os.path.getmtime(self.corpus_path) + 10,) * 2)
+        loaded = Shortlister.from_corpus(self.corpus_path, embedder, k=3, **paths)
+        self.assertIsInstance(loaded.index.vectors, np.memmap)
+        self.assertEqual(embedder.embedded, 0)
+        del loaded
+
+        self.write_corpus(CHARACTERS[:-1])
+        rebuilt = Shortlister.from_corpus(self.corpus_path, embedder, k=3, **paths)
+        self.assertEqual(len(rebuilt.index), len(CHARACTERS) - 1)
+        self.assertEqual(embedder.embedded, 0)
+
+    def test_failed_load_retried(self):
+        """Test that an index that fails to build is tried again on the next search."""
+        class FlakyEmbedder(HashingEmbedder):
+            failures = 1
+
+            def embed(self, texts):
+                if self.failures:
+                    self.failures -= 1
+                    raise ConnectionError("offline")
+                return super().embed(texts)
+
+        shortlister = Shortlister.from_corpus(self.corpus_path, FlakyEmbedder(), k=1)
+        with self.assertRaises(ConnectionError):
+            shortlister("Is your character human? Yes")
+        self.assertEqual(len(shortlister("Is your character human? Yes")), 1)
+
+    def test_shipped_corpus(self):
+        """Test that the shipped character corpus is well formed."""
+        names, descriptions = load_corpus(get_data_path('characters.jsonl'))
+        self.assertGreater(len(names), 50)
+        self.assertEqual(len(set(names)), len(names))
+        self.assertTrue(all(descriptions))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,18 +21,46 @@ def display_len(text: str) -> int:
             width += 1
     return width
 
-def get_pyproject_path():
+def get_base_path():
     """
-    Get the path to the pyproject.toml file, whether running in a packaged environment or not.
+    Get the directory bundled files are read from, whether running in a packaged environment or not.
     """
     if getattr(sys, 'frozen', False):
         # If the application is frozen, use the temporary directory set by PyInstaller
-        base_path = sys._MEIPASS # type: ignore
+        return sys._MEIPASS # type: ignore
+    # If not frozen, use the current directory
+    return os.path.abspath(".")
+
+def get_pyproject_path():
+    """
+    Get the path to the pyproject.toml file, whether running in a packaged environment or not.
+    """
+    return os.path.join(get_base_path(), 'pyproject.toml')
+
+def get_data_path(name: str) -> str:
+    """
+    Get the path to a file in the data directory, whether running in a packaged environment or not.
+
+    Args:
+        name (str): The file name, e.g. `characters.jsonl`.
+    """
+    return os.path.join(get_base_path(), 'data', name)
+
+def get_cache_dir() -> str:
+    """
+    Get the persistent per-user directory for generated files, like the character index, creating it if needed.
+    Unlike the bundle directory of a packaged build, it is kept between runs.
+    """
+    if sys.platform == 'win32':
+        base_path = os.environ.get('LOCALAPPDATA') or os.path.join(os.path.expanduser('~'), 'AppData', 'Local')
+    elif sys.platform == 'darwin':
+        base_path = os.path.expanduser('~/Library/Caches')
     else:
-        # If not frozen, use the current directory
-        base_path = os.path.abspath(".")
+        base_path = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
 
-    return os.path.join(base_path, 'pyproject.toml')
+    path = os.path.join(base_path, 'rotanika')
+    os.makedirs(path, exist_ok=True)
+    return path
 
 def get_version():
     """
@@ -46,7 +74,8 @@ def get_version():
 
 def wrap_line(text: str, max_width: int) -> list[str]:
     """
-    Wraps a line of text to fit within the specified maximum width.
+    Wraps a line of text to fit within the specified maximum width. Line breaks in the text always
+    start a new line, and an empty line in the text stays an empty line.
 
     Args:
         text (str): The text to wrap.
@@ -59,20 +88,22 @@ def wrap_line(text: str, max_width: int) -> list[str]:
     if text == '':
         return ['']
 
-    words = text.split(' ')
     wrapped_lines = []
-    current_line = ''
+    for paragraph in text.split('\n'):
+        paragraph_lines = []
+        current_line = ''
 
-    for word in words:
-        new_line = current_line + (' ' if current_line else '') + word
-        if display_len(new_line) <= max_width:
-            current_line = new_line
-        else:
-            if current_line:
-                wrapped_lines.append(current_line)
-            current_line = word
+        for word in paragraph.split(' '):
+            new_line = current_line + (' ' if current_line else '') + word
+            if display_len(new_line) <= max_width:
+                current_line = new_line
+            else:
+                if current_line:
+                    paragraph_lines.append(current_line)
+                current_line = word
 
-    if current_line:
-        wrapped_lines.append(current_line)
+        if current_line:
+            paragraph_lines.append(current_line)
+        wrapped_lines.extend(paragraph_lines or [''])
 
     return wrapped_lines
@@ -0,0 +1,443 @@
+import os
+import re
+import json
+import hashlib
+import threading
+
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from governor import Governor, Priority, estimate_tokens
+
+class Embedder:
+    """
+    Base class for something that turns text into fixed-size vectors.
+    """
+    name: str = 'embedder'
+    """Identifies the embedder and its settings, so cached vectors are never mixed between embedders."""
+
+    dimensions: int = 0
+    """Length of each vector."""
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embeds a batch of texts.
+
+        Args:
+            texts (Sequence[str]): The texts to embed.
+        Returns:
+            np.ndarray: A float32 array of shape (len(texts), dimensions), with unit length rows.
+        """
+        raise NotImplementedError
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    Scales each row to unit length, leaving zero rows alone.
+
+    Args:
+        vectors (np.ndarray): The vectors, one per row.
+    """
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic embedder that hashes words and word pairs into signed buckets. Needs no model or network,
+    so tests and offline runs always give the same vectors.
+    """
+    def __init__(self, dimensions: int = 256):
+        """
+        Args:
+            dimensions (int): Length of each vector. Defaults to 256.
+        """
+        self.dimensions = dimensions
+        self.name = f'hashing-{dimensions}'
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = re.findall(r"[a-z0-9']+", text.lower())
+            for feature in words + [f'{a} {b}' for a, b in zip(words, words[1:])]:
+                digest = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+                vectors[row, digest % self.dimensions] += 1.0 if digest >> 63 else -1.0
+        return _normalize(vectors)
+
+class GenAIEmbedder(Embedder):
+    """
+    Embedder backed by the Gemini embedding API. Calls go through the governor.
+    """
+    def __init__(
+        self,
+        client: Any = None,
+        model: str = 'gemini-embedding-001',
+        dimensions: int = 768,
+        priority: Priority = Priority.BACKGROUND,
+    ):
+        """
+        Args:
+            client (Any): A `genai.Client`. Created on first use if not given, reading `GEMINI_API_KEY`.
+            model (str): The embedding model. Defaults to gemini-embedding-001.
+            dimensions (int): Length of each vector. Defaults to 768.
+            priority (Priority): Priority of embedding calls. Defaults to background.
+        """
+        self._client = client
+        self.model = model
+        self.dimensions = dimensions
+        self.priority = priority
+        self.name = f'{model}-{dimensions}'
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        from google import genai
+        from google.genai import types
+        if self._client is None:
+            self._client = genai.Client()
+
+        def call(permit: Any) -> Any:
+            return self._client.models.embed_content(
+                model=self.model,
+                contents=list(texts),
+                config=types.EmbedContentConfig(output_dimensionality=self.dimensions),
+            )
+
+        response = Governor().call(call, self.priority, estimate_tokens(texts, expected_output_tokens=0))
+        return _normalize(np.array([embedding.values for embedding in response.embeddings], dtype=np.float32))
+
+class EmbeddingCache:
+    """
+    Persistent cache of corpus embeddings, so each description is only ever embedded once, even when the
+    index is rebuilt. Vectors are appended to a raw float32 file, and their keys to a matching text file, one
+    per line. Both are append-only, so a crash can at worst lose the last batch. Queries should not go through
+    the cache, as they are rarely repeated and would make it grow without bound.
+    """
+    def __init__(self, path: str, embedder: Embedder):
+        """
+        Args:
+            path (str): Base path of the cache. `.keys` and `.f32` files are created next to it.
+            embedder (Embedder): Embeds anything not in the cache yet.
+        """
+        self.embedder = embedder
+        self.hits = 0
+        self.misses = 0
+        self._keys_path = path + '.keys'
+        self._vectors_path = path + '.f32'
+        self._rows = {} # type: dict[str, int]
+        self._vectors = np.zeros((0, embedder.dimensions), dtype=np.float32)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _key(self, text: str) -> str:
+        """
+        Returns the cache key of a text for this embedder.
+
+        Args:
+            text (str): The text.
+        """
+        return hashlib.sha256(f'{self.embedder.name}\n{text}'.encode('utf-8')).hexdigest()
+
+    def _load(self) -> None:
+        """
+        Reads the cache from disk, ignoring any incomplete trailing row.
+        """
+        if not os.path.exists(self._keys_path) or not os.path.exists(self._vectors_path):
+            return
+        with open(self._keys_path, 'r', encoding='utf-8') as f:
+            keys = f.read().split()
+        vectors = np.fromfile(self._vectors_path, dtype=np.float32)
+        rows = min(len(keys), len(vectors) // self.embedder.dimensions)
+        self._vectors = vectors[:rows * self.embedder.dimensions].reshape(rows, self.embedder.dimensions)
+        self._rows = {key: row for row, key in enumerate(keys[:rows])}
+
+        # Drop any half-written batch, so that rows appended later stay aligned with their keys
+        if len(vectors) != rows * self.embedder.dimensions:
+            with open(self._vectors_path, 'r+b') as f:
+                f.truncate(self._vectors.nbytes)
+        if len(keys) != rows:
+            with open(self._keys_path, 'w', encoding='utf-8') as f:
+                f.write(''.join(key + '\n' for key in keys[:rows]))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embeds texts, only calling the embedder for those not seen before.
+
+        Args:
+            texts (Sequence[str]): The texts to embed.
+        Returns:
+            np.ndarray: A float32 array of shape (len(texts), dimensions).
+        """
+        keys = [self._key(text) for text in texts]
+        with self._lock:
+            missing = list(dict.fromkeys(key for key in keys if key not in self._rows))
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+            if missing:
+                texts_by_key = dict(zip(keys, texts))
+                new_vectors = self.embedder.embed([texts_by_key[key] for key in missing]).astype(np.float32)
+                with open(self._vectors_path, 'ab') as f:
+                    new_vectors.tofile(f)
+                with open(self._keys_path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(key + '\n' for key in missing))
+                start = len(self._vectors)
+                self._vectors = np.concatenate([self._vectors, new_vectors])
+                self._rows.update((key, start + i) for i, key in enumerate(missing))
+            return self._vectors[[self._rows[key] for key in keys]]
+
+class VectorIndex:
+    """
+    Index of labelled unit vectors with exact or approximate top-k cosine search. Saved as a `.npy` file
+    that can be memory-mapped, so large indexes load instantly and share pages between processes.
+    Approximate search buckets vectors by random hyperplane signatures and only scores the buckets near
+    the query's.
+    """
+    def __init__(self, vectors: np.ndarray, labels: Sequence[str], hash_bits: int = 8, seed: int = 0):
+        """
+        Args:
+            vectors (np.ndarray): Unit length vectors, one row per label. May be a memory map.
+            labels (Sequence[str]): The label of each row.
+            hash_bits (int): Hyperplanes used by approximate search. More bits give smaller buckets. Defaults to 8.
+            seed (int): Seed for the hyperplanes, so approximate results are repeatable. Defaults to 0.
+        """
+        if len(vectors) != len(labels):
+            raise ValueError(f"Got {len(vectors)} vectors for {len(labels)} labels")
+        self.vectors = vectors
+        self.labels = list(labels)
+        self.hash_bits = hash_bits
+        self.seed = seed
+        self._planes = None # type: Optional[np.ndarray]
+        self._buckets = None # type: Optional[dict[int, np.ndarray]]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    # --------- Utility Methods ---------
+    def _signatures(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Returns the hyperplane signature of each vector as an integer.
+
+        Args:
+            vectors (np.ndarray): The vectors, one per row.
+        """
+        if self._planes is None:
+            rng = np.random.default_rng(self.seed)
+            self._planes = rng.standard_normal((self.hash_bits, self.vectors.shape[1])).astype(np.float32)
+        bits = (vectors @ self._planes.T) > 0
+        return bits.astype(np.int64) @ (1 << np.arange(self.hash_bits, dtype=np.int64))
+
+    def _build_buckets(self) -> dict[int, np.ndarray]:
+        """
+        Groups the rows by signature, the first time approximate search is used.
+        """
+        if self._buckets is None:
+            signatures = self._signatures(np.asarray(self.vectors))
+            order = np.argsort(signatures, kind='stable')
+            values, starts = np.unique(signatures[order], return_index=True)
+            self._buckets = {int(value): rows for value, rows in zip(values, np.split(order, starts[1:]))}
+        return self._buckets
+
+    def _top_k(self, query: np.ndarray, rows: Optional[np.ndarray], k: int) -> List[tuple[str, float]]:
+        """
+        Scores rows against the query and returns the best k.
+
+        Args:
+            query (np.ndarray): The unit length query vector.
+            rows (Optional[np.ndarray]): Rows to score, or None for all of them.
+            k (int): How many results to return.
+        """
+        vectors = self.vectors if rows is None else self.vectors[rows]
+        scores = vectors @ query
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        indexes = best if rows is None else rows[best]
+        return [(self.labels[index], float(scores[position])) for index, position in zip(indexes, best)]
+
+    # --------- Public Methods ---------
+    @classmethod
+    def build(cls, labels: Sequence[str], texts: Sequence[str], embedder: Any, **options: Any) -> 'VectorIndex':
+        """
+        Embeds texts and indexes them under the given labels.
+
+        Args:
+            labels (Sequence[str]): The label of each text, e.g. a character name.
+            texts (Sequence[str]): The texts to embed, e.g. character descriptions.
+            embedder (Embedder | EmbeddingCache): Turns the texts into vectors.
+            options (Any): Passed on to the constructor.
+        """
+        return cls(embedder.embed(texts), labels, **options)
+
+    def save(self, path: str) -> None:
+        """
+        Saves the index as `<path>.npy` and `<path>.json`.
+
+        Args:
+            path (str): Base path of the index files.
+        """
+        np.save(path + '.npy', np.asarray(self.vectors, dtype=np.float32))
+        with open(path + '.json', 'w', encoding='utf-8') as f:
+            json.dump({'labels': self.labels, 'hash_bits': self.hash_bits, 'seed': self.seed}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'VectorIndex':
+        """
+        Loads an index saved with `save`.
+
+        Args:
+            path (str): Base path of the index files.
+            mmap (bool): Whether to memory-map the vectors instead of reading them in. Defaults to True.
+        """
+        with open(path + '.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        vectors = np.load(path + '.npy', mmap_mode='r' if mmap else None)
+        return cls(vectors, meta['labels'], hash_bits=meta['hash_bits'], seed=meta['seed'])
+
+    def search(self, query: np.ndarray, k: int = 10, exact: bool = True) -> List[tuple[str, float]]:
+        """
+        Finds the labels whose vectors are most similar to the query.
+
+        Args:
+            query (np.ndarray): The unit length query vector.
+            k (int): How many results to return. Defaults to 10.
+            exact (bool): Whether to score every row. Otherwise only rows whose signature is within one bit of
+                the query's are scored, falling back to exact search if that finds fewer than k. Defaults to True.
+        Returns:
+            List[tuple[str, float]]: (label, cosine similarity) pairs, best first.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        if exact:
+            return self._top_k(query, None, k)
+
+        buckets = self._build_buckets()
+        signature = int(self._signatures(query[np.newaxis, :])[0])
+        probes = [signature] + [signature ^ (1 << bit) for bit in range(self.hash_bits)]
+        found = [buckets[probe] for probe in probes if probe in buckets]
+        rows = np.concatenate(found) if found else np.zeros(0, dtype=np.int64)
+        if len(rows) < k:
+            return self._top_k(query, None, k)
+        return self._top_k(query, rows, k)
+
+    def search_text(self, text: str, embedder: Any, k: int = 10, exact: bool = True) -> List[tuple[str, float]]:
+        """
+        Embeds a text, e.g. the facts known so far, and finds the closest labels. The query is always embedded
+        directly, bypassing any cache.
+
+        Args:
+            text (str): The query text.
+            embedder (Embedder | EmbeddingCache): Must be the same kind of embedder the index was built with.
+            k (int): How many results to return. Defaults to 10.
+            exact (bool): Whether to use exact search. Defaults to True.
+        Returns:
+            List[tuple[str, float]]: (label, cosine similarity) pairs, best first.
+        """
+        if isinstance(embedder, EmbeddingCache):
+            embedder = embedder.embedder
+        return self.search(embedder.embed([text])[0], k, exact)
+
+def load_corpus(path: str) -> tuple[List[str], List[str]]:
+    """
+    Reads a character corpus, a JSON lines file with a `name` and a `description` on each line.
+
+    Args:
+        path (str): The corpus file.
+    Returns:
+        tuple[List[str], List[str]]: The names, and the description of each.
+    """
+    names = [] # type: List[str]
+    descriptions = [] # type: List[str]
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                names.append(record['name'])
+                descriptions.append(record['description'])
+    return names, descriptions
+
+def load_corpus_index(
+    corpus_path: str,
+    embedder: Embedder,
+    index_path: Optional[str] = None,
+    cache_path: Optional[str] = None,
+) -> VectorIndex:
+    """
+    Loads the saved index of a corpus, or builds and saves it if there is none for the corpus as it is now.
+    Saved indexes are named after a digest of the corpus and embedder, so any change to either builds a new
+    one. Descriptions are embedded through an embedding cache, so a rebuild only embeds what changed.
+
+    Args:
+        corpus_path (str): The corpus file, see `load_corpus`.
+        embedder (Embedder): Embeds the descriptions.
+        index_path (Optional[str]): Base path of the index files, to which the digest is added. Defaults to the
+            corpus path without its extension.
+        cache_path (Optional[str]): Base path of the embedding cache. Defaults to the corpus path with
+            `.embeddings` in place of the extension.
+    """
+    labels, descriptions = load_corpus(corpus_path)
+    base = os.path.splitext(corpus_path)[0]
+    payload = json.dumps([embedder.name, labels, descriptions], ensure_ascii=False)
+    digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+    index_path = f'{index_path or base}.{digest}'
+    cache_path = cache_path or f'{base}.embeddings'
+
+    if os.path.exists(index_path + '.npy') and os.path.exists(index_path + '.json'):
+        return VectorIndex.load(index_path)
+    index = VectorIndex.build(labels, descriptions, EmbeddingCache(cache_path, embedder))
+    index.save(index_path)
+    return index
+
+class Shortlister:
+    """
+    Picks the characters worth ranking, by searching a character index with the facts known so far. Can be
+    given to `Game` as its shortlist.
+    """
+    def __init__(self, index: Union[VectorIndex, Callable[[], VectorIndex]], embedder: Embedder, k: int = 10):
+        """
+        Args:
+            index (VectorIndex | Callable[[], VectorIndex]): The character index, or a function that loads it
+                the first time it is needed. A failed load is tried again on the next search.
+            embedder (Embedder): Embeds the queries. Must be the same kind of embedder the index was built with.
+            k (int): How many characters to shortlist. Defaults to 10.
+        """
+        self._index = index
+        self.embedder = embedder
+        self.k = k
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> VectorIndex:
+        """The character index, loaded on first use."""
+        with self._lock:
+            if not isinstance(self._index, VectorIndex):
+                self._index = self._index()
+            return self._index
+
+    def __call__(self, known_facts: str) -> List[str]:
+        """
+        Returns the characters closest to the known facts, best first.
+
+        Args:
+            known_facts (str): The host's questions so far with the player's answers.
+        """
+        return [label for label, _ in self.index.search_text(known_facts, self.embedder, self.k)]
+
+    @classmethod
+    def from_corpus(
+        cls,
+        corpus_path: str,
+        embedder: Embedder,
+        k: int = 10,
+        index_path: Optional[str] = None,
+        cache_path: Optional[str] = None,
+    ) -> 'Shortlister':
+        """
+        Returns a shortlister over a corpus. Its index is only loaded, or built, the first time it is
+        searched, so nothing waits for it up front. See `load_corpus_index`.
+
+        Args:
+            corpus_path (str): The corpus file, see `load_corpus`.
+            embedder (Embedder): Embeds the descriptions and the queries.
+            k (int): How many characters to shortlist. Defaults to 10.
+            index_path (Optional[str]): Base path of the index files.
+            cache_path (Optional[str]): Base path of the embedding cache.
+        """
+        return cls(lambda: load_corpus_index(corpus_path, embedder, index_path, cache_path), embedder, k)